@@ -0,0 +1,353 @@
+"""
+ENGINE BENCHMARK SUITE
+======================
+Latency percentiles, throughput and peak memory for every
+recommendation engine, parameterized by catalog size.
+
+Run (from the project root):
+    python -m ai_engine.evaluation.benchmark --sizes 10000 100000
+    python -m ai_engine.evaluation.benchmark --save-baseline
+    python -m ai_engine.evaluation.benchmark --compare   # exit 1 on regression
+
+1. Build a synthetic catalog of each size (synthetic_catalog)
+2. Per case: set up the engine on that catalog (timed once), then call it
+   until `repeats` calls or the time budget is reached (after warmup)
+3. Peak memory of one call is measured separately under tracemalloc,
+   so tracing overhead never inflates the latencies
+4. Results are written as JSON; --compare flags cases whose p50 / p95 /
+   peak memory grew by more than --tolerance against the baseline
+
+depth_to_mesh has no catalog; it runs on a square depth map with as many
+pixels as the catalog has rows (10k rows -> 100x100).
+
+Cases whose optional dependency or model artifact is missing are
+reported as "skipped" with the reason, not as failures.
+
+NO Django
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import cycle
+from pathlib import Path
+
+import numpy as np
+
+from ai_engine.evaluation.synthetic_catalog import sample_user_inputs, synthetic_catalog
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_REPEATS = 30
+DEFAULT_WARMUP = 2
+DEFAULT_TIME_BUDGET_S = 15.0
+DEFAULT_TOLERANCE = 0.20
+COMPARED_METRICS = ["p50_ms", "p95_ms", "peak_mb"]
+
+NL_QUERIES = [
+    "cheap phone with a great camera",
+    "long battery life for travel",
+    "fast gaming phone with lots of ram",
+    "lightweight compact phone",
+    "samsung flagship with big screen",
+]
+
+
+class SkipCase(Exception):
+    """Case cannot run here (missing dependency / artifact)."""
+
+
+# -------------------------
+# CASES
+# -------------------------
+# name -> setup(catalog) -> zero-arg callable (one request)
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def require(module: str):
+    try:
+        __import__(module)
+    except ImportError as e:
+        raise SkipCase(f"{module} not installed") from e
+
+
+@case("smartphone_recommender")
+def _smartphone_recommender(catalog):
+    from ai_engine.recommender.recommender_engine import SmartphoneRecommender
+
+    engine = SmartphoneRecommender(df=catalog)
+    inputs = cycle(sample_user_inputs(catalog))
+    return lambda: engine.recommend(next(inputs), top_n=5)
+
+
+@case("embedding_recommender")
+def _embedding_recommender(catalog):
+    require("sentence_transformers")
+    from ai_engine.recommender.embedding_engine import EmbeddingSmartphoneRecommender
+
+    engine = EmbeddingSmartphoneRecommender(catalog)
+    queries = cycle(NL_QUERIES)
+    return lambda: engine.recommend(next(queries), top_n=5)
+
+
+@case("satisfaction_recommender")
+def _satisfaction_recommender(catalog):
+    from ai_engine.recommender.satisfaction_engine import SatisfactionRecommender
+
+    try:
+        engine = SatisfactionRecommender(catalog)
+    except FileNotFoundError as e:
+        raise SkipCase(f"satisfaction model missing ({Path(e.filename).name})") from e
+    inputs = cycle(sample_user_inputs(catalog))
+    return lambda: engine.recommend(next(inputs), top_n=5)
+
+
+@case("semantic_recommender")
+def _semantic_recommender(catalog):
+    require("sentence_transformers")
+    from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+
+    engine = SemanticSmartphoneRecommender(catalog)
+    queries = cycle(NL_QUERIES)
+    return lambda: engine.recommend(next(queries), top_n=5)
+
+
+@case("fusion_recommender")
+def _fusion_recommender(catalog):
+    from ai_engine.recommender.fusion_engine import FusionRecommender
+
+    # Feature + satisfaction signals (the semantic one is benchmarked above)
+    engine = FusionRecommender(catalog)
+    inputs = cycle(sample_user_inputs(catalog))
+    return lambda: engine.rank(next(inputs), top_n=5)
+
+
+@case("resolve_brand")
+def _resolve_brand(catalog):
+    from ai_engine.recommender.brand_normalizer import resolve_brand
+
+    # exact, closest (typo) and fallback lookups
+    brands = cycle(["Samsung", "samsng", "xiaomi", "unknown brand", ""])
+    return lambda: resolve_brand(next(brands), catalog)
+
+
+@case("depth_to_mesh")
+def _depth_to_mesh(catalog):
+    require("trimesh")
+    from ai_engine.vision3d.mesh_builder import depth_to_mesh
+
+    side = max(2, int(math.isqrt(len(catalog))))
+    yy, xx = np.mgrid[0:side, 0:side] / side
+    depth = (0.5 + 0.25 * np.sin(6 * xx) * np.cos(6 * yy)).astype(np.float32)
+    return lambda: depth_to_mesh(depth, depth_scale=0.2)
+
+
+# -------------------------
+# MEASUREMENT
+# -------------------------
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def measure(fn, repeats: int = DEFAULT_REPEATS, warmup: int = DEFAULT_WARMUP,
+            time_budget_s: float = DEFAULT_TIME_BUDGET_S) -> dict:
+    """
+    Latency percentiles (ms), throughput (calls/s) and peak traced memory
+    (MB) of `fn`. Stops early once `time_budget_s` is spent (min 3 calls).
+    """
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < repeats:
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+        if len(latencies) >= 3 and time.perf_counter() - started > time_budget_s:
+            break
+
+    ms = np.array(latencies) * 1000
+    return {
+        "calls": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "throughput_qps": float(len(ms) / (ms.sum() / 1000)),
+        "peak_mb": _peak_mb(fn),
+    }
+
+
+def run_case(name: str, catalog, **measure_kwargs) -> dict:
+    result = {"case": name, "rows": len(catalog)}
+    try:
+        t0 = time.perf_counter()
+        fn = CASES[name](catalog)
+        result["setup_s"] = time.perf_counter() - t0
+        result.update(measure(fn, **measure_kwargs))
+        result["status"] = "ok"
+    except SkipCase as e:
+        result.update(status="skipped", reason=str(e))
+    except Exception as e:
+        result.update(status="error", reason=f"{type(e).__name__}: {e}")
+    return result
+
+
+def run_suite(sizes=DEFAULT_SIZES, cases=None, seed: int = 0, source=None, **measure_kwargs) -> dict:
+    """
+    Every case at every catalog size. Returns the report dict
+    (environment + results).
+    """
+    cases = list(cases or CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    results = []
+    for n_rows in sizes:
+        catalog = synthetic_catalog(n_rows, source=source, seed=seed)
+        for name in cases:
+            results.append(run_case(name, catalog, **measure_kwargs))
+        del catalog
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+# -------------------------
+# BASELINE
+# -------------------------
+def save_report(report: dict, path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Per (case, rows) present and "ok" in both: current / baseline ratio
+    for each COMPARED_METRICS entry and whether any exceeds 1 + tolerance.
+    """
+    previous = {
+        (r["case"], r["rows"]): r
+        for r in baseline.get("results", [])
+        if r.get("status") == "ok"
+    }
+
+    rows = []
+    for r in report["results"]:
+        base = previous.get((r["case"], r["rows"]))
+        if r.get("status") != "ok" or base is None:
+            continue
+        ratios = {
+            m: (r[m] / base[m]) if base[m] > 0 else 1.0
+            for m in COMPARED_METRICS
+        }
+        rows.append({
+            "case": r["case"],
+            "rows": r["rows"],
+            "ratios": ratios,
+            "regression": [m for m, ratio in ratios.items() if ratio > 1 + tolerance],
+        })
+    return rows
+
+
+# -------------------------
+# REPORTING
+# -------------------------
+def print_results(report: dict) -> None:
+    print(f"{'case':<26}{'rows':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'qps':>10}{'peak MB':>10}")
+    for r in report["results"]:
+        if r["status"] != "ok":
+            print(f"{r['case']:<26}{r['rows']:>9}   {r['status']}: {r['reason']}")
+            continue
+        print(
+            f"{r['case']:<26}{r['rows']:>9}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+            f"{r['p99_ms']:>10.2f}{r['throughput_qps']:>10.1f}{r['peak_mb']:>10.1f}"
+        )
+
+
+def print_comparison(rows: list) -> None:
+    for c in rows:
+        mark = "❌" if c["regression"] else "✅"
+        ratios = ", ".join(f"{m} x{ratio:.2f}" for m, ratio in c["ratios"].items())
+        print(f"{mark} {c['case']} @ {c['rows']}: {ratios}")
+
+
+# -------------------------
+# MAIN
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the recommendation engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalog sizes (rows)")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET_S,
+                        help="max seconds of timed calls per case and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="write the report JSON here")
+    parser.add_argument("--save-baseline", nargs="?", type=Path, const=BASELINE_PATH, default=None)
+    parser.add_argument("--compare", nargs="?", type=Path, const=BASELINE_PATH, default=None)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Benchmarking {len(args.cases or CASES)} cases at sizes {args.sizes}...")
+    report = run_suite(
+        args.sizes, args.cases, seed=args.seed,
+        repeats=args.repeats, warmup=args.warmup, time_budget_s=args.time_budget,
+    )
+    print_results(report)
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"✅ Report written to {args.output}")
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+        print(f"✅ Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        if not args.compare.exists():
+            print(f"No baseline at {args.compare}")
+            return 1
+        rows = compare(report, load_report(args.compare), args.tolerance)
+        print_comparison(rows)
+        if any(c["regression"] for c in rows):
+            print(f"❌ Regression beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
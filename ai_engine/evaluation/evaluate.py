@@ -0,0 +1,331 @@
+"""
+OFFLINE EVALUATION HARNESS
+==========================
+Ranking quality next to latency for every engine, so each speed
+optimization can be checked for quality loss.
+
+Run (from the project root):
+    python -m ai_engine.evaluation.evaluate --make-profiles 500 --profiles profiles.jsonl
+    python -m ai_engine.evaluation.evaluate --profiles profiles.jsonl --k 5 --output eval.json
+
+1. Load user profiles (JSONL): {"id", "input", "nl_query", "relevant"}
+   where `input` has the normalize_user_input shape and `relevant` lists
+   model names
+2. Replay every profile through each engine (on the same candidate pool
+   the view would use) and collect the ranked catalog row ids into one
+   (n_users x k) result matrix per engine, timing every call
+3. Score the matrices with the vectorized metrics: MAP@k, NDCG@k,
+   recall@k, catalog coverage and intra-list diversity
+
+--make-profiles writes known-item profiles: a target phone's specs
+become the input, the target and its storage variants are relevant.
+
+NO Django
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ai_engine.evaluation import metrics as M
+from ai_engine.evaluation.benchmark import SkipCase, require
+from ai_engine.evaluation.synthetic_catalog import load_source_catalog, synthetic_catalog
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+DEFAULT_K = 5
+FEATURES = ["price", "cam_resolution", "battery", "ram", "display_size", "weight", "release_year"]
+PROFILES = ["balanced", "performance", "battery"]
+
+
+def base_model(model_name: str) -> str:
+    # Same rule as the view's derive_base_model (storage variants)
+    return re.sub(r"\b\d+\s?(GB|TB)\b", "", model_name or "", flags=re.I).strip()
+
+
+# -------------------------
+# PROFILES
+# -------------------------
+def make_profiles(catalog: pd.DataFrame, n: int = 500, seed: int = 0) -> list:
+    """
+    Known-item profiles: each target phone's specs (rounded like a user
+    would type them) as input; the target and its variants as relevant.
+    """
+    rng = np.random.default_rng(seed)
+    bases = catalog["model"].astype(str).map(base_model)
+    variants = catalog.groupby(bases.to_numpy())["model"].agg(list)
+
+    profiles = []
+    for i, pos in enumerate(rng.integers(0, len(catalog), size=n)):
+        row = catalog.iloc[pos]
+        price = float(round(row["price"], -1))
+        profiles.append({
+            "id": i,
+            "input": {
+                "brand": row["brand"] if i % 2 == 0 else "",
+                "price": price,
+                "cam_resolution": float(row["cam_resolution"]),
+                "battery": float(row["battery"]),
+                "ram": float(row["ram"]),
+                "display_size": float(row["display_size"]),
+                "weight": float(row["weight"]),
+                "release_year": int(row["release_year"]),
+                "performance_profile": PROFILES[i % len(PROFILES)],
+            },
+            "nl_query": (
+                f"{row['brand']} phone under ${price:.0f} with a {row['cam_resolution']:.0f}MP camera, "
+                f"{row['ram']:.0f}GB RAM and a {row['battery']:.0f}mAh battery"
+            ),
+            "relevant": variants[bases.iloc[pos]],
+        })
+    return profiles
+
+
+def save_profiles(profiles: list, path: Path) -> None:
+    with open(path, "w") as f:
+        for p in profiles:
+            f.write(json.dumps(p, default=str) + "\n")
+
+
+def load_profiles(path: Path) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# -------------------------
+# CANDIDATE POOL (as in the view)
+# -------------------------
+def candidate_pool(catalog: pd.DataFrame, user_input: dict) -> pd.DataFrame:
+    """
+    The view's soft filters: brand, price +-30%, release year - 2.
+    """
+    mask = np.ones(len(catalog), dtype=bool)
+    if user_input.get("brand"):
+        mask &= (catalog["brand"].str.lower() == user_input["brand"].lower()).to_numpy()
+    if user_input.get("price", 0) > 0:
+        price = catalog["price"].to_numpy(dtype=float)
+        mask &= (price >= user_input["price"] * 0.7) & (price <= user_input["price"] * 1.3)
+    if user_input.get("release_year", 0) > 0:
+        mask &= catalog["release_year"].to_numpy() >= user_input["release_year"] - 2
+    return catalog[mask]
+
+
+# -------------------------
+# ENGINES
+# -------------------------
+# name -> setup(catalog, row_of) -> fn(profile, k) -> [catalog row ids]
+ENGINES = {}
+
+
+def engine(name):
+    def register(setup):
+        ENGINES[name] = setup
+        return setup
+    return register
+
+
+def _rows(models, row_of) -> list:
+    return [row_of[m] for m in models if m in row_of]
+
+
+@engine("hybrid")
+def _hybrid(catalog, row_of):
+    from ai_engine.recommender.recommender_engine import SmartphoneRecommender
+
+    recommender = SmartphoneRecommender(df=catalog)
+    return lambda p, k: _rows(
+        [item["model"] for item in recommender.recommend(p["input"], top_n=k)["items"]], row_of
+    )
+
+
+@engine("satisfaction")
+def _satisfaction(catalog, row_of):
+    from ai_engine.recommender.satisfaction_engine import SatisfactionRecommender
+
+    try:
+        recommender = SatisfactionRecommender(catalog)
+    except FileNotFoundError as e:
+        raise SkipCase(f"satisfaction model missing ({Path(e.filename).name})") from e
+
+    def run(p, k):
+        pool = candidate_pool(catalog, p["input"])
+        return recommender.recommend(p["input"], top_n=k, df_override=pool).index.tolist()
+    return run
+
+
+@engine("embedding")
+def _embedding(catalog, row_of):
+    require("sentence_transformers")
+    from ai_engine.recommender.embedding_engine import EmbeddingSmartphoneRecommender
+    from ai_engine.semantic.query_parser import apply_constraints, parse_query
+
+    recommender = EmbeddingSmartphoneRecommender(catalog)
+    brands = catalog["brand"].dropna().unique().tolist()
+
+    def run(p, k):
+        constraints = parse_query(p["nl_query"], brands)["constraints"]
+        pool = apply_constraints(candidate_pool(catalog, p["input"]), constraints)
+        return _rows(recommender.recommend(p["nl_query"], top_n=k, df_override=pool)["model"], row_of)
+    return run
+
+
+@engine("semantic")
+def _semantic(catalog, row_of):
+    require("sentence_transformers")
+    from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+
+    recommender = SemanticSmartphoneRecommender(catalog)
+    # rank() already returns catalog row positions
+    return lambda p, k: recommender.rank(p["nl_query"], top_n=k)[0].tolist()
+
+
+@engine("fusion")
+def _fusion(catalog, row_of):
+    from ai_engine.recommender.fusion_engine import FusionRecommender
+    from ai_engine.semantic.query_parser import parse_query
+
+    try:
+        require("sentence_transformers")
+        from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+        semantic = SemanticSmartphoneRecommender(catalog)
+    except SkipCase:
+        semantic = None  # feature + satisfaction only
+
+    recommender = FusionRecommender(catalog, semantic_engine=semantic)
+    brands = catalog["brand"].dropna().unique().tolist()
+
+    def run(p, k):
+        constraints = parse_query(p["nl_query"], brands)["constraints"]
+        rows, *_ = recommender.rank(p["input"], p["nl_query"], top_n=k, constraints=constraints)
+        return rows.tolist()
+    return run
+
+
+# -------------------------
+# HARNESS
+# -------------------------
+def replay(fn, profiles: list, k: int):
+    """
+    (n_users x k) PAD-padded row-id matrix and per-call latencies (s).
+    """
+    results, latencies = [], []
+    for p in profiles:
+        t0 = time.perf_counter()
+        results.append(fn(p, k))
+        latencies.append(time.perf_counter() - t0)
+    return M.to_matrix(results, width=k), np.array(latencies)
+
+
+def quality(recommended: np.ndarray, relevant: np.ndarray, item_features: np.ndarray, k: int) -> dict:
+    hits = M.hit_matrix(recommended, relevant)
+    n_relevant = M.relevant_counts(relevant)
+    return {
+        f"map@{k}": M.map_at_k(hits, n_relevant, k),
+        f"ndcg@{k}": M.ndcg_at_k(hits, n_relevant, k),
+        f"recall@{k}": M.recall_at_k(hits, n_relevant, k),
+        "coverage": M.coverage(recommended, len(item_features)),
+        "diversity": M.diversity(recommended, item_features),
+    }
+
+
+def item_feature_matrix(catalog: pd.DataFrame) -> np.ndarray:
+    """
+    Standardized specs (centered, so cosine distance separates phones).
+    """
+    X = catalog[FEATURES].to_numpy(dtype=float)
+    std = np.nanstd(X, axis=0)
+    return np.nan_to_num((X - np.nanmean(X, axis=0)) / np.where(std > 0, std, 1.0))
+
+
+def evaluate(catalog: pd.DataFrame, profiles: list, engines=None, k: int = DEFAULT_K) -> dict:
+    """
+    Quality + latency per engine. Catalog rows are addressed by
+    position (the catalog is re-indexed 0..n-1).
+    """
+    engines = list(engines or ENGINES)
+    catalog = catalog.reset_index(drop=True)
+    row_of = {}
+    for i, model in enumerate(catalog["model"].astype(str)):
+        row_of.setdefault(model, i)
+
+    relevant = M.to_matrix([_rows(p["relevant"], row_of) for p in profiles])
+    features = item_feature_matrix(catalog)
+
+    report = {"k": k, "users": len(profiles), "rows": len(catalog), "engines": {}}
+    for name in engines:
+        try:
+            fn = ENGINES[name](catalog, row_of)
+            recommended, latencies = replay(fn, profiles, k)
+        except SkipCase as e:
+            report["engines"][name] = {"status": "skipped", "reason": str(e)}
+            continue
+        except Exception as e:
+            report["engines"][name] = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+            continue
+
+        ms = latencies * 1000
+        report["engines"][name] = {
+            "status": "ok",
+            **quality(recommended, relevant, features, k),
+            "p50_ms": float(np.percentile(ms, 50)) if len(ms) else 0.0,
+            "p95_ms": float(np.percentile(ms, 95)) if len(ms) else 0.0,
+            "throughput_qps": float(len(ms) / latencies.sum()) if latencies.sum() else 0.0,
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    k = report["k"]
+    cols = [f"map@{k}", f"ndcg@{k}", f"recall@{k}", "coverage", "diversity", "p50_ms", "p95_ms"]
+    print(f"{'engine':<14}" + "".join(f"{c:>11}" for c in cols))
+    for name, r in report["engines"].items():
+        if r["status"] != "ok":
+            print(f"{name:<14}   {r['status']}: {r['reason']}")
+            continue
+        print(f"{name:<14}" + "".join(f"{r[c]:>11.3f}" for c in cols))
+
+
+# -------------------------
+# MAIN
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ranking-quality evaluation")
+    parser.add_argument("--profiles", type=Path, required=True, help="JSONL user profiles")
+    parser.add_argument("--make-profiles", type=int, default=None,
+                        help="write N known-item profiles to --profiles and exit")
+    parser.add_argument("--rows", type=int, default=None, help="synthetic catalog size (default: real catalog)")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=None)
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    catalog = synthetic_catalog(args.rows, seed=args.seed) if args.rows else load_source_catalog()
+
+    if args.make_profiles:
+        profiles = make_profiles(catalog, args.make_profiles, seed=args.seed)
+        save_profiles(profiles, args.profiles)
+        print(f"✅ {len(profiles)} profiles written to {args.profiles}")
+        return 0
+
+    profiles = load_profiles(args.profiles)
+    print(f"🚀 Evaluating {len(profiles)} profiles on {len(catalog)} catalog rows...")
+    report = evaluate(catalog, profiles, args.engines, args.k)
+    print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"✅ Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
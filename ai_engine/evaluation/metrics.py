@@ -1,13 +1,22 @@
 import numpy as np
 
+PAD = -1  # padding id in recommendation / relevance matrices
+
+
 def average_precision_at_k(recommended, relevant, k):
+    relevant = set(relevant)
+    if not relevant:
+        return 0.0
+
     score = 0.0
     hits = 0.0
+    seen = set()
 
     for i, item in enumerate(recommended[:k]):
-        if item in relevant and item not in recommended[:i]:
+        if item in relevant and item not in seen:
             hits += 1
             score += hits / (i + 1)
+        seen.add(item)
 
     return score / min(len(relevant), k)
 
@@ -22,3 +31,131 @@ def mean_average_precision(recommendations, ground_truth, k=5):
             )
         )
     return np.mean(scores)
+
+
+# -------------------------
+# VECTORIZED (result matrices)
+# -------------------------
+# recommended: (n_users, k) int item ids, ranked, PAD-padded
+# relevant:    (n_users, m) int item ids, any order, PAD-padded
+# hits:        (n_users, k) bool, True where recommended[u, i] is relevant
+#              (first occurrence of an item in a row only)
+
+def to_matrix(lists, width: int = None) -> np.ndarray:
+    """
+    Ragged lists of item ids -> PAD-padded int matrix.
+    """
+    width = width if width is not None else max((len(x) for x in lists), default=0)
+    out = np.full((len(lists), width), PAD, dtype=np.int64)
+    for u, items in enumerate(lists):
+        items = list(items)[:width]
+        out[u, :len(items)] = items
+    return out
+
+
+def first_occurrence(recommended: np.ndarray) -> np.ndarray:
+    """
+    True where an id appears for the first time in its row (PAD -> False).
+    O(k log k) per row via a stable sort.
+    """
+    n, k = recommended.shape
+    if k == 0:
+        return np.zeros((n, 0), dtype=bool)
+    order = np.argsort(recommended, axis=1, kind="stable")
+    ordered = np.take_along_axis(recommended, order, axis=1)
+    first_sorted = np.ones_like(ordered, dtype=bool)
+    first_sorted[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+
+    first = np.empty_like(first_sorted)
+    np.put_along_axis(first, order, first_sorted, axis=1)
+    return first & (recommended != PAD)
+
+
+def hit_matrix(recommended: np.ndarray, relevant: np.ndarray) -> np.ndarray:
+    """
+    Membership of every recommended id in its row's relevant set, for
+    all users at once (one flat searchsorted over row-offset keys).
+    """
+    recommended = np.asarray(recommended, dtype=np.int64)
+    relevant = np.asarray(relevant, dtype=np.int64)
+    n = recommended.shape[0]
+    if relevant.size == 0 or recommended.size == 0:
+        return np.zeros(recommended.shape, dtype=bool)
+
+    span = int(max(recommended.max(), relevant.max())) + 2
+    rows = np.arange(n, dtype=np.int64)[:, None] * span
+
+    rel_keys = np.where(relevant != PAD, rows + relevant, -1).ravel()
+    rel_keys = np.sort(rel_keys[rel_keys >= 0])
+    rec_keys = rows + recommended
+
+    pos = np.searchsorted(rel_keys, rec_keys)
+    found = rel_keys[np.minimum(pos, len(rel_keys) - 1)] == rec_keys if len(rel_keys) else False
+    return found & first_occurrence(recommended)
+
+
+def relevant_counts(relevant: np.ndarray) -> np.ndarray:
+    """
+    Distinct relevant ids per user.
+    """
+    return first_occurrence(np.asarray(relevant, dtype=np.int64)).sum(axis=1)
+
+
+def map_at_k(hits: np.ndarray, n_relevant: np.ndarray, k: int = None) -> float:
+    k = k or hits.shape[1]
+    hits = hits[:, :k].astype(float)
+    precision = np.cumsum(hits, axis=1) / np.arange(1, hits.shape[1] + 1)
+    denom = np.minimum(n_relevant, k).astype(float)
+    ap = np.divide((precision * hits).sum(axis=1), denom, out=np.zeros(len(hits)), where=denom > 0)
+    return float(ap.mean()) if len(ap) else 0.0
+
+
+def ndcg_at_k(hits: np.ndarray, n_relevant: np.ndarray, k: int = None) -> float:
+    k = k or hits.shape[1]
+    hits = hits[:, :k].astype(float)
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = (hits * discounts[:hits.shape[1]]).sum(axis=1)
+
+    ideal_cum = np.concatenate([[0.0], np.cumsum(discounts)])
+    idcg = ideal_cum[np.minimum(n_relevant, k)]
+    ndcg = np.divide(dcg, idcg, out=np.zeros(len(hits)), where=idcg > 0)
+    return float(ndcg.mean()) if len(ndcg) else 0.0
+
+
+def recall_at_k(hits: np.ndarray, n_relevant: np.ndarray, k: int = None) -> float:
+    k = k or hits.shape[1]
+    found = hits[:, :k].sum(axis=1).astype(float)
+    recall = np.divide(found, n_relevant, out=np.zeros(len(hits)), where=n_relevant > 0)
+    return float(recall.mean()) if len(recall) else 0.0
+
+
+def coverage(recommended: np.ndarray, n_items: int) -> float:
+    """
+    Share of the catalog recommended to at least one user.
+    """
+    ids = np.unique(recommended[recommended != PAD])
+    return len(ids) / n_items if n_items else 0.0
+
+
+def diversity(recommended: np.ndarray, item_features: np.ndarray) -> float:
+    """
+    Mean intra-list diversity: 1 - cosine similarity over every pair of
+    items in a user's list, averaged over users with >= 2 items.
+    """
+    valid = recommended != PAD
+    F = np.asarray(item_features, dtype=float)
+    F = F / (np.linalg.norm(F, axis=1, keepdims=True) + 1e-12)
+
+    V = F[np.where(valid, recommended, 0)] * valid[..., None]  # (n, k, d)
+    sims = np.einsum("ukd,ujd->ukj", V, V)
+
+    pair_mask = valid[:, :, None] & valid[:, None, :]
+    k = recommended.shape[1]
+    pair_mask &= ~np.eye(k, dtype=bool)[None]
+
+    n_pairs = pair_mask.sum(axis=(1, 2))
+    dissim = ((1 - sims) * pair_mask).sum(axis=(1, 2))
+    users = n_pairs > 0
+    if not users.any():
+        return 0.0
+    return float((dissim[users] / n_pairs[users]).mean())
@@ -0,0 +1,99 @@
+"""
+SYNTHETIC CATALOG
+=================
+Scales the real catalog to any size (10k - 1M+ rows) for benchmarks and
+offline evaluation.
+
+Rows are resampled from the cleaned catalog (raw_df.pkl, or the CSVs
+when no artifacts are built), continuous specs are jittered so rows are
+not exact copies, and model names get a numeric suffix so they stay
+unique. Brand, chipset and discrete specs (RAM, camera) keep their real
+distribution.
+
+NO Django
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ai_engine.recommender.data_loader import (
+    ASSETS_DIR,
+    clean_features,
+    load_datasets,
+    prepare_raw_dataframe,
+)
+
+# Relative (multiplicative) jitter per continuous column
+JITTER = {
+    "price": 0.10,
+    "battery": 0.05,
+    "weight": 0.05,
+}
+
+
+def load_source_catalog() -> pd.DataFrame:
+    """
+    Cleaned real catalog: raw_df.pkl when built, otherwise parsed from
+    the CSVs.
+    """
+    path = ASSETS_DIR / "raw_df.pkl"
+    if path.exists():
+        return joblib.load(path)
+    return clean_features(prepare_raw_dataframe(*load_datasets()))
+
+
+def synthetic_catalog(n_rows: int, source: pd.DataFrame = None, seed: int = 0) -> pd.DataFrame:
+    """
+    `n_rows` catalog rows resampled from `source` (see module docstring).
+    The first len(source) rows are the source itself, unjittered.
+    """
+    source = load_source_catalog() if source is None else source
+    source = source.reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+
+    n_real = min(n_rows, len(source))
+    picks = np.concatenate([
+        np.arange(n_real),
+        rng.integers(0, len(source), size=n_rows - n_real),
+    ])
+    df = source.iloc[picks].reset_index(drop=True)
+
+    synthetic = np.arange(n_rows) >= n_real
+    n_synth = int(synthetic.sum())
+    if n_synth:
+        for col, spread in JITTER.items():
+            if col in df.columns:
+                values = df[col].to_numpy(dtype=float, copy=True)
+                values[synthetic] *= rng.uniform(1 - spread, 1 + spread, size=n_synth)
+                df[col] = np.round(values, 2)
+
+        suffix = pd.Series(np.arange(n_rows).astype(str))
+        df["model"] = df["model"].astype(str).where(~synthetic, df["model"].astype(str) + " #" + suffix)
+
+    return df
+
+
+def sample_user_inputs(catalog: pd.DataFrame, n: int = 32, seed: int = 0) -> list:
+    """
+    Plausible user inputs (normalize_user_input shape) derived from
+    catalog rows, so benchmarks exercise realistic filter selectivity.
+    """
+    rng = np.random.default_rng(seed)
+    rows = catalog.iloc[rng.integers(0, len(catalog), size=n)]
+    profiles = ["balanced", "performance", "battery"]
+
+    inputs = []
+    for i, (_, row) in enumerate(rows.iterrows()):
+        inputs.append({
+            "brand": row["brand"] if i % 2 == 0 else "",
+            "price": float(round(row["price"], -1)),
+            "cam_resolution": float(row["cam_resolution"]),
+            "battery": float(row["battery"]),
+            "ram": float(row["ram"]),
+            "display_size": float(row["display_size"]),
+            "weight": float(row["weight"]),
+            "release_year": int(row["release_year"]),
+            "performance_profile": profiles[i % len(profiles)],
+        })
+    return inputs
@@ -0,0 +1,334 @@
+"""
+ai_engine.live_data.enrich_catalog
+
+OFFLINE bulk enrichment of the whole catalog from GSMArena.
+
+Run:
+    python -m ai_engine.live_data.enrich_catalog [--workers 8 --rate 1.0]
+
+1. Take every model from raw_df.pkl (storage variants share one lookup)
+2. Fetch spec page + main image concurrently (bounded thread pool,
+   shared rate-limited / cached GSMAFetcher)
+3. Parse the spec table into typed columns
+4. Append each finished model to a JSONL checkpoint (resumable)
+5. Save the typed columns as their own artifact (enrichment.pkl, keyed
+   by lookup name) and merge them into raw_df.pkl. data_loader joins
+   the same artifact on every rebuild, so enrichment survives catalog
+   updates
+
+Interrupt at any time: finished models are skipped on the next run,
+failed ones are retried.
+
+NO Django
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import joblib
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from ai_engine.live_data.fetcher import GSMAFetcher
+from ai_engine.live_data.gsma_scraper import fetch_phone_image
+
+
+# -------------------------
+# PATH CONFIGURATION
+# -------------------------
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BASE_DIR.parent.parent
+ASSETS_DIR = BASE_DIR.parent / "recommender" / "assets"
+ENRICH_DIR = ASSETS_DIR / "enrichment"
+CHECKPOINT_PATH = ENRICH_DIR / "checkpoint.jsonl"
+ENRICHMENT_PATH = ENRICH_DIR / "enrichment.pkl"  # joined in by data_loader
+HTTP_CACHE_DIR = ENRICH_DIR / "http_cache"
+IMAGES_DIR = PROJECT_DIR / "web" / "media" / "phone_images"  # MEDIA_ROOT/phone_images
+
+# Typed columns merged into raw_df
+SPEC_COLUMNS = [
+    "width_mm", "height_mm", "thickness_mm",
+    "gsma_weight_g", "gsma_display_in", "gsma_battery_mah",
+    "gsma_ram_gb", "gsma_main_camera_mp", "gsma_chipset",
+    "gsma_5g", "gsma_year", "gsma_price_usd",
+]
+ENRICHED_COLUMNS = SPEC_COLUMNS + ["gsma_url", "image_path"]
+
+_STORAGE_RE = re.compile(r"\b\d+\s?(GB|TB)\b", re.I)
+
+
+def lookup_name(model_name: str) -> str:
+    """
+    Storage variants ("iPhone 16 128GB") share one GSMArena page.
+    """
+    return " ".join(_STORAGE_RE.sub("", str(model_name)).split())
+
+
+# -------------------------
+# SPEC PARSING
+# -------------------------
+_NUM = r"(\d+(?:\.\d+)?)"
+_DIMENSIONS_RE = re.compile(_NUM + r"\s*x\s*" + _NUM + r"\s*x\s*" + _NUM + r"\s*mm")
+_WEIGHT_RE = re.compile(_NUM + r"\s*g\b")
+_DISPLAY_RE = re.compile(_NUM + r"\s*inch")
+_BATTERY_RE = re.compile(r"(\d[\d,]*)\s*mAh", re.I)
+_RAM_RE = re.compile(_NUM + r"\s*GB\s+RAM", re.I)
+_CAMERA_RE = re.compile(_NUM + r"\s*MP")
+_YEAR_RE = re.compile(r"\b(20\d{2}|19\d{2})\b")
+_USD_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+
+
+def _first(pattern, text, cast=float):
+    m = pattern.search(text or "")
+    return cast(m.group(1).replace(",", "")) if m else None
+
+
+def raw_spec_fields(html: str) -> dict:
+    """
+    GSMArena tags each value cell with data-spec="..." (dimensions, weight,
+    displaysize, chipset, internalmemory, batdescription1, ...).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    return {
+        td["data-spec"]: td.get_text(" ", strip=True)
+        for td in soup.select("td[data-spec]")
+    }
+
+
+def parse_typed_specs(fields: dict) -> dict:
+    """
+    Raw data-spec fields -> typed enrichment columns (None when missing).
+    """
+    typed = dict.fromkeys(SPEC_COLUMNS)
+
+    m = _DIMENSIONS_RE.search(fields.get("dimensions", ""))
+    if m:
+        typed["height_mm"], typed["width_mm"], typed["thickness_mm"] = map(float, m.groups())
+
+    typed["gsma_weight_g"] = _first(_WEIGHT_RE, fields.get("weight"))
+    typed["gsma_display_in"] = _first(_DISPLAY_RE, fields.get("displaysize"))
+    typed["gsma_battery_mah"] = _first(_BATTERY_RE, fields.get("batdescription1"))
+
+    rams = [float(x) for x in _RAM_RE.findall(fields.get("internalmemory", ""))]
+    typed["gsma_ram_gb"] = max(rams) if rams else None
+
+    typed["gsma_main_camera_mp"] = _first(_CAMERA_RE, fields.get("cam1modules"))
+    typed["gsma_chipset"] = fields.get("chipset") or None
+
+    nettech = fields.get("nettech")
+    typed["gsma_5g"] = (1 if "5G" in nettech else 0) if nettech else None
+
+    typed["gsma_year"] = _first(_YEAR_RE, fields.get("year") or fields.get("status"), int)
+    typed["gsma_price_usd"] = _first(_USD_RE, fields.get("price"))
+
+    return typed
+
+
+# -------------------------
+# CHECKPOINT
+# -------------------------
+def load_checkpoint(path: Path) -> dict:
+    """
+    lookup name -> record, last record wins. A torn last line (crash
+    mid-write) or a partial record (no name) is ignored.
+    """
+    done = {}
+    if not path.exists():
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict) or "name" not in record:
+                continue
+            done[record["name"]] = record
+    return done
+
+
+class CheckpointWriter:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        torn = False
+        if path.exists() and path.stat().st_size > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._f = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        if torn:
+            self._f.write("\n")  # isolate a torn last line from new records
+
+    def write(self, record: dict) -> None:
+        with self._lock:
+            self._f.write(json.dumps(record) + "\n")
+            self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+# -------------------------
+# ONE MODEL
+# -------------------------
+def enrich_one(name: str, fetcher: GSMAFetcher, images_dir=None) -> dict:
+    try:
+        phone_url = fetcher.search(name)
+        if phone_url is None:
+            return {"name": name, "status": "not_found"}
+
+        typed = parse_typed_specs(raw_spec_fields(fetcher.get_text(phone_url)))
+        typed["gsma_url"] = phone_url
+        typed["image_path"] = (
+            fetch_phone_image(name, fetcher=fetcher, images_dir=images_dir)
+            if images_dir is not None else None
+        )
+        return {"name": name, "status": "ok", "specs": typed}
+
+    except Exception as e:
+        return {"name": name, "status": "error", "error": str(e)}
+
+
+# -------------------------
+# BULK RUN
+# -------------------------
+def run_enrichment(
+    names,
+    fetcher: GSMAFetcher,
+    checkpoint_path: Path = CHECKPOINT_PATH,
+    images_dir=IMAGES_DIR,
+    workers: int = 8,
+    progress_every: int = 25,
+) -> dict:
+    """
+    Enrich `names` concurrently, skipping those already finished in the
+    checkpoint. Returns the full checkpoint state.
+    """
+    done = load_checkpoint(checkpoint_path)
+    todo = [
+        n for n in dict.fromkeys(names)
+        if done.get(n, {}).get("status") not in ("ok", "not_found")
+    ]
+
+    total = len(todo)
+    print(f"🔎 Enrichment: {total} to fetch, {len(done)} already in checkpoint")
+    if not total:
+        return done
+
+    writer = CheckpointWriter(checkpoint_path)
+    counts = {"ok": 0, "not_found": 0, "error": 0}
+    start = time.monotonic()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(enrich_one, n, fetcher, images_dir) for n in todo]
+
+            for i, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                writer.write(record)
+                done[record["name"]] = record
+                counts[record["status"]] += 1
+
+                if i % progress_every == 0 or i == total:
+                    elapsed = time.monotonic() - start
+                    rate = i / elapsed if elapsed else 0.0
+                    eta = (total - i) / rate if rate else 0.0
+                    print(
+                        f"   • {i}/{total} ({rate:.2f}/s, ETA {eta:.0f}s) "
+                        f"ok={counts['ok']} not_found={counts['not_found']} error={counts['error']}"
+                    )
+    finally:
+        writer.close()
+
+    return done
+
+
+# -------------------------
+# MERGE INTO ARTIFACTS
+# -------------------------
+def enrichment_table(done: dict) -> pd.DataFrame:
+    """
+    Typed columns of every finished model, one row per lookup name
+    (the enrichment.pkl artifact).
+    """
+    rows = [
+        {"_lookup": name, **record["specs"]}
+        for name, record in done.items()
+        if record.get("status") == "ok" and isinstance(record.get("specs"), dict)
+    ]
+    return pd.DataFrame(rows, columns=["_lookup"] + ENRICHED_COLUMNS)
+
+
+def merge_enrichment(raw_df: pd.DataFrame, enriched: pd.DataFrame) -> pd.DataFrame:
+    """
+    Left-join an enrichment_table onto raw_df by lookup name. Curated
+    columns (price, battery, ...) are never overwritten.
+    """
+    enriched = enriched.drop_duplicates(subset=["_lookup"], keep="last")
+    out = raw_df.drop(columns=[c for c in ENRICHED_COLUMNS if c in raw_df.columns])
+    out = out.assign(_lookup=out["model"].map(lookup_name))
+    out = out.merge(enriched, on="_lookup", how="left").drop(columns=["_lookup"])
+    out.index = raw_df.index
+    return out
+
+
+def _atomic_dump(obj, path: Path) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    os.close(fd)
+    joblib.dump(obj, tmp_name)
+    os.replace(tmp_name, path)
+
+
+# -------------------------
+# MAIN
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich raw_df.pkl with GSMArena specs and images")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=1.0, help="requests per second")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N models")
+    parser.add_argument("--no-images", action="store_true")
+    parser.add_argument("--merge-only", action="store_true", help="merge existing checkpoint only")
+    args = parser.parse_args(argv)
+
+    raw_path = ASSETS_DIR / "raw_df.pkl"
+    raw_df = joblib.load(raw_path)
+
+    names = list(dict.fromkeys(raw_df["model"].map(lookup_name)))
+    if args.limit:
+        names = names[:args.limit]
+
+    if args.merge_only:
+        done = load_checkpoint(CHECKPOINT_PATH)
+    else:
+        fetcher = GSMAFetcher(cache_dir=HTTP_CACHE_DIR, rate=args.rate, pool_size=args.workers)
+        done = run_enrichment(
+            names,
+            fetcher,
+            images_dir=None if args.no_images else IMAGES_DIR,
+            workers=args.workers,
+        )
+
+    enriched = enrichment_table(done)
+    ENRICHMENT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_dump(enriched, ENRICHMENT_PATH)
+
+    merged = merge_enrichment(raw_df, enriched)
+    _atomic_dump(merged, raw_path)
+
+    matched = merged["gsma_url"].notna().sum()
+    print(f"✅ Enrichment saved to {ENRICHMENT_PATH.name} and merged into raw_df.pkl")
+    print(f"   • {matched}/{len(merged)} rows enriched")
+
+
+if __name__ == "__main__":
+    main()
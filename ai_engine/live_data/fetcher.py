@@ -0,0 +1,273 @@
+"""
+ai_engine.live_data.fetcher
+
+HTTP fetch layer for GSMArena scraping.
+NO Django imports.
+
+- One pooled requests.Session (keep-alive, retries on 429/5xx)
+- Per-host token-bucket rate limiting instead of fixed sleeps
+- On-disk response cache revalidated with ETag / Last-Modified
+- Search results shared between specs and image lookups
+- Thread-safe: one fetcher can be used from a worker pool
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import quote_plus, urljoin, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Research Project)"
+}
+
+GSMA_BASE = "https://www.gsmarena.com/"
+SEARCH_PATH = "results.php3?sQuickSearch=yes&sName={}"
+
+
+# -----------------------------
+# RATE LIMITING
+# -----------------------------
+class TokenBucket:
+    """
+    `rate` requests per second with bursts of up to `capacity`.
+
+    Tokens are reserved under the lock and any wait happens outside it,
+    so concurrent callers queue fairly without holding each other up.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting if needed. Returns seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# -----------------------------
+# ON-DISK RESPONSE CACHE
+# -----------------------------
+class ResponseCache:
+    """
+    <root>/<sha256(url)>.json   validators + fetch time
+    <root>/<sha256(url)>.body   raw response bytes
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.body"
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=self.root)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+
+    def load(self, url: str):
+        """
+        Returns (meta, body) or (None, None).
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, None
+        return meta, body
+
+    def store(self, url: str, meta: dict, body: bytes = None) -> None:
+        meta_path, body_path = self._paths(url)
+        # Body first: a meta file never points at a missing / partial body
+        if body is not None:
+            self._atomic_write(body_path, body)
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+# -----------------------------
+# FETCHER
+# -----------------------------
+class GSMAFetcher:
+    """
+    Shared HTTP client for GSMArena pages and images.
+
+    Args:
+        cache_dir: on-disk response cache (None disables it)
+        base_url: site root (point at a local stub server in tests)
+        rate: requests per second per host
+        burst: token-bucket capacity per host
+        fresh_for: seconds a cached response is served without revalidation
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        base_url: str = GSMA_BASE,
+        rate: float = 0.5,
+        burst: float = 1.0,
+        fresh_for: float = 24 * 3600,
+        timeout: float = 10,
+        pool_size: int = 8,
+        session: requests.Session = None,
+        search_memo_size: int = 4096,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.rate = rate
+        self.burst = burst
+        self.fresh_for = fresh_for
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+        self.session = session or self._build_session(pool_size)
+
+        self._buckets = {}
+        self._search_memo = OrderedDict()
+        self._search_memo_size = search_memo_size
+        self._lock = threading.Lock()
+        self.stats = {"network": 0, "revalidated": 0, "fresh": 0, "search_memo": 0}
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    # -------------------------
+    # RAW GET
+    # -------------------------
+    def get(self, url: str, use_cache: bool = True) -> bytes:
+        """
+        GET `url`, served from / revalidated against the disk cache.
+        Raises requests.HTTPError on non-2xx responses.
+        """
+        cache = self.cache if use_cache else None
+        meta, body = cache.load(url) if cache else (None, None)
+
+        if meta is not None and time.time() - meta.get("fetched_at", 0) < self.fresh_for:
+            self._count("fresh")
+            return body
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        self._bucket_for(url).acquire()
+        self._count("network")
+        res = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if res.status_code == 304 and meta is not None:
+            self._count("revalidated")
+            meta["fetched_at"] = time.time()
+            cache.store(url, meta)
+            return body
+
+        res.raise_for_status()
+
+        if cache:
+            cache.store(url, {
+                "url": url,
+                "etag": res.headers.get("ETag"),
+                "last_modified": res.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }, res.content)
+
+        return res.content
+
+    def get_text(self, url: str, use_cache: bool = True) -> str:
+        return self.get(url, use_cache=use_cache).decode("utf-8", errors="replace")
+
+    def absolute(self, href: str) -> str:
+        if href.startswith("//"):
+            return "https:" + href
+        return urljoin(self.base_url, href)
+
+    # -------------------------
+    # GSMARENA HELPERS
+    # -------------------------
+    def search(self, model_name: str):
+        """
+        URL of the first search hit for a model, or None.
+        Memoized in-process; the search page itself is also disk-cached.
+        """
+        key = " ".join(model_name.lower().split())
+
+        with self._lock:
+            if key in self._search_memo:
+                self._search_memo.move_to_end(key)
+                self.stats["search_memo"] += 1
+                return self._search_memo[key]
+
+        url = self.base_url + SEARCH_PATH.format(quote_plus(model_name))
+        soup = BeautifulSoup(self.get_text(url), "html.parser")
+        first = soup.select_one(".makers li a") or soup.select_one(".makers a")
+        phone_url = self.absolute(first["href"]) if first and first.get("href") else None
+
+        with self._lock:
+            self._search_memo[key] = phone_url
+            if len(self._search_memo) > self._search_memo_size:
+                self._search_memo.popitem(last=False)
+
+        return phone_url
+
+    def phone_page(self, model_name: str):
+        """
+        HTML of a model's spec page, or None if the search has no hit.
+        """
+        phone_url = self.search(model_name)
+        if phone_url is None:
+            return None
+        return self.get_text(phone_url)
@@ -3,34 +3,41 @@ ai_engine.live_data.gsma_scraper
 
 Fetches phone specs and downloads main phone image from GSMArena.
 Returns LOCAL filesystem paths only.
+
+All HTTP goes through one shared GSMAFetcher (pooled session, per-host
+rate limiting, on-disk HTTP cache), so the search page is fetched once
+for both specs and image lookups.
 """
 
-import time
-import requests
+import os
+import tempfile
+import threading
 from pathlib import Path
 from bs4 import BeautifulSoup
 from django.conf import settings
 
+from ai_engine.live_data.fetcher import GSMA_BASE, HEADERS, SEARCH_PATH, GSMAFetcher
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Research Project)"
-}
 
-GSMA_SEARCH = "https://www.gsmarena.com/results.php3?sQuickSearch=yes&sName={}"
+GSMA_SEARCH = GSMA_BASE + SEARCH_PATH
 
+_FETCHER = None
+_FETCHER_LOCK = threading.Lock()
 
-def fetch_phone_specs(model_name: str) -> dict:
-    url = GSMA_SEARCH.format(model_name.replace(" ", "+"))
-    res = requests.get(url, headers=HEADERS, timeout=10)
-    soup = BeautifulSoup(res.text, "html.parser")
 
-    first = soup.select_one(".makers li a")
-    if not first:
-        return {}
+def get_fetcher() -> GSMAFetcher:
+    """
+    Process-wide fetcher, HTTP cache under MEDIA_ROOT/http_cache.
+    """
+    global _FETCHER
+    with _FETCHER_LOCK:
+        if _FETCHER is None:
+            _FETCHER = GSMAFetcher(cache_dir=Path(settings.MEDIA_ROOT) / "http_cache")
+        return _FETCHER
+
 
-    phone_url = "https://www.gsmarena.com/" + first["href"]
-    page = requests.get(phone_url, headers=HEADERS, timeout=10)
-    soup = BeautifulSoup(page.text, "html.parser")
+def parse_spec_table(html: str) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
 
     specs = {}
     for row in soup.select("table tr"):
@@ -42,7 +49,17 @@ def fetch_phone_specs(model_name: str) -> dict:
     return specs
 
 
-def fetch_phone_image(model_name: str) -> str | None:
+def fetch_phone_specs(model_name: str, fetcher: GSMAFetcher = None) -> dict:
+    fetcher = fetcher or get_fetcher()
+
+    html = fetcher.phone_page(model_name)
+    if html is None:
+        return {}
+
+    return parse_spec_table(html)
+
+
+def fetch_phone_image(model_name: str, fetcher: GSMAFetcher = None, images_dir=None) -> str | None:
     """
     Downloads the main phone image from GSMArena.
     Returns LOCAL filesystem path or None.
@@ -50,7 +67,9 @@ def fetch_phone_image(model_name: str) -> str | None:
 
     model_safe = model_name.lower().replace(" ", "_")
 
-    images_dir = Path(settings.MEDIA_ROOT) / "phone_images"
+    if images_dir is None:
+        images_dir = Path(settings.MEDIA_ROOT) / "phone_images"
+    images_dir = Path(images_dir)
     images_dir.mkdir(parents=True, exist_ok=True)
 
     image_path = images_dir / f"{model_safe}.jpg"
@@ -59,30 +78,27 @@ def fetch_phone_image(model_name: str) -> str | None:
     if image_path.exists():
         return str(image_path)
 
-    time.sleep(2)  # polite scraping
-
-    search_url = GSMA_SEARCH.format(model_name.replace(" ", "+"))
-    res = requests.get(search_url, headers=HEADERS, timeout=10)
-    soup = BeautifulSoup(res.text, "html.parser")
+    fetcher = fetcher or get_fetcher()
 
-    phone_link = soup.select_one(".makers a")
-    if not phone_link:
+    # Same (cached) search + phone page as fetch_phone_specs
+    html = fetcher.phone_page(model_name)
+    if html is None:
         return None
 
-    phone_page = "https://www.gsmarena.com/" + phone_link["href"]
-    phone_res = requests.get(phone_page, headers=HEADERS, timeout=10)
-    soup = BeautifulSoup(phone_res.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
 
     img = soup.select_one(".specs-photo-main img")
     if not img or not img.get("src"):
         return None
 
-    img_url = img["src"]
-    if img_url.startswith("//"):
-        img_url = "https:" + img_url
+    img_url = fetcher.absolute(img["src"])
+
+    # Download image (the file itself is the cache)
+    img_data = fetcher.get(img_url, use_cache=False)
 
-    # Download image
-    img_data = requests.get(img_url, headers=HEADERS, timeout=15).content
-    image_path.write_bytes(img_data)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{model_safe}.", dir=images_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(img_data)
+    os.replace(tmp_name, image_path)
 
     return str(image_path)
@@ -3,6 +3,8 @@
 import difflib
 import pandas as pd
 
+from ai_engine.telemetry.spans import timed
+
 
 def normalize_brand_name(brand: str) -> str:
     """
@@ -13,6 +15,7 @@ def normalize_brand_name(brand: str) -> str:
     return brand.strip().lower()
 
 
+@timed("resolve_brand")
 def resolve_brand(user_brand: str, df: pd.DataFrame) -> dict:
     """
     Resolve user brand to dataset brand.
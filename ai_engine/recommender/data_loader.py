@@ -3,7 +3,8 @@ This our new Main instead of main.py
 
 DATA LOADER & PREPROCESSOR
 =========================
-We'll Run this file ONCE to:
+We'll Run this file ONCE (from the project root:
+`python -m ai_engine.recommender.data_loader`) to:
 1. Load raw smartphone datasets
 2. Clean & normalize features
 3. Save reusable ML artifacts
@@ -12,6 +13,18 @@ Outputs will be :
 - raw_df.pkl        (UI / explainability)
 - processed_df.pkl  (ML similarity engine)
 - scaler.pkl        (inference normalization)
+- materialized_lists.pkl (cold-start / preset top-N lists, see materialized.py)
+
+raw_df.pkl also carries the precomputed `satisfaction_score` column
+when a trained satisfaction_model.pkl is available, and the GSMArena
+columns from enrichment/enrichment.pkl (live_data.enrich_catalog) when
+that artifact exists.
+
+Builds are INCREMENTAL (build_manifest.json): unchanged input files skip
+the run, only new / changed rows are re-parsed, the scaler is extended
+with partial_fit when phones are only added, and satisfaction scores /
+model-name embeddings are recomputed only for rows that changed.
+Use `--full` to rebuild everything.
 
 NO Django
 NO inference
@@ -21,12 +34,34 @@ NO user input
 import warnings
 warnings.filterwarnings("ignore")
 
+import argparse
+import copy
+import hashlib
+import json
 from pathlib import Path
 import pandas as pd
 import numpy as np
 import joblib , os
 from sklearn.preprocessing import MinMaxScaler
 
+from ai_engine.recommender.materialized import (
+    MATERIALIZED_PATH,
+    build_materialized,
+    catalog_version,
+    save_materialized,
+)
+from ai_engine.recommender.spec_parser import COLUMN_KINDS, parse_column, parse_price_column
+from ai_engine.recommender.satisfaction_engine import (
+    MODEL_PATH,
+    NUMERIC_FEATURES,
+    SCORE_COLUMN,
+    SCORE_VERSION_COLUMN,
+    attach_satisfaction_scores,
+    load_satisfaction_model,
+    model_version,
+    predict_satisfaction,
+)
+
 
 # -------------------------
 # PATH CONFIGURATION
@@ -36,60 +71,80 @@ DATA_DIR = BASE_DIR.parent.parent / "data"
 ASSETS_DIR = BASE_DIR / "assets"
 ASSETS_DIR.mkdir(parents=True, exist_ok=True)
 
+INPUT_FILES = ["SmartPhones.csv", "smartphones_dataset_600_rows.csv"]
+MANIFEST_PATH = ASSETS_DIR / "build_manifest.json"
+PARSED_CACHE_PATH = ASSETS_DIR / "parsed_rows.pkl"  # parsed, not yet median-filled
+ENRICHMENT_PATH = ASSETS_DIR / "enrichment" / "enrichment.pkl"  # written by live_data.enrich_catalog
+
+# Bump when parsing changes: invalidates the manifest and parsed-row cache
+PARSER_VERSION = 2
+
 
 # -------------------------
 # LOAD DATASETS
 # -------------------------
 def load_datasets():
-    df_main = pd.read_csv(DATA_DIR / "SmartPhones.csv", encoding="latin1")
-    df_extra = pd.read_csv(DATA_DIR / "smartphones_dataset_600_rows.csv", encoding="latin1")
+    df_main = pd.read_csv(DATA_DIR / INPUT_FILES[0], encoding="latin1")
+    df_extra = pd.read_csv(DATA_DIR / INPUT_FILES[1], encoding="latin1")
     return df_main, df_extra
 
 
 # -------------------------
 # CLEAN & MERGE DATA
 # -------------------------
+MAIN_RENAME = {
+    "Company Name": "brand",
+    "Launched Price (USA)": "price",
+    "Model Name": "model",
+    "Mobile Weight": "weight",
+    "RAM": "ram",
+    "Back Camera": "cam_resolution",
+    "Battery Capacity": "battery",
+    "Screen Size": "display_size",
+    "Launched Year": "release_year"
+}
+
+# Local launch prices, kept next to the USD `price`
+LOCAL_PRICE_COLUMNS = {
+    "Launched Price (Pakistan)": ("price_pkr", "PKR"),
+    "Launched Price (India)": ("price_inr", "INR"),
+    "Launched Price (China)": ("price_cny", "CNY"),
+    "Launched Price (Dubai)": ("price_aed", "AED"),
+}
+
+# Secondary dataset: only these columns are merged in
+EXTRA_RENAME = {
+    "5G": "5G",
+    "Chipset": "chipset",
+    "Display_Type": "display_type",
+}
+
+RAW_COLUMNS = [
+    "model", "brand", "price", "cam_resolution", "battery",
+    "ram", "chipset", "5G", "display_size",
+    "display_type", "weight", "release_year"
+] + [name for name, _ in LOCAL_PRICE_COLUMNS.values()]
+
+
 def prepare_raw_dataframe(df, other_df):
     # Rename columns
-    df = df.rename(columns={
-        "Company Name": "brand",
-        "Launched Price (USA)": "price",
-        "Model Name": "model",
-        "Mobile Weight": "weight",
-        "RAM": "ram",
-        "Back Camera": "cam_resolution",
-        "Battery Capacity": "battery",
-        "Screen Size": "display_size",
-        "Launched Year": "release_year"
-    })
+    df = df.rename(columns=MAIN_RENAME)
+    df = df.rename(columns={src: name for src, (name, _) in LOCAL_PRICE_COLUMNS.items()})
 
     # Drop unused columns
     df.drop(columns=[
-        "Launched Price (China)",
-        "Launched Price (India)",
-        "Launched Price (Pakistan)",
-        "Launched Price (Dubai)",
         "Front Camera",
         "Processor"
     ], inplace=True)
 
-    other_df = other_df.drop(columns=[
-        "Model", "Brand", "Price_USD", "Camera_MP", "Battery_mAh",
-        "RAM_GB", "Weight_g", "Display_Size_inch",
-        "Release_Year", "Performance_Level", "Storage_GB"
-    ])
+    other_df = other_df[list(EXTRA_RENAME)].rename(columns=EXTRA_RENAME)
 
-    # Merge features
-    df["5G"] = other_df["5G"]
-    df["chipset"] = other_df["Chipset"]
-    df["display_type"] = other_df["Display_Type"]
+    # Merge features (by row position: the secondary dataset has no shared key)
+    for col in EXTRA_RENAME.values():
+        df[col] = other_df[col]
 
     # Select final columns
-    raw_df = df[[
-        "model", "brand", "price", "cam_resolution", "battery",
-        "ram", "chipset", "5G", "display_size",
-        "display_type", "weight", "release_year"
-    ]].copy()
+    raw_df = df[RAW_COLUMNS].copy()
 
     # Remove duplicates
     raw_df.drop_duplicates(subset=["brand", "model"], inplace=True)
@@ -100,17 +155,27 @@ def prepare_raw_dataframe(df, other_df):
 # -------------------------
 # FEATURE CLEANING
 # -------------------------
-def clean_features(df):
-    df["price"] = df["price"].astype(str).str.replace(r"[^0-9]", "", regex=True).astype(float)
-    df["ram"] = df["ram"].astype(str).str.extract(r"(\d+)").astype(float)
-    df["battery"] = df["battery"].astype(str).str.extract(r"(\d+)").astype(float)
-    df["cam_resolution"] = df["cam_resolution"].astype(str).str.extract(r"(\d+)").astype(float)
-    df["display_size"] = df["display_size"].astype(str).str.extract(r"(\d+\.?\d*)").astype(float)
-    df["weight"] = df["weight"].astype(str).str.extract(r"(\d+\.?\d*)").astype(float)
+def parse_features(df):
+    """
+    Per-row parsing (see spec_parser: one pass per column, malformed
+    values become NaN). Rows are independent, so only new / changed rows
+    need it on an incremental build.
+    """
+    df["price"] = parse_price_column(df["price"], currency="USD")[0]
+    for col, kind in COLUMN_KINDS.items():
+        if kind != "price":
+            df[col] = parse_column(df[col], kind)
+    for name, currency in LOCAL_PRICE_COLUMNS.values():
+        if name in df.columns:
+            df[name] = parse_price_column(df[name], currency=currency)[0]
+
     df["release_year"] = df["release_year"].astype(int)
     df["5G"] = df["5G"].map({"Yes": 1, "No": 0})
+    return df
 
-    # Handle missing values
+
+def fill_missing(df):
+    # Handle missing values (column medians -> needs the whole catalog)
     for col in [
         "price", "ram", "battery",
         "cam_resolution", "display_size",
@@ -121,12 +186,20 @@ def clean_features(df):
     return df
 
 
+def clean_features(df):
+    return fill_missing(parse_features(df))
+
+
 # -------------------------
 # ENCODE & SCALE
 # -------------------------
-def build_processed_dataframe(df):
+def build_processed_dataframe(df, scaler=None):
+    """
+    One-hot encode + min-max scale. A given (already fitted) scaler is
+    reused as is.
+    """
     df_encoded = pd.get_dummies(
-        df,
+        df.drop(columns=[SCORE_COLUMN, SCORE_VERSION_COLUMN], errors="ignore"),
         columns=["brand", "display_type"],
         drop_first=True
     )
@@ -136,35 +209,258 @@ def build_processed_dataframe(df):
         "ram", "display_size", "weight", "release_year"
     ]
 
-    scaler = MinMaxScaler()
-    df_encoded[numeric_features] = scaler.fit_transform(
+    if scaler is None:
+        scaler = MinMaxScaler().fit(df_encoded[numeric_features])
+    df_encoded[numeric_features] = scaler.transform(
         df_encoded[numeric_features]
     )
 
     return df_encoded, scaler
 
 
+# -------------------------
+# CHANGE DETECTION
+# -------------------------
+def file_fingerprint(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    uint64 per prepared (un-parsed) row, over every column.
+    """
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def read_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _load_or_none(path: Path):
+    return joblib.load(path) if path.exists() else None
+
+
+def parse_incremental(prepared: pd.DataFrame, cache):
+    """
+    Parse only rows whose fingerprint is not in `cache` (parsed rows
+    indexed by fingerprint). Returns (parsed rows indexed by fingerprint,
+    stats).
+    """
+    hashes = row_fingerprints(prepared)
+    keyed = prepared.set_axis(hashes)
+
+    known = np.isin(hashes, cache.index.to_numpy()) if cache is not None else np.zeros(len(hashes), bool)
+    parsed_new = parse_features(keyed[~known].copy())
+
+    parsed = pd.concat([cache.loc[hashes[known]], parsed_new]) if known.any() else parsed_new
+    parsed = parsed.loc[hashes]
+
+    removed = 0 if cache is None else int((~np.isin(cache.index.to_numpy(), hashes)).sum())
+    return parsed, {"reused": int(known.sum()), "parsed": int((~known).sum()), "removed": removed}
+
+
+def update_scaler(previous, raw_df: pd.DataFrame, added_only: bool, new_rows: pd.DataFrame):
+    """
+    Extend the previous scaler with new rows (partial_fit) when phones
+    were only added; refit otherwise. Returns (scaler, changed).
+    """
+    if previous is None or not added_only:
+        scaler = MinMaxScaler().fit(raw_df[NUMERIC_FEATURES])
+    elif new_rows.empty:
+        return previous, False
+    else:
+        scaler = copy.deepcopy(previous).partial_fit(new_rows[NUMERIC_FEATURES])
+
+    changed = previous is None or not (
+        np.array_equal(previous.data_min_, scaler.data_min_)
+        and np.array_equal(previous.data_max_, scaler.data_max_)
+    )
+    return scaler, changed
+
+
+def _feature_changes(raw_df: pd.DataFrame, previous_raw) -> np.ndarray:
+    """
+    Rows of raw_df whose model features differ from the previous build
+    (or are new), matched by (brand, model).
+    """
+    if previous_raw is None:
+        return np.ones(len(raw_df), bool)
+    aligned = _previous_by_key(previous_raw, raw_df, NUMERIC_FEATURES).to_numpy(dtype=float)
+    cur = raw_df[NUMERIC_FEATURES].to_numpy(dtype=float)
+    return ~((aligned == cur) | (np.isnan(aligned) & np.isnan(cur))).all(axis=1)
+
+
+def _previous_by_key(previous_raw: pd.DataFrame, raw_df: pd.DataFrame, columns):
+    """
+    previous_raw[columns] aligned to raw_df's rows by (brand, model);
+    NaN for new keys. A duplicated key keeps its first previous row.
+    """
+    key = ["brand", "model"]
+    prev = previous_raw.drop_duplicates(subset=key).set_index(key)[columns]
+    return prev.reindex(pd.MultiIndex.from_frame(raw_df[key]))
+
+
+def update_satisfaction_scores(raw_df, previous_raw, scaler, changed_rows, rescore_all):
+    """
+    Reuse previous scores for unchanged rows; predict the rest.
+    """
+    if not MODEL_PATH.exists():
+        return raw_df, 0
+
+    prev_scores = None
+    if previous_raw is not None and SCORE_COLUMN in previous_raw.columns and not rescore_all:
+        prev_scores = _previous_by_key(previous_raw, raw_df, [SCORE_COLUMN])[SCORE_COLUMN].to_numpy(dtype=float)
+
+    # The canonical model file is the promoted (active) registry version
+    version = model_version()
+    if prev_scores is None:
+        model = load_satisfaction_model()
+        return attach_satisfaction_scores(raw_df, model=model, scaler=scaler, version=version), len(raw_df)
+
+    todo = changed_rows | np.isnan(prev_scores)
+    scores = prev_scores.copy()
+    if todo.any():
+        scores[todo] = predict_satisfaction(raw_df[todo], model=load_satisfaction_model(), scaler=scaler)
+    return raw_df.assign(**{SCORE_COLUMN: scores, SCORE_VERSION_COLUMN: version}), int(todo.sum())
+
+
+def apply_enrichment(raw_df: pd.DataFrame):
+    """
+    Join the enrichment artifact onto raw_df (by lookup name), so a
+    rebuild keeps the GSMArena columns. Returns (raw_df, rows enriched).
+    """
+    if not ENRICHMENT_PATH.exists():
+        return raw_df, 0
+
+    from ai_engine.live_data.enrich_catalog import merge_enrichment
+
+    enriched = merge_enrichment(raw_df, joblib.load(ENRICHMENT_PATH))
+    return enriched, int(enriched["gsma_url"].notna().sum())
+
+
+def update_embeddings(raw_df: pd.DataFrame) -> int:
+    """
+    Encode only model names missing from the embeddings artifact.
+    Skipped when sentence-transformers is not installed.
+    """
+    try:
+        from ai_engine.recommender.embedding_engine import update_model_embeddings
+    except ImportError:
+        print("   • embeddings skipped (sentence-transformers not installed)")
+        return 0
+    return update_model_embeddings(raw_df["model"].astype(str).tolist())
+
+
 # -------------------------
 # MAIN PIPELINE → → → SAVE ARTIFACTS
 # -------------------------
-def main():
+def _artifacts_exist():
+    return all((ASSETS_DIR / name).exists() for name in ("raw_df.pkl", "processed_df.pkl", "scaler.pkl"))
+
+
+def _same_frame(a, b) -> bool:
+    return b is not None and a.shape == b.shape and a.equals(b)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build recommender artifacts")
+    parser.add_argument("--full", action="store_true", help="ignore the build manifest and rebuild everything")
+    args = parser.parse_args(argv)
+
     print("🚀 Starting data preprocessing pipeline...")
 
+    manifest = read_manifest()
+    if args.full or manifest.get("parser_version") != PARSER_VERSION:
+        args.full, manifest = True, {}
+    fingerprints = {name: file_fingerprint(DATA_DIR / name) for name in INPUT_FILES}
+    if ENRICHMENT_PATH.exists():
+        fingerprints[ENRICHMENT_PATH.name] = file_fingerprint(ENRICHMENT_PATH)
+    model_mtime = MODEL_PATH.stat().st_mtime if MODEL_PATH.exists() else None
+
+    if (
+        manifest.get("inputs") == fingerprints
+        and manifest.get("model_mtime") == model_mtime
+        and _artifacts_exist()
+    ):
+        print("✅ Inputs unchanged — artifacts are up to date")
+        return
+
+    # ---------- Parse (new / changed rows only) ----------
     df_main, df_extra = load_datasets()
-    raw_df = prepare_raw_dataframe(df_main, df_extra)
-    raw_df = clean_features(raw_df)
+    prepared = prepare_raw_dataframe(df_main, df_extra)
+
+    cache = None if args.full else _load_or_none(PARSED_CACHE_PATH)
+    parsed, stats = parse_incremental(prepared, cache)
+    is_new = ~np.isin(parsed.index.to_numpy(), cache.index.to_numpy()) if cache is not None else np.ones(len(parsed), bool)
+
+    raw_df = fill_missing(parsed.copy()).set_axis(prepared.index)
+
+    # ---------- Scale ----------
+    previous_raw = None if args.full else _load_or_none(ASSETS_DIR / "raw_df.pkl")
+    previous_scaler = None if args.full else _load_or_none(ASSETS_DIR / "scaler.pkl")
+    changed_rows = _feature_changes(raw_df, previous_raw)
+    added_only = stats["removed"] == 0 and not (changed_rows & ~is_new).any()
 
-    processed_df, scaler = build_processed_dataframe(raw_df)
+    scaler, scaler_changed = update_scaler(previous_scaler, raw_df, added_only, raw_df[changed_rows])
+    processed_df, _ = build_processed_dataframe(raw_df, scaler=scaler)
 
-    # Save artifacts
-    joblib.dump(raw_df, ASSETS_DIR / "raw_df.pkl")
-    joblib.dump(processed_df, ASSETS_DIR / "processed_df.pkl")
-    joblib.dump(scaler, ASSETS_DIR / "scaler.pkl")
+    # UI-only columns: joined after encoding, never part of processed_df
+    raw_df, enriched = apply_enrichment(raw_df)
 
-    print("✅ Artifacts created successfully:")
-    print(f"   • raw_df.pkl ({raw_df.shape})")
-    print(f"   • processed_df.pkl ({processed_df.shape})")
-    print("   • scaler.pkl")
+    # ---------- Downstream (skip unchanged) ----------
+    model_changed = manifest.get("model_mtime") != model_mtime
+    raw_df, rescored = update_satisfaction_scores(
+        raw_df, previous_raw, scaler, changed_rows, rescore_all=scaler_changed or model_changed
+    )
+    encoded = update_embeddings(raw_df) if changed_rows.any() else 0
+
+    # Save artifacts (only those that changed)
+    written = []
+    for name, obj, previous in [
+        ("raw_df.pkl", raw_df, previous_raw),
+        ("processed_df.pkl", processed_df, None if args.full else _load_or_none(ASSETS_DIR / "processed_df.pkl")),
+    ]:
+        if not _same_frame(obj, previous):
+            joblib.dump(obj, ASSETS_DIR / name)
+            written.append(name)
+    if scaler_changed or previous_scaler is None:
+        joblib.dump(scaler, ASSETS_DIR / "scaler.pkl")
+        written.append("scaler.pkl")
+
+    # Precomputed lists follow the catalog version
+    version = catalog_version(raw_df)
+    materialized_path = ASSETS_DIR / MATERIALIZED_PATH.name
+    if "raw_df.pkl" in written or manifest.get("catalog_version") != version or not materialized_path.exists():
+        save_materialized(build_materialized(raw_df), materialized_path)
+        written.append(materialized_path.name)
+
+    joblib.dump(parsed, PARSED_CACHE_PATH)
+    MANIFEST_PATH.write_text(json.dumps({
+        "parser_version": PARSER_VERSION,
+        "inputs": fingerprints,
+        "model_mtime": model_mtime,
+        "rows": len(raw_df),
+        "catalog_version": version,
+        "scaler": {
+            "data_min": scaler.data_min_.tolist(),
+            "data_max": scaler.data_max_.tolist(),
+        },
+    }, indent=2))
+
+    print("✅ Artifacts built:")
+    print(f"   • rows: {stats['reused']} reused, {stats['parsed']} parsed, {stats['removed']} removed")
+    print(f"   • scaler: {'updated' if scaler_changed else 'unchanged'}")
+    print(f"   • satisfaction scores recomputed: {rescored}")
+    print(f"   • embeddings encoded: {encoded}")
+    print(f"   • enriched rows: {enriched}")
+    print(f"   • written: {', '.join(written) or 'nothing (unchanged)'}")
 
 # -------------------------
 # DJANGO RUNTIME LOADER
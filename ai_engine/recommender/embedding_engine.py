@@ -1,7 +1,46 @@
+from pathlib import Path
+
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from ai_engine.telemetry.spans import span
+
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+EMBEDDINGS_PATH = ASSETS_DIR / "model_embeddings.npz"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def load_model_embeddings(path: Path = None) -> dict:
+    """
+    model name -> normalized embedding, from the build-time artifact.
+    """
+    path = path or EMBEDDINGS_PATH
+    if not path.exists():
+        return {}
+    with np.load(path) as data:
+        return dict(zip(data["names"].tolist(), data["vectors"]))
+
+
+def update_model_embeddings(names, path: Path = None, model=None) -> int:
+    """
+    Encode only names missing from the artifact (called by data_loader).
+    Returns how many names were encoded.
+    """
+    path = path or EMBEDDINGS_PATH
+    known = load_model_embeddings(path)
+    missing = [n for n in dict.fromkeys(names) if n not in known]
+
+    if missing:
+        model = model or SentenceTransformer(EMBEDDING_MODEL)
+        known.update(zip(missing, model.encode(missing, normalize_embeddings=True)))
+
+    keep = list(dict.fromkeys(names))
+    if missing or len(keep) != len(known):
+        np.savez(path, names=np.array(keep), vectors=np.stack([known[n] for n in keep]))
+    return len(missing)
+
 
 class EmbeddingSmartphoneRecommender:
     """
@@ -14,11 +53,18 @@ class EmbeddingSmartphoneRecommender:
 
     def __init__(self, df):
         self.df = df.copy()
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model = SentenceTransformer(EMBEDDING_MODEL)
 
-        # Cache full-model embeddings
+        # Cache full-model embeddings (precomputed artifact when available)
         self.model_names = self.df["model"].astype(str).tolist()
-        self.full_embeddings = self.model.encode(self.model_names, normalize_embeddings=True)
+        self._known = load_model_embeddings()
+        self.full_embeddings = self._embed_names(self.model_names)
+
+    def _embed_names(self, names):
+        missing = [n for n in dict.fromkeys(names) if n not in self._known]
+        if missing:
+            self._known.update(zip(missing, self.model.encode(missing, normalize_embeddings=True)))
+        return np.stack([self._known[n] for n in names])
 
     def _embed_text(self, text: str):
         return self.model.encode([text], normalize_embeddings=True)
@@ -33,12 +79,15 @@ class EmbeddingSmartphoneRecommender:
             return df
 
         # Build embeddings aligned to df (CRITICAL FIX)
-        model_names = df["model"].astype(str).tolist()
-        embeddings = self.model.encode(model_names, normalize_embeddings=True)
+        with span("embedding.lookup"):
+            model_names = df["model"].astype(str).tolist()
+            embeddings = self._embed_names(model_names)
 
-        query_vec = self._embed_text(query)
+        with span("embedding.encode_query"):
+            query_vec = self._embed_text(query)
 
-        scores = cosine_similarity(embeddings, query_vec).flatten()
+        with span("embedding.score"):
+            scores = cosine_similarity(embeddings, query_vec).flatten()
 
         df["match_score"] = scores
         df["feature_scores"] = [{} for _ in range(len(df))]
@@ -5,10 +5,41 @@ Professional feature-level explanation for smartphone recommendations.
 
 - Structured dictionary output for frontend
 - Human-readable sentences for top features
+- Batch variant over an (N x features) score matrix (explain_batch)
 - Fully safe for Django import (no code runs at import time)
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ai_engine.telemetry.spans import timed
+
+# -------------------------------------------------
+# THRESHOLDS & MESSAGE TABLES
+# -------------------------------------------------
+REASON_THRESHOLD = 0.6  # only strong matches become reasons
+PRO_THRESHOLD = 0.7
+CON_THRESHOLD = 0.4
+
+REASON_MESSAGES = {
+    "price": "It fits well within your budget.",
+    "cam_resolution": "The camera quality aligns with your expectations.",
+    "battery": "The battery capacity supports long daily usage.",
+    "ram": "It provides smooth multitasking performance.",
+    "display_size": "The screen size matches your viewing preference.",
+    "weight": "Its weight matches your comfort preference.",
+    "release_year": "It is relatively recent compared to other options.",
+}
+
+
+def feature_label(feature: str) -> str:
+    return feature.replace("_", " ").title()
+
+
+def reason_message(feature: str) -> str:
+    return REASON_MESSAGES.get(feature, f"{feature_label(feature)} closely matches your preference.")
+
 
 # -------------------------------------------------
 # UTILITY FUNCTION
@@ -26,6 +57,7 @@ def get_top_features(feature_scores: Dict[str, float], top_n: int = 3) -> List[T
 # -------------------------------------------------
 # MAIN EXPLANATION FUNCTION
 # -------------------------------------------------
+@timed("explain")
 def explain_recommendation(feature_scores: Dict[str, float], top_k: int = 3) -> Dict[str, List[str]]:
     """
     Given feature_scores dict, return explanation for UI with structured pros/cons.
@@ -40,36 +72,19 @@ def explain_recommendation(feature_scores: Dict[str, float], top_k: int = 3) ->
     reasons = []
 
     for feature, score in top_features:
-        if score < 0.6:
+        if score < REASON_THRESHOLD:
             continue  # only consider strong matches
-
-        label = feature.replace("_", " ").title()
-        if feature == "price":
-            reasons.append("It fits well within your budget.")
-        elif feature == "cam_resolution":
-            reasons.append("The camera quality aligns with your expectations.")
-        elif feature == "battery":
-            reasons.append("The battery capacity supports long daily usage.")
-        elif feature == "ram":
-            reasons.append("It provides smooth multitasking performance.")
-        elif feature == "display_size":
-            reasons.append("The screen size matches your viewing preference.")
-        elif feature == "weight":
-            reasons.append("Its weight matches your comfort preference.")
-        elif feature == "release_year":
-            reasons.append("It is relatively recent compared to other options.")
-        else:
-            reasons.append(f"{label} closely matches your preference.")
+        reasons.append(reason_message(feature))
 
     # -------------------------------
     # Structured pros & cons
     # -------------------------------
     pros, cons = [], []
     for feature, score in feature_scores.items():
-        if score >= 0.7:  # threshold for 'pro'
-            pros.append(feature.replace("_", " ").title())
-        elif score <= 0.4:  # threshold for 'con'
-            cons.append(feature.replace("_", " ").title())
+        if score >= PRO_THRESHOLD:  # threshold for 'pro'
+            pros.append(feature_label(feature))
+        elif score <= CON_THRESHOLD:  # threshold for 'con'
+            cons.append(feature_label(feature))
 
     return {
         "top_features": reasons,
@@ -78,6 +93,76 @@ def explain_recommendation(feature_scores: Dict[str, float], top_k: int = 3) ->
     }
 
 
+# -------------------------------------------------
+# BATCH EXPLANATIONS
+# -------------------------------------------------
+def scores_to_matrix(feature_scores_list: Sequence[Dict[str, float]], features: Sequence[str] = None):
+    """
+    List of feature_scores dicts -> (N x F) float matrix, NaN where a
+    feature is absent. Returns (matrix, features).
+    """
+    if features is None:
+        features = list(dict.fromkeys(f for fs in feature_scores_list for f in (fs or {})))
+    matrix = np.full((len(feature_scores_list), len(features)), np.nan)
+    col = {f: j for j, f in enumerate(features)}
+    for i, fs in enumerate(feature_scores_list):
+        for f, score in (fs or {}).items():
+            matrix[i, col[f]] = score
+    return matrix, list(features)
+
+
+def _lists_by_pattern(table: np.ndarray, idx: np.ndarray, mask: np.ndarray) -> List[List[str]]:
+    """
+    Per row, table[idx[row]] where mask[row] (row order kept), as lists.
+    Rows share few distinct patterns, so each pattern's list is built
+    once and copied per row.
+    """
+    # Row-wise unique over the masked index rows (no positional hash, so
+    # no overflow however many features / top-k columns there are)
+    patterns = np.where(mask, idx, -1)
+    _, first, inverse = np.unique(patterns, axis=0, return_index=True, return_inverse=True)
+    lists = [table[idx[r][mask[r]]].tolist() for r in first]
+    return [lists[i].copy() for i in inverse.ravel()]
+
+
+@timed("explain_batch")
+def explain_batch(scores, features: Sequence[str], top_k: int = 3) -> List[Dict[str, List[str]]]:
+    """
+    Vectorized explain_recommendation for N items at once.
+
+    `scores` is an (N x F) matrix of feature match scores in `features`
+    column order (NaN = feature absent). Output matches calling
+    explain_recommendation on each row's {feature: score} dict.
+    """
+    scores = np.asarray(scores, dtype=float)
+    if scores.ndim != 2 or scores.shape[1] != len(features):
+        raise ValueError(f"Expected scores of shape (n, {len(features)}), got {scores.shape}")
+    if not len(scores):
+        return []
+
+    n, n_features = scores.shape
+    present = ~np.isnan(scores)
+
+    # Precomputed per-feature tables
+    labels = np.array([feature_label(f) for f in features], dtype=object)
+    messages = np.array([reason_message(f) for f in features], dtype=object)
+    columns = np.broadcast_to(np.arange(n_features), (n, n_features))
+
+    # Top-k by score (stable: ties keep feature order, like sorted())
+    k = min(top_k, n_features)
+    order = np.argsort(np.where(present, -scores, np.inf), axis=1, kind="stable")[:, :k]
+    top_scores = np.take_along_axis(scores, order, axis=1)
+    reasons = _lists_by_pattern(messages, order, top_scores >= REASON_THRESHOLD)
+
+    pros = _lists_by_pattern(labels, columns, scores >= PRO_THRESHOLD)
+    cons = _lists_by_pattern(labels, columns, scores <= CON_THRESHOLD)
+
+    return [
+        {"top_features": r, "pros": p, "cons": c}
+        for r, p, c in zip(reasons, pros, cons)
+    ]
+
+
 # -------------------------------------------------
 # ⚠️ REMOVE ALL TEST CODE BELOW
 # -------------------------------------------------
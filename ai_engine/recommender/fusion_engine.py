@@ -0,0 +1,203 @@
+"""
+ai_engine/recommender/fusion_engine.py
+======================================
+Score fusion: feature match, semantic similarity and precomputed
+satisfaction evaluated over ONE candidate set and combined into one
+ranking.
+
+1. Candidate row positions from the view's soft filters (brand,
+   price +-30%, release year - 2), optional query constraints and
+   storage-variant dedupe, on arrays prepared once
+2. Each signal scores only those rows:
+   - feature:      SmartphoneRecommender.score_matrix (vectorized hybrid),
+                   feature weights from the query's intents when it has
+                   any (nl_weight_mapper.infer_weights)
+   - semantic:     SemanticSmartphoneRecommender.scores (needs a query)
+   - satisfaction: precomputed SCORE_COLUMN
+3. Fuse with weights: "rrf" (reciprocal rank) or "linear" (min-max
+   normalized scores). Missing signals drop out and the remaining
+   weights are renormalized
+"""
+
+import numpy as np
+
+from ai_engine.recommender.materialized import base_model
+from ai_engine.recommender.recommender_engine import SmartphoneRecommender
+from ai_engine.recommender.results import ResultBatch
+from ai_engine.recommender.satisfaction_engine import SCORE_COLUMN
+from ai_engine.semantic.nl_weight_mapper import detect_intents, infer_weights
+from ai_engine.semantic.query_parser import constraint_mask
+from ai_engine.telemetry.spans import span
+
+
+SIGNALS = ["feature", "semantic", "satisfaction"]
+DEFAULT_WEIGHTS = {"feature": 0.5, "semantic": 0.3, "satisfaction": 0.2}
+FUSION_METHODS = ("rrf", "linear")
+RRF_K = 60
+
+
+# -------------------------
+# FUSION
+# -------------------------
+def minmax(scores: np.ndarray) -> np.ndarray:
+    lo, hi = scores.min(), scores.max()
+    if hi == lo:
+        return np.full(len(scores), 0.5)
+    return (scores - lo) / (hi - lo)
+
+
+def ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    1-based rank of every score (best = 1, ties in row order).
+    """
+    order = np.argsort(-scores, kind="stable")
+    out = np.empty(len(scores))
+    out[order] = np.arange(1, len(scores) + 1)
+    return out
+
+
+def fuse(signals: dict, weights: dict, method: str = "rrf", rrf_k: int = RRF_K) -> np.ndarray:
+    """
+    Weighted combination of the non-None signals, scaled to [0, 1].
+    """
+    active = {name: s for name, s in signals.items() if s is not None and weights.get(name, 0) > 0}
+    if not active:
+        raise ValueError("No signal to fuse")
+    total = sum(weights[name] for name in active)
+
+    if method == "linear":
+        return sum(weights[name] * minmax(s) for name, s in active.items()) / total
+    if method == "rrf":
+        fused = sum(weights[name] / (rrf_k + ranks(s)) for name, s in active.items())
+        return fused * (rrf_k + 1) / total
+    raise ValueError(f"Unknown fusion method: {method!r}")
+
+
+# -------------------------
+# ENGINE
+# -------------------------
+class FusionRecommender:
+    """
+    All signals in a single pass over shared candidates.
+
+    - Catalog arrays are prepared once; per request only candidate rows
+      are scored (no DataFrame copies, filters or sorts)
+    - Read-only after __init__, so one instance can serve all threads
+    - results() returns a ResultBatch; recommend() items match the
+      hybrid engine (feature_scores included)
+    """
+
+    def __init__(self, raw_df, feature_engine=None, semantic_engine=None, satisfaction_scores=None,
+                 weights=None, method: str = "rrf", rrf_k: int = RRF_K):
+        if method not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {method!r}")
+        if semantic_engine is not None and len(semantic_engine.embeddings) != len(raw_df):
+            raise ValueError("semantic_engine must be built on the same catalog")
+
+        self.df = raw_df
+        self.feature_engine = feature_engine or SmartphoneRecommender(df=raw_df)
+        self.semantic_engine = semantic_engine
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.method = method
+        self.rrf_k = rrf_k
+
+        if satisfaction_scores is None and SCORE_COLUMN in raw_df.columns:
+            satisfaction_scores = raw_df[SCORE_COLUMN].to_numpy(dtype=float)
+        if satisfaction_scores is not None and np.isnan(satisfaction_scores).any():
+            satisfaction_scores = None
+        self._satisfaction = satisfaction_scores
+
+        self._X = raw_df[SmartphoneRecommender.FEATURES].to_numpy(dtype=float)
+        self._brand = raw_df["brand"].astype(str).to_numpy()
+        self._brand_lower = np.char.lower(self._brand.astype(str))
+        self._model = raw_df["model"].astype(str).to_numpy()
+        self._price = raw_df["price"].to_numpy(dtype=float)
+        self._year = raw_df["release_year"].to_numpy(dtype=float)
+        self._base = raw_df["model"].astype(str).map(base_model).factorize()[0]
+
+    # -------------------------
+    # CANDIDATES
+    # -------------------------
+    def candidates(self, user_input: dict, constraints: dict = None) -> np.ndarray:
+        """
+        Row positions the view's filters would keep, first storage
+        variant per base model. Over-constraining query constraints are
+        dropped rather than emptying the pool.
+        """
+        mask = np.ones(len(self._X), dtype=bool)
+        if user_input.get("brand"):
+            mask &= self._brand_lower == user_input["brand"].strip().lower()
+        if user_input.get("price", 0) > 0:
+            mask &= (self._price >= user_input["price"] * 0.7) & (self._price <= user_input["price"] * 1.3)
+        if user_input.get("release_year", 0) > 0:
+            mask &= self._year >= user_input["release_year"] - 2
+
+        if constraints:
+            constrained = mask & constraint_mask(self.df, constraints)
+            if constrained.any():
+                mask = constrained
+
+        rows = np.flatnonzero(mask)
+        _, first = np.unique(self._base[rows], return_index=True)
+        return rows[np.sort(first)]
+
+    # -------------------------
+    # RANKING
+    # -------------------------
+    def signal_scores(self, rows: np.ndarray, user_input: dict, nl_query: str = ""):
+        """
+        Raw score of every signal for `rows` (None when unavailable) and
+        the feature-match matrix.
+        """
+        if (nl_query or "").strip() and detect_intents(nl_query):
+            user_input = {**user_input, "feature_weights": infer_weights(nl_query)}
+        feature, matches = self.feature_engine.score_matrix(self._X[rows], user_input)
+
+        semantic = None
+        if self.semantic_engine is not None and (nl_query or "").strip():
+            semantic = self.semantic_engine.scores(nl_query, rows)
+
+        satisfaction = None if self._satisfaction is None else self._satisfaction[rows]
+        return {"feature": feature, "semantic": semantic, "satisfaction": satisfaction}, matches
+
+    def rank(self, user_input: dict, nl_query: str = "", top_n: int = 5, constraints: dict = None):
+        """
+        (row positions, fused scores, per-signal scores, match matrix)
+        of the top_n candidates, best first.
+        """
+        rows = self.candidates(user_input, constraints)
+        if len(rows) == 0:
+            return rows, np.empty(0), {}, np.empty((0, len(SmartphoneRecommender.FEATURES)))
+
+        signals, matches = self.signal_scores(rows, user_input, nl_query)
+
+        with span("fusion.combine"):
+            fused = fuse(signals, self.weights, self.method, self.rrf_k)
+
+            k = min(top_n, len(rows))
+            top = np.argpartition(-fused, k - 1)[:k]
+            top = top[np.lexsort((top, -fused[top]))]
+
+        used = {name: s[top] for name, s in signals.items() if s is not None and self.weights.get(name, 0) > 0}
+        return rows[top], fused[top], used, matches[top]
+
+    def results(self, user_input: dict, nl_query: str = "", top_n: int = 5, constraints: dict = None) -> ResultBatch:
+        rows, scores, _, matches = self.rank(user_input, nl_query, top_n, constraints)
+        return ResultBatch(rows, scores, matches, SmartphoneRecommender.FEATURES)
+
+    def recommend(self, user_input: dict, nl_query: str = "", top_n: int = 5, constraints: dict = None):
+        rows, scores, signals, matches = self.rank(user_input, nl_query, top_n, constraints)
+        features = SmartphoneRecommender.FEATURES
+        return {
+            "signals": list(signals),
+            "items": [
+                {
+                    "brand": self._brand[r],
+                    "model": self._model[r],
+                    "match_score": float(score),
+                    "feature_scores": dict(zip(features, m)),
+                    "signal_scores": {name: float(s[i]) for name, s in signals.items()},
+                }
+                for i, (r, score, m) in enumerate(zip(rows, scores, matches.tolist()))
+            ],
+        }
@@ -0,0 +1,285 @@
+"""
+STREAMING CSV INGESTION
+=======================
+Chunked alternative to data_loader.load_datasets + prepare_raw_dataframe
++ clean_features for catalogs too large to load at once.
+
+Run (from the project root):
+    python -m ai_engine.recommender.ingest [--chunksize 100000] [--join-on row|model]
+
+1. Read the secondary dataset (small side) into a lookup keyed by the
+   join key
+2. Stream the main CSV in chunks with explicit dtypes / usecols
+3. Per chunk: rename, join the secondary columns BY KEY, drop duplicates
+   (across chunks), parse features (spec_parser, as clean_features)
+4. Append each chunk to a temporary CSV
+5. Second streaming pass: fill missing values with whole-catalog medians
+   and write the final CSV (atomic replace)
+
+Memory stays bounded by the chunk size plus the numeric columns needed
+for the medians.
+
+Join key: the bundled secondary dataset shares no (brand, model) pairs
+with SmartPhones.csv, so its rows line up by SOURCE ROW NUMBER (`row`,
+the default, matching data_loader). `model` joins on (brand, model) for
+sources that do share keys. Row numbers are global across chunks, never
+chunk-local.
+
+NO Django
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ai_engine.recommender.data_loader import (
+    ASSETS_DIR,
+    DATA_DIR,
+    EXTRA_RENAME,
+    INPUT_FILES,
+    LOCAL_PRICE_COLUMNS,
+    MAIN_RENAME,
+    RAW_COLUMNS,
+    build_processed_dataframe,
+    parse_features,
+)
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+OUTPUT_PATH = ASSETS_DIR / "raw_catalog.csv"
+DEFAULT_CHUNKSIZE = 100_000
+ROW_KEY = "_row"
+MODEL_KEY = ["brand", "model"]
+
+FILL_COLUMNS = [
+    "price", "ram", "battery",
+    "cam_resolution", "display_size",
+    "weight", "release_year"
+]
+
+# Explicit dtypes: no per-chunk type inference, unused columns never parsed
+MAIN_DTYPES = {col: str for col in [*MAIN_RENAME, *LOCAL_PRICE_COLUMNS]}
+MAIN_DTYPES["Launched Year"] = "int64"
+
+EXTRA_DTYPES = {col: str for col in EXTRA_RENAME}
+EXTRA_KEY_DTYPES = {"Brand": str, "Model": str}
+
+RAW_DTYPES = {
+    "model": str,
+    "brand": str,
+    "chipset": str,
+    "display_type": str,
+    "price": "float64",
+    "cam_resolution": "float64",
+    "battery": "float64",
+    "ram": "float64",
+    "5G": "float64",
+    "display_size": "float64",
+    "weight": "float64",
+    "release_year": "int64",
+    **{name: "float64" for name, _ in LOCAL_PRICE_COLUMNS.values()},
+}
+
+
+# -------------------------
+# READING
+# -------------------------
+def iter_chunks(path: Path, dtypes: dict, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    CSV chunks indexed by their global source row number.
+    """
+    reader = pd.read_csv(
+        path,
+        encoding="latin1",
+        usecols=list(dtypes),
+        dtype=dtypes,
+        chunksize=chunksize,
+    )
+    start = 0
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(start, start + len(chunk), name=ROW_KEY)
+        start += len(chunk)
+        yield chunk
+
+
+def load_secondary(path: Path, join_on: str = "row", chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """
+    Secondary columns (5G, chipset, display_type) indexed by the join key.
+    """
+    dtypes = dict(EXTRA_DTYPES)
+    if join_on == "model":
+        dtypes.update(EXTRA_KEY_DTYPES)
+
+    parts = []
+    for chunk in iter_chunks(path, dtypes, chunksize):
+        chunk = chunk.rename(columns={**EXTRA_RENAME, "Brand": "brand", "Model": "model"})
+        if join_on == "model":
+            chunk = chunk.drop_duplicates(subset=MODEL_KEY).set_index(MODEL_KEY)
+        parts.append(chunk[list(EXTRA_RENAME.values())])
+
+    extra = pd.concat(parts) if parts else pd.DataFrame(columns=list(EXTRA_RENAME.values()))
+    if join_on == "model":
+        extra = extra[~extra.index.duplicated()]
+    return extra
+
+
+# -------------------------
+# PER-CHUNK PROCESSING
+# -------------------------
+def process_chunk(chunk: pd.DataFrame, extra: pd.DataFrame, join_on: str, seen: set) -> pd.DataFrame:
+    """
+    Rename, join by key, de-duplicate against earlier chunks, parse.
+    """
+    df = chunk.rename(columns=MAIN_RENAME)
+    df = df.rename(columns={src: name for src, (name, _) in LOCAL_PRICE_COLUMNS.items()})
+
+    if join_on == "model":
+        key = pd.MultiIndex.from_frame(df[MODEL_KEY])
+        joined = extra.reindex(key)
+    else:
+        joined = extra.reindex(df.index)
+    for col in EXTRA_RENAME.values():
+        df[col] = joined[col].to_numpy()
+
+    df = df[RAW_COLUMNS]
+
+    # Remove duplicates (first occurrence wins, across chunks)
+    keys = list(zip(df["brand"], df["model"]))
+    keep = np.zeros(len(df), dtype=bool)
+    for i, k in enumerate(keys):
+        if k not in seen:
+            seen.add(k)
+            keep[i] = True
+    keep &= ~df.duplicated(subset=MODEL_KEY).to_numpy()
+
+    return parse_features(df[keep].copy())
+
+
+def _append_csv(df: pd.DataFrame, path: Path, header: bool) -> None:
+    df.to_csv(path, mode="w" if header else "a", header=header, index=False)
+
+
+# -------------------------
+# STREAMING PIPELINE
+# -------------------------
+def ingest(
+    main_path: Path = None,
+    extra_path: Path = None,
+    output_path: Path = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    join_on: str = "row",
+) -> dict:
+    """
+    Stream main + secondary CSVs into a cleaned raw catalog CSV.
+    Returns run statistics.
+    """
+    main_path = Path(main_path or DATA_DIR / INPUT_FILES[0])
+    extra_path = Path(extra_path or DATA_DIR / INPUT_FILES[1])
+    output_path = Path(output_path or OUTPUT_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    extra = load_secondary(extra_path, join_on, chunksize)
+
+    fd, parsed_tmp = tempfile.mkstemp(prefix=".parsed.", suffix=".csv", dir=output_path.parent)
+    os.close(fd)
+    fd, final_tmp = tempfile.mkstemp(prefix=f".{output_path.name}.", dir=output_path.parent)
+    os.close(fd)
+
+    stats = {"rows_read": 0, "rows_written": 0, "chunks": 0, "unmatched_secondary": 0}
+    numeric = {col: [] for col in FILL_COLUMNS}
+    seen = set()
+
+    try:
+        # ---------- Pass 1: parse ----------
+        for chunk in iter_chunks(main_path, MAIN_DTYPES, chunksize):
+            parsed = process_chunk(chunk, extra, join_on, seen)
+            _append_csv(parsed, Path(parsed_tmp), header=stats["chunks"] == 0)
+
+            for col in FILL_COLUMNS:
+                numeric[col].append(parsed[col].to_numpy(dtype=float))
+            stats["rows_read"] += len(chunk)
+            stats["rows_written"] += len(parsed)
+            stats["unmatched_secondary"] += int(parsed["chipset"].isna().sum())
+            stats["chunks"] += 1
+
+        # Whole-catalog medians (same as clean_features)
+        medians = {
+            col: float(np.nanmedian(np.concatenate(values))) if values else np.nan
+            for col, values in numeric.items()
+        }
+        del numeric
+
+        # ---------- Pass 2: fill + write ----------
+        header = True
+        if stats["rows_written"]:
+            for chunk in pd.read_csv(
+                parsed_tmp,
+                dtype={**RAW_DTYPES, "release_year": "float64"},
+                chunksize=chunksize,
+                float_precision="round_trip",
+            ):
+                chunk = chunk.fillna(medians)
+                chunk["release_year"] = chunk["release_year"].astype(int)
+                _append_csv(chunk, Path(final_tmp), header=header)
+                header = False
+        else:
+            pd.DataFrame(columns=RAW_COLUMNS).to_csv(final_tmp, index=False)
+
+        os.replace(final_tmp, output_path)
+    finally:
+        for tmp in (parsed_tmp, final_tmp):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    stats["duplicates_dropped"] = stats["rows_read"] - stats["rows_written"]
+    stats["medians"] = medians
+    return stats
+
+
+def load_catalog(path: Path = None) -> pd.DataFrame:
+    """
+    Read an ingested catalog back with its explicit dtypes.
+    """
+    return pd.read_csv(path or OUTPUT_PATH, dtype=RAW_DTYPES, float_precision="round_trip")
+
+
+# -------------------------
+# MAIN
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream CSV sources into a cleaned raw catalog")
+    parser.add_argument("--main", type=Path, default=None, help="main CSV (default: data/SmartPhones.csv)")
+    parser.add_argument("--extra", type=Path, default=None, help="secondary CSV")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--join-on", choices=["row", "model"], default="row")
+    parser.add_argument("--artifacts", action="store_true",
+                        help="also write raw_df.pkl / processed_df.pkl / scaler.pkl")
+    args = parser.parse_args(argv)
+
+    print("🚀 Streaming ingestion...")
+    stats = ingest(args.main, args.extra, args.output, args.chunksize, args.join_on)
+
+    print(f"✅ {args.output}")
+    print(f"   • {stats['rows_written']}/{stats['rows_read']} rows in {stats['chunks']} chunks")
+    print(f"   • {stats['duplicates_dropped']} duplicates dropped")
+    print(f"   • {stats['unmatched_secondary']} rows without secondary data")
+
+    if args.artifacts:
+        raw_df = load_catalog(args.output)
+        processed_df, scaler = build_processed_dataframe(raw_df)
+        joblib.dump(raw_df, ASSETS_DIR / "raw_df.pkl")
+        joblib.dump(processed_df, ASSETS_DIR / "processed_df.pkl")
+        joblib.dump(scaler, ASSETS_DIR / "scaler.pkl")
+        print("   • raw_df.pkl / processed_df.pkl / scaler.pkl written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+MATERIALIZED RECOMMENDATION LISTS
+=================================
+Precomputed top-N lists for the requests that do not need an engine:
+cold start (no numeric input) and the landing-page presets.
+
+Built by data_loader next to raw_df.pkl (materialized_lists.pkl):
+1. Drop storage variants like the view does (first row per base model
+   inside each brand / price-bucket group, in catalog order)
+2. Per list x profile: one global ordering (lexsort over the list's
+   sort keys, release year and the profile's tie-break)
+3. Per (brand, price bucket) group, incl. "any brand" / "any price":
+   the first MATERIALIZED_TOP_N rows of that ordering
+
+Serving is a dict lookup: (list, brand, bucket, profile) -> raw_df
+index labels. The artifact carries the catalog version it was built
+from; load_materialized rebuilds it when raw_df has changed.
+
+NO Django
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+# -------------------------
+# CONFIGURATION
+# -------------------------
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+MATERIALIZED_PATH = ASSETS_DIR / "materialized_lists.pkl"
+MATERIALIZED_TOP_N = 10
+
+# Bucket i is [PRICE_EDGES[i], PRICE_EDGES[i + 1]); the last is open-ended
+PRICE_EDGES = [0, 250, 500, 800, 1200]
+ANY = -1  # "any brand" / "any price" key
+
+# list name -> [(column, ascending)], before the shared tie-breaks
+LISTS = {
+    "cold_start": [("release_year", False)],
+    "budget": [("price", True)],
+    "camera": [("cam_resolution", False)],
+    "battery": [("battery", False)],
+    "performance": [("ram", False)],
+}
+PRESETS = [name for name in LISTS if name != "cold_start"]
+
+PROFILE_TIEBREAK = {
+    "balanced": [],
+    "performance": [("ram", False)],
+    "battery": [("battery", False)],
+}
+
+
+def base_model(model_name: str) -> str:
+    # Same rule as the view's derive_base_model (storage variants)
+    return re.sub(r"\b\d+\s?(GB|TB)\b", "", model_name or "", flags=re.I).strip()
+
+
+def catalog_version(raw_df: pd.DataFrame) -> str:
+    """
+    Content hash of the catalog (index + every column).
+    """
+    hashes = pd.util.hash_pandas_object(raw_df.astype(str), index=True).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()[:16]
+
+
+def price_bucket(price: float) -> int:
+    if not price or price <= 0:
+        return ANY
+    return int(np.searchsorted(PRICE_EDGES, price, side="right")) - 1
+
+
+# -------------------------
+# BUILD
+# -------------------------
+def _ordering(df: pd.DataFrame, keys: list) -> np.ndarray:
+    """
+    Row positions sorted by `keys` (first key most significant),
+    remaining ties in catalog order.
+    """
+    columns = [np.arange(len(df))]
+    for column, ascending in reversed(keys):
+        values = np.nan_to_num(df[column].to_numpy(dtype=float), nan=-np.inf if not ascending else np.inf)
+        columns.append(values if ascending else -values)
+    return np.lexsort(columns)
+
+
+def build_materialized(raw_df: pd.DataFrame, top_n: int = MATERIALIZED_TOP_N) -> dict:
+    df = pd.DataFrame({
+        "brand": raw_df["brand"].astype(str).str.lower().to_numpy(),
+        "bucket": [price_bucket(p) for p in raw_df["price"].to_numpy(dtype=float)],
+        "base": raw_df["model"].astype(str).map(base_model).to_numpy(),
+    })
+    for column in {c for keys in [*LISTS.values(), *PROFILE_TIEBREAK.values()] for c, _ in keys}:
+        df[column] = raw_df[column].to_numpy()
+    labels = raw_df.index.to_numpy()
+
+    # grouping -> key builder (brand or ANY, bucket or ANY)
+    groupings = {
+        ("brand", "bucket"): lambda brand, bucket: (brand, bucket),
+        ("brand",): lambda brand: (brand, ANY),
+        ("bucket",): lambda bucket: (ANY, bucket),
+        (): None,
+    }
+    # The view keeps the first storage variant (catalog order) per pool
+    keep = {by: ~df.duplicated(subset=[*by, "base"]).to_numpy() for by in groupings}
+
+    lists = {}
+    for name, keys in LISTS.items():
+        for profile, tiebreak in PROFILE_TIEBREAK.items():
+            sort_keys = keys + [k for k in [("release_year", False), *tiebreak] if k not in keys]
+            order = _ordering(df, sort_keys)
+
+            for by, to_key in groupings.items():
+                ranked = order[keep[by][order]]
+                if not by:
+                    lists[(name, ANY, ANY, profile)] = labels[ranked[:top_n]].tolist()
+                    continue
+
+                heads = df.iloc[ranked].groupby(list(by), sort=False).head(top_n)
+                for group, rows in heads.groupby(list(by), sort=False):
+                    brand, bucket = to_key(*(group if isinstance(group, tuple) else (group,)))
+                    lists[(name, brand, int(bucket), profile)] = labels[rows.index].tolist()
+
+    return {
+        "catalog_version": catalog_version(raw_df),
+        "top_n": top_n,
+        "price_edges": list(PRICE_EDGES),
+        "lists": lists,
+    }
+
+
+def save_materialized(materialized: dict, path: Path = None) -> None:
+    joblib.dump(materialized, path or MATERIALIZED_PATH)
+
+
+def load_materialized(raw_df: pd.DataFrame, path: Path = None) -> dict:
+    """
+    The saved lists if they match raw_df's catalog version, otherwise
+    rebuilt (and re-saved when the assets directory is writable).
+    """
+    path = path or MATERIALIZED_PATH
+    version = catalog_version(raw_df)
+    try:
+        materialized = joblib.load(path)
+        if materialized.get("catalog_version") == version and materialized.get("price_edges") == PRICE_EDGES:
+            return materialized
+    except Exception:
+        # Missing, truncated, corrupt or incompatible artifact: rebuild
+        pass
+
+    materialized = build_materialized(raw_df)
+    try:
+        save_materialized(materialized, path)
+    except OSError:
+        pass
+    return materialized
+
+
+# -------------------------
+# SERVE
+# -------------------------
+def lookup(materialized: dict, name: str, brand: str = "", price: float = 0,
+           profile: str = "balanced", top_n: int = 5):
+    """
+    raw_df index labels of a precomputed list, or None when the request
+    is not covered (unknown list / profile, top_n beyond what was built).
+    An empty list means the brand / bucket has no phones.
+    """
+    if materialized is None or name not in LISTS or profile not in PROFILE_TIEBREAK:
+        return None
+    if top_n > materialized["top_n"]:
+        return None
+    key = (name, brand.strip().lower() or ANY, price_bucket(price), profile)
+    return materialized["lists"].get(key, [])[:top_n]
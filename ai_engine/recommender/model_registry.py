@@ -0,0 +1,149 @@
+"""
+model_registry.py
+=================
+Versioned registry of trained satisfaction models.
+
+Layout (under assets/):
+
+    model_registry/
+        registry.json                 index of all versions + active one
+        <version>/model.pkl           fitted sklearn estimator
+        <version>/forest.npz          flattened forest (tree models only)
+
+Every entry records accuracy, fit time and prediction latency, so
+serving can pick the most accurate model that fits a latency budget.
+Candidates of one training run share `created_at`; selection only
+compares the active model's run (older runs may have been trained on
+another catalog).
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import joblib
+
+from ai_engine.recommender.tree_ensemble import FlatForest
+
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+REGISTRY_DIR = ASSETS_DIR / "model_registry"
+
+
+class ModelRegistry:
+    def __init__(self, root=None):
+        self.root = Path(root or REGISTRY_DIR)
+        self.index_path = self.root / "registry.json"
+
+    # -------------------------
+    # INDEX
+    # -------------------------
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"active": None, "models": []}
+
+    def _write(self, index: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".registry.", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_name, self.index_path)
+
+    def entries(self) -> list:
+        return self._read()["models"]
+
+    def get(self, version: str) -> dict:
+        for entry in self.entries():
+            if entry["version"] == version:
+                return entry
+        raise KeyError(f"Unknown model version: {version}")
+
+    @property
+    def active(self):
+        return self._read()["active"]
+
+    def run_entries(self) -> list:
+        """
+        Entries of the active model's training run (the latest run when
+        no model is active).
+        """
+        index = self._read()
+        entries = index["models"]
+        if not entries:
+            return []
+        anchor = next((e for e in entries if e["version"] == index["active"]), None)
+        if anchor is None:
+            anchor = max(entries, key=lambda e: e.get("created_at") or "")
+        return [e for e in entries if e.get("created_at") == anchor.get("created_at")]
+
+    # -------------------------
+    # WRITE
+    # -------------------------
+    def register(self, version: str, model, info: dict, flat_model: FlatForest = None) -> dict:
+        """
+        Save a fitted model (+ optional flattened forest) and index it.
+        `info` holds family / params / metrics / latency.
+        """
+        model_dir = self.root / version
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        joblib.dump(model, model_dir / "model.pkl")
+        flat_path = None
+        if flat_model is not None:
+            flat_model.save(model_dir / "forest.npz")
+            flat_path = f"{version}/forest.npz"
+
+        entry = {
+            "version": version,
+            "path": f"{version}/model.pkl",
+            "flat_path": flat_path,
+            **info,
+        }
+
+        index = self._read()
+        index["models"] = [e for e in index["models"] if e["version"] != version] + [entry]
+        self._write(index)
+        return entry
+
+    def set_active(self, version: str) -> None:
+        self.get(version)
+        index = self._read()
+        index["active"] = version
+        self._write(index)
+
+    # -------------------------
+    # SELECTION
+    # -------------------------
+    def select_best(self, max_latency_ms: float = None, metric: str = "mae", versions=None) -> dict:
+        """
+        Lowest-`metric` entry whose single-row latency fits the budget.
+        Falls back to the fastest entry when nothing fits.
+        Chooses among `versions` when given, otherwise among the active
+        run (run_entries).
+        """
+        if versions is not None:
+            entries = [e for e in self.entries() if e["version"] in set(versions)]
+        else:
+            entries = self.run_entries()
+        if not entries:
+            raise LookupError("Model registry is empty")
+
+        fitting = [
+            e for e in entries
+            if max_latency_ms is None or e["latency_ms"] <= max_latency_ms
+        ]
+        if not fitting:
+            return min(entries, key=lambda e: e["latency_ms"])
+        return min(fitting, key=lambda e: e["metrics"][metric])
+
+    def load(self, version: str, prefer_flat: bool = True):
+        """
+        Predictor for a version: FlatForest when available, else sklearn.
+        """
+        entry = self.get(version)
+        if prefer_flat and entry.get("flat_path"):
+            return FlatForest.load(self.root / entry["flat_path"])
+        return joblib.load(self.root / entry["path"])
@@ -9,9 +9,10 @@ import joblib
 import numpy as np
 import pandas as pd
 from numpy.linalg import norm
-from sklearn.metrics.pairwise import cosine_similarity
 
 from ai_engine.recommender.brand_normalizer import resolve_brand
+from ai_engine.recommender.results import ResultBatch
+from ai_engine.telemetry.spans import span
 
 # -------------------------
 # LOAD ARTIFACTS
@@ -44,9 +45,9 @@ class SmartphoneRecommender:
         "release_year": 0.15,
     }
 
-    def __init__(self):
-        self.df = PROCESSED_DF.copy()
-        self.scaler = SCALER
+    def __init__(self, df=None, scaler=None):
+        self.df = (PROCESSED_DF if df is None else df).copy()
+        self.scaler = SCALER if scaler is None else scaler
 
     # -------------------------
     # NORMALIZATION
@@ -64,7 +65,8 @@ class SmartphoneRecommender:
     # DYNAMIC WEIGHTING
     # -------------------------
     def _dynamic_weights(self, user_input: dict):
-        weights = self.BASE_WEIGHTS.copy()
+        # Weights inferred from an NL query (nl_weight_mapper) replace the base
+        weights = dict(user_input.get("feature_weights") or self.BASE_WEIGHTS)
 
         profile = user_input.get("performance_profile", "balanced")
 
@@ -79,6 +81,7 @@ class SmartphoneRecommender:
             weights["price"] -= 0.05
 
         # Normalize
+        weights = {k: max(v, 0.0) for k, v in weights.items()}
         total = sum(weights.values())
         return {k: v / total for k, v in weights.items()}
 
@@ -136,47 +139,113 @@ class SmartphoneRecommender:
 
         return max(penalty, 0.6)
 
+    # -------------------------
+    # VECTORIZED SCORING (all rows at once)
+    # -------------------------
+    def _feature_match_matrix(self, X, user_input: dict):
+        """
+        _feature_matches for every row of X (raw values, FEATURES order)
+        -> (n, len(FEATURES)) matrix.
+        """
+        price, cam, battery, ram, display, weight, year = X.T
+        matches = np.empty_like(X, dtype=float)
+
+        def closeness(values, desired):
+            return np.maximum(0, 1 - np.abs(values - desired) / desired) if desired else np.full(len(values), 0.5)
+
+        def at_least(values, desired):
+            return np.minimum(1, values / desired) if desired else np.full(len(values), 0.5)
+
+        matches[:, 0] = closeness(price, user_input.get("price", 0))
+        matches[:, 1] = at_least(cam, user_input.get("cam_resolution", 0))
+        matches[:, 2] = at_least(battery, user_input.get("battery", 0))
+        matches[:, 3] = at_least(ram, user_input.get("ram", 0))
+        matches[:, 4] = closeness(display, user_input.get("display_size", 0))
+        matches[:, 5] = closeness(weight, user_input.get("weight", 0))
+
+        y_min, y_max = self.df["release_year"].min(), self.df["release_year"].max()
+        matches[:, 6] = (year - y_min) / (y_max - y_min) if y_max > y_min else 0.5
+        return matches
+
+    def _human_penalties(self, X, user_input: dict):
+        """
+        _human_penalty for every row of X.
+        """
+        price, cam, battery, ram, display, weight, year = X.T
+        penalty = np.ones(len(X))
+        if user_input.get("price", 0) < 400:
+            penalty -= 0.10 * (cam > 100)
+        if user_input.get("performance_profile") == "performance":
+            penalty -= 0.15 * (ram < 6)
+        if user_input.get("battery", 0) > 5000:
+            penalty -= 0.05 * (weight > 220)
+        return np.maximum(penalty, 0.6)
+
+    def score_rows(self, df, user_input: dict):
+        return self.score_matrix(df[self.FEATURES].to_numpy(dtype=float), user_input)
+
+    def score_matrix(self, X, user_input: dict):
+        """
+        Hybrid match score of every row of X (raw values, FEATURES order):
+        similarity + weighted feature matches x penalties, and the
+        (n, len(FEATURES)) match matrix behind it.
+        """
+        with span("hybrid.similarity"):
+            X_norm = self._normalize_rows(self.scaler.transform(X))
+            sim_scores = (X_norm @ self.build_user_vector(user_input).T).ravel()
+
+        with span("hybrid.feature_match"):
+            weights = self._dynamic_weights(user_input)
+            matches = self._feature_match_matrix(X, user_input)
+            w = np.array([weights[f] for f in self.FEATURES])
+            feature_scores = (matches @ w) * self._human_penalties(X, user_input)
+
+        return 0.4 * sim_scores + 0.6 * feature_scores, matches
+
     # -------------------------
     # MAIN RECOMMEND
     # -------------------------
-    def recommend(self, user_input: dict, top_n: int = 5):
+    def _pool(self, user_input: dict):
         brand_info = resolve_brand(user_input.get("brand"), self.df)
         df = brand_info["filtered_df"]
 
         if df is None or df.empty:
-            df = self.df.copy()
+            df = self.df
             brand_info["match_type"] = "fallback"
+        return df, brand_info
+
+    def _top(self, df, user_input: dict, top_n: int):
+        """
+        (positions in df, scores, match matrix) of the top_n rows,
+        best first (ties in catalog order).
+        """
+        scores, matches = self.score_rows(df, user_input)
+
+        with span("hybrid.rank"):
+            top = np.argsort(-scores, kind="stable")[:top_n]
+        return top, scores[top], matches[top]
+
+    def results(self, user_input: dict, top_n: int = 5) -> ResultBatch:
+        """
+        Top_n as a ResultBatch of self.df row positions, straight from
+        score_matrix (no DataFrame or dict items).
+        """
+        df, _ = self._pool(user_input)
+        top, scores, matches = self._top(df, user_input, top_n)
+        rows = self.df.index.get_indexer(df.index[top])
+        return ResultBatch(rows, scores, matches, self.FEATURES)
 
-        df = df.reset_index(drop=True)
-
-        X = df[self.FEATURES].astype(float).values
-        X_scaled = self.scaler.transform(X)
-        X_norm = self._normalize_rows(X_scaled)
-
-        user_vec = self.build_user_vector(user_input)
-        sim_scores = cosine_similarity(X_norm, user_vec).flatten()
-
-        weights = self._dynamic_weights(user_input)
-
-        final_scores = []
-        feature_scores = []
-
-        for _, row in df.iterrows():
-            matches = self._feature_matches(row, user_input)
-            score = sum(weights[f] * matches[f] for f in weights)
-            score *= self._human_penalty(row, user_input)
-
-            final_scores.append(score)
-            feature_scores.append(matches)
-
-        df["match_score"] = 0.4 * sim_scores + 0.6 * np.array(final_scores)
-        df["feature_scores"] = feature_scores
-
-        ranked = df.sort_values("match_score", ascending=False).head(top_n)
+    def recommend(self, user_input: dict, top_n: int = 5):
+        df, brand_info = self._pool(user_input)
+        top, scores, matches = self._top(df, user_input, top_n)
 
+        ranked = df.iloc[top][["brand", "model"]].assign(
+            match_score=scores,
+            feature_scores=[dict(zip(self.FEATURES, row)) for row in matches.tolist()],
+        )
         return {
             "brand_info": brand_info,
-            "items": ranked[["brand", "model", "match_score", "feature_scores"]].to_dict("records"),
+            "items": ranked.to_dict("records"),
         }
 
 
@@ -0,0 +1,59 @@
+"""
+ai_engine/recommender/results.py
+================================
+Compact ranked results straight from the scoring path: catalog row
+positions + scores (+ the feature-match matrix), no DataFrame and no
+per-item dicts until the response is written.
+
+ResultBatch is the array-backed batch every engine path hands the view.
+
+Rows are POSITIONS in the catalog (raw_df), not index labels.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from ai_engine.recommender.explainability import explain_batch
+from ai_engine.recommender.satisfaction_engine import NUMERIC_FEATURES
+
+FEATURES = list(NUMERIC_FEATURES)
+NO_EXPLANATION = {"top_features": [], "pros": [], "cons": []}
+
+
+class ResultBatch:
+    """
+    rows (n,) int64, scores (n,) float64, matches (n, len(features))
+    float64 feature-match scores (NaN = absent) or None.
+    """
+
+    __slots__ = ("rows", "scores", "matches", "features")
+
+    def __init__(self, rows, scores, matches=None, features: Sequence[str] = FEATURES):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.scores = np.broadcast_to(np.asarray(scores, dtype=float), self.rows.shape)
+        self.matches = None if matches is None else np.asarray(matches, dtype=float)
+        self.features = list(features)
+        if self.matches is not None and self.matches.shape != (len(self.rows), len(self.features)):
+            raise ValueError(f"Expected matches of shape ({len(self.rows)}, {len(self.features)}), got {self.matches.shape}")
+
+    @classmethod
+    def empty(cls) -> "ResultBatch":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index: slice) -> "ResultBatch":
+        if not isinstance(index, slice):
+            raise TypeError("ResultBatch supports slicing only")
+        matches = None if self.matches is None else self.matches[index]
+        return ResultBatch(self.rows[index], self.scores[index], matches, self.features)
+
+    def explanations(self) -> List[Dict[str, List[str]]]:
+        """
+        explain_recommendation for every item, in one vectorized pass.
+        """
+        if self.matches is None:
+            return [NO_EXPLANATION] * len(self)
+        return explain_batch(self.matches, self.features)
@@ -1,11 +1,18 @@
+import threading
+import time
 from pathlib import Path
 import joblib
 import numpy as np
 import pandas as pd
 
+from ai_engine.recommender.model_registry import ModelRegistry
+from ai_engine.recommender.tree_ensemble import FlatForest
+from ai_engine.telemetry.spans import span
+
 
 ASSETS_DIR = Path(__file__).resolve().parent / "assets"
 MODEL_PATH = ASSETS_DIR / "satisfaction_model.pkl"
+FLAT_MODEL_PATH = ASSETS_DIR / "satisfaction_forest.npz"
 SCALER_PATH = ASSETS_DIR / "scaler.pkl"
 
 NUMERIC_FEATURES = [
@@ -18,21 +25,168 @@ NUMERIC_FEATURES = [
     "release_year",
 ]
 
+# Precomputed (raw, un-normalized) model prediction stored in raw_df,
+# and the registry version of the model behind it (None: unknown)
+SCORE_COLUMN = "satisfaction_score"
+SCORE_VERSION_COLUMN = "satisfaction_version"
+
+# How often a long-lived engine checks whether the model was retrained
+MODEL_CHECK_INTERVAL = 30.0
+
+
+def _mtime(path: Path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def model_version(latency_budget_ms: float = None):
+    """
+    Registry version load_satisfaction_model(latency_budget_ms) serves:
+    the budget's pick among the active run, else the active (promoted)
+    model. None when the registry does not know it.
+    """
+    registry = ModelRegistry()
+    if latency_budget_ms is not None and registry.entries():
+        return registry.select_best(max_latency_ms=latency_budget_ms)["version"]
+    return registry.active
+
+
+def load_satisfaction_model(latency_budget_ms: float = None):
+    """
+    Flattened forest (no sklearn overhead) when it is up to date with the
+    pickled model, otherwise the pickled sklearn model.
+
+    With a latency budget, the most accurate registered model of the
+    active run that fits it is used instead (see model_registry).
+    """
+    if latency_budget_ms is not None:
+        version = model_version(latency_budget_ms)
+        if version is not None:
+            return ModelRegistry().load(version)
+
+    flat_mtime = _mtime(FLAT_MODEL_PATH)
+    model_mtime = _mtime(MODEL_PATH)
+    if flat_mtime is not None and (model_mtime is None or flat_mtime >= model_mtime):
+        return FlatForest.load(FLAT_MODEL_PATH)
+    return joblib.load(MODEL_PATH)
+
+
+# -------------------------
+# BUILD-TIME SCORING
+# -------------------------
+def predict_satisfaction(df: pd.DataFrame, model=None, scaler=None) -> np.ndarray:
+    """
+    Raw satisfaction predictions for every row of `df`.
+    The prediction does not depend on user input, so this runs at
+    artifact build time, not per request.
+    """
+    model = model if model is not None else load_satisfaction_model()
+    scaler = scaler if scaler is not None else joblib.load(SCALER_PATH)
+    X = scaler.transform(df[NUMERIC_FEATURES].astype(float))
+    return model.predict(X)
+
+
+def attach_satisfaction_scores(raw_df: pd.DataFrame, model=None, scaler=None, version=None) -> pd.DataFrame:
+    """
+    Return raw_df with SCORE_COLUMN (re)computed and SCORE_VERSION_COLUMN
+    set to `version` (the promoted model's version when `model` is not
+    given).
+    """
+    if model is None and version is None:
+        version = model_version()
+    return raw_df.assign(**{
+        SCORE_COLUMN: predict_satisfaction(raw_df, model, scaler),
+        SCORE_VERSION_COLUMN: version,
+    })
 
+
+# -------------------------
+# SERVING
+# -------------------------
 class SatisfactionRecommender:
     """
     Predicts and ranks phones by expected user satisfaction.
     Output schema matches other recommenders.
+
+    Scores come from the precomputed SCORE_COLUMN, so ranking is a
+    filtered top-k lookup. Build once and share: when the model file is
+    retrained the scores are recomputed in a background thread and
+    swapped in.
+
+    With a latency budget, the precomputed scores are only used when
+    they were written by the model the budget selects; otherwise the
+    catalog is rescored once with that model.
     """
 
-    def __init__(self, raw_df: pd.DataFrame):
-        self.df = raw_df.copy()
-        self.model = joblib.load(MODEL_PATH)
-        self.scaler = joblib.load(SCALER_PATH)
+    def __init__(self, raw_df: pd.DataFrame, latency_budget_ms: float = None):
+        self.df = raw_df
+        self.latency_budget_ms = latency_budget_ms
+        self.model_version = model_version(latency_budget_ms)
+        self._model_mtime = _mtime(MODEL_PATH)
+        self._next_check = time.monotonic() + MODEL_CHECK_INTERVAL
+        self._refreshing = threading.Lock()
+
+        if self._precomputed_usable(raw_df):
+            scores = raw_df[SCORE_COLUMN].to_numpy(dtype=float)
+        else:
+            # Artifacts built before scores existed: compute once here
+            scores = self._predict(raw_df)
+        self._scores = pd.Series(scores, index=raw_df.index)
 
-    def _build_features(self, df: pd.DataFrame) -> np.ndarray:
-        X = df[NUMERIC_FEATURES].astype(float)
-        return self.scaler.transform(X)
+    def _precomputed_usable(self, raw_df: pd.DataFrame) -> bool:
+        if SCORE_COLUMN not in raw_df.columns or not raw_df[SCORE_COLUMN].notna().all():
+            return False
+        if self.latency_budget_ms is None:
+            return True
+        return (
+            SCORE_VERSION_COLUMN in raw_df.columns
+            and (raw_df[SCORE_VERSION_COLUMN] == self.model_version).all()
+        )
+
+    def _predict(self, df: pd.DataFrame) -> np.ndarray:
+        return predict_satisfaction(df, model=load_satisfaction_model(self.latency_budget_ms))
+
+    # -------------------------
+    # MODEL REFRESH
+    # -------------------------
+    def _recompute(self):
+        try:
+            self._scores = pd.Series(self._predict(self.df), index=self.df.index)
+        except Exception as e:
+            print(f"[SATISFACTION REFRESH ERROR] {e}")
+        finally:
+            self._refreshing.release()
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + MODEL_CHECK_INTERVAL
+
+        mtime = _mtime(MODEL_PATH)
+        if mtime is None or mtime == self._model_mtime:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        self._model_mtime = mtime
+        threading.Thread(target=self._recompute, daemon=True).start()
+
+    # -------------------------
+    # SCORING
+    # -------------------------
+    def scores_for(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Raw scores aligned to df rows (looked up by index; rows unknown
+        to the catalog are predicted on the fly).
+        """
+        scores = self._scores.reindex(df.index).to_numpy(dtype=float)
+        missing = np.isnan(scores)
+        if missing.any():
+            scores[missing] = self._predict(df[missing])
+        return scores
 
     @staticmethod
     def _normalize(scores: np.ndarray) -> np.ndarray:
@@ -40,20 +194,32 @@ class SatisfactionRecommender:
             return np.ones_like(scores) * 0.5
         return (scores - scores.min()) / (scores.max() - scores.min())
 
-    def recommend(self, user_input: dict, top_n: int = 3, df_override=None):
-        df = df_override.copy() if df_override is not None else self.df.copy()
+    def rank(self, user_input: dict, top_n: int = 3, df_override=None):
+        """
+        (row positions in df, normalized scores) of the top_n, best first.
+        """
+        self._maybe_refresh()
 
+        df = df_override if df_override is not None else self.df
         if df.empty:
-            return df
+            return np.empty(0, dtype=np.int64), np.empty(0)
 
-        X = self._build_features(df)
-        raw_scores = self.model.predict(X)
+        with span("satisfaction.score"):
+            norm_scores = self._normalize(self.scores_for(df))
 
-        norm_scores = self._normalize(raw_scores)
+        with span("satisfaction.rank"):
+            k = min(top_n, len(df))
+            top = np.argpartition(-norm_scores, k - 1)[:k]
+            top = top[np.argsort(-norm_scores[top], kind="stable")]
+        return top, norm_scores[top]
 
-        df["match_score"] = norm_scores
-        df["feature_scores"] = [{} for _ in range(len(df))]
+    def recommend(self, user_input: dict, top_n: int = 3, df_override=None):
+        df = df_override if df_override is not None else self.df
+        top, scores = self.rank(user_input, top_n, df_override)
+        if not len(top):
+            return df.copy()
 
-        return df.sort_values("match_score", ascending=False).head(top_n)[
-            ["model", "match_score", "feature_scores"]
-        ]
+        ranked = df.iloc[top][["model"]].copy()
+        ranked["match_score"] = scores
+        ranked["feature_scores"] = [{} for _ in range(len(top))]
+        return ranked
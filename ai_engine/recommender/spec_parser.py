@@ -0,0 +1,254 @@
+"""
+SPEC PARSER
+===========
+Raw spec strings -> numbers in canonical units, one pass per column.
+
+    "5,110mAh"          -> 5110.0   (battery, mAh)
+    "1.5GB" / "1TB"     -> 1.5 / 1024.0   (capacity, GB)
+    "222.8g" / "0.2kg"  -> 222.8 / 200.0  (weight, g)
+    "6.1 inches"        -> 6.1      (display, inches)
+    "48MP + 12MP"       -> 48.0     (camera, main sensor MP)
+    "USD 634.99"        -> 634.99   (price; currency via parse_price_column)
+    "PKR 224,999"       -> 224999.0
+
+Each column is factorized first, so every DISTINCT raw value is matched
+once against a precompiled pattern and the results are scattered back
+with a vectorized take. Catalog columns repeat values heavily (a few
+dozen RAM sizes for thousands of phones).
+
+Malformed values (no number / unknown unit / unexpected currency) become
+NaN with errors="coerce" (default) and raise SpecParseError with
+errors="raise". `malformed_values` lists them for reporting.
+
+NO Django
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class SpecParseError(ValueError):
+    pass
+
+
+# -------------------------
+# PATTERNS
+# -------------------------
+# "5,110" / "634.99" / "224,999" / "1,04,999" (lakh grouping) / "6400"
+_NUM = r"(\d{1,3}(?:,\d{2,3})*,\d{3}(?:\.\d+)?|\d+(?:\.\d+)?)"
+
+# kind -> (pattern, {unit: factor to canonical}, factor when no unit given)
+SPEC_KINDS = {
+    "battery": (
+        re.compile(_NUM + r"\s*(mah)?", re.I),
+        {"mah": 1.0},
+        1.0,
+    ),
+    "capacity": (
+        re.compile(_NUM + r"\s*(tb|gb|mb)?", re.I),
+        {"tb": 1024.0, "gb": 1.0, "mb": 1 / 1024},
+        1.0,
+    ),
+    "weight": (
+        re.compile(_NUM + r"\s*(kg|grams|gram|g|oz)?\b", re.I),
+        {"kg": 1000.0, "grams": 1.0, "gram": 1.0, "g": 1.0, "oz": 28.349523125},
+        1.0,
+    ),
+    "display": (
+        re.compile(_NUM + r"\s*(inches|inch|in|\"|cm)?", re.I),
+        {"inches": 1.0, "inch": 1.0, "in": 1.0, '"': 1.0, "cm": 1 / 2.54},
+        1.0,
+    ),
+    "camera": (
+        re.compile(_NUM + r"\s*(mp)?", re.I),
+        {"mp": 1.0},
+        1.0,
+    ),
+    "number": (
+        re.compile(_NUM),
+        {},
+        1.0,
+    ),
+}
+
+# clean_features column -> spec kind
+COLUMN_KINDS = {
+    "price": "price",
+    "ram": "capacity",
+    "battery": "battery",
+    "cam_resolution": "camera",
+    "display_size": "display",
+    "weight": "weight",
+}
+
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "CNY", "₹": "INR", "Rs": "PKR"}
+_PRICE_RE = re.compile(
+    r"^\s*(?:([A-Z]{3}|Rs\.?|[$€£¥₹])\s*)?" + _NUM + r"\s*([A-Z]{3})?\s*$"
+)
+
+
+# -------------------------
+# SINGLE VALUES
+# -------------------------
+def parse_value(value, kind: str) -> float:
+    """
+    One raw value -> float in the canonical unit (NaN when malformed).
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+
+    pattern, units, default = SPEC_KINDS[kind]
+    m = pattern.search(str(value))
+    if m is None:
+        return np.nan
+
+    number = float(m.group(1).replace(",", ""))
+    unit = m.group(2).lower() if m.lastindex and m.lastindex >= 2 and m.group(2) else None
+    return number * (units[unit] if unit else default)
+
+
+def parse_price(value):
+    """
+    "USD 799" / "$799" / "799 USD" / "PKR 224,999" -> (amount, "USD"|...).
+    A bare number has currency None. Malformed -> (NaN, None).
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value), None
+
+    m = _PRICE_RE.match(str(value))
+    if m is None:
+        return np.nan, None
+
+    prefix, amount, suffix = m.groups()
+    if prefix and suffix and prefix != suffix:
+        return np.nan, None  # "USD 5 EUR"
+
+    currency = prefix or suffix
+    if currency:
+        currency = _CURRENCY_SYMBOLS.get(currency.rstrip("."), currency)
+    return float(amount.replace(",", "")), currency
+
+
+# -------------------------
+# COLUMNS (vectorized)
+# -------------------------
+def _scatter(values, parse_one):
+    """
+    Parse each distinct value once.
+    Returns (factorize codes, distinct values, their parse results).
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+    parsed_unique = [parse_one(u) for u in uniques]
+    return codes, uniques, parsed_unique
+
+
+def _take(codes, table: np.ndarray) -> np.ndarray:
+    out = np.full(len(codes), np.nan)
+    present = codes >= 0
+    out[present] = table[codes[present]]
+    return out
+
+
+def _check(uniques, bad_mask, kind, errors):
+    if errors == "raise" and bad_mask.any():
+        examples = [uniques[i] for i in np.flatnonzero(bad_mask)[:5]]
+        raise SpecParseError(f"{int(bad_mask.sum())} malformed {kind} values, e.g. {examples}")
+
+
+def parse_column(values, kind: str, errors: str = "coerce") -> np.ndarray:
+    """
+    Parse a column of raw spec strings into float64 canonical units.
+    Missing (NaN/None) stays NaN and is not counted as malformed.
+    """
+    if kind == "price":
+        amounts, _ = parse_price_column(values, errors=errors)
+        return amounts
+
+    codes, uniques, parsed = _scatter(values, lambda v: parse_value(v, kind))
+    table = np.asarray(parsed, dtype=float)
+    _check(uniques, np.isnan(table), kind, errors)
+    return _take(codes, table)
+
+
+def parse_price_column(values, currency: str = None, errors: str = "coerce"):
+    """
+    Returns (amounts, currencies). With `currency`, values in another
+    currency are malformed (guards against mixed columns).
+    """
+    codes, uniques, parsed = _scatter(values, parse_price)
+    amounts = np.array([p[0] for p in parsed], dtype=float)
+    currencies = np.array([p[1] for p in parsed], dtype=object)
+
+    bad = np.isnan(amounts)
+    if currency is not None:
+        bad |= np.array([c not in (currency, None) for c in currencies], dtype=bool)
+        amounts[bad] = np.nan
+    _check(uniques, bad, "price", errors)
+
+    out_currency = np.full(len(codes), None, dtype=object)
+    present = codes >= 0
+    out_currency[present] = currencies[codes[present]]
+    return _take(codes, amounts), out_currency
+
+
+def malformed_values(values, kind: str) -> list:
+    """
+    Distinct non-missing values that do not parse as `kind`.
+    """
+    uniques = pd.unique(pd.Series(values, dtype=object).dropna())
+    if kind == "price":
+        return [u for u in uniques if np.isnan(parse_price(u)[0])]
+    return [u for u in uniques if np.isnan(parse_value(u, kind))]
+
+
+# -------------------------
+# BENCHMARK
+# -------------------------
+def _legacy_parse(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The six str.replace / str.extract passes clean_features used to run.
+    """
+    out = pd.DataFrame(index=df.index)
+    out["price"] = df["price"].astype(str).str.replace(r"[^0-9]", "", regex=True).astype(float)
+    out["ram"] = df["ram"].astype(str).str.extract(r"(\d+)").astype(float)
+    out["battery"] = df["battery"].astype(str).str.extract(r"(\d+)").astype(float)
+    out["cam_resolution"] = df["cam_resolution"].astype(str).str.extract(r"(\d+)").astype(float)
+    out["display_size"] = df["display_size"].astype(str).str.extract(r"(\d+\.?\d*)").astype(float)
+    out["weight"] = df["weight"].astype(str).str.extract(r"(\d+\.?\d*)").astype(float)
+    return out
+
+
+def benchmark(n_rows: int = 200_000, repeats: int = 3) -> dict:
+    """
+    Legacy regex passes vs parse_column on the bundled catalog tiled to
+    `n_rows`. Returns best-of-`repeats` seconds for both.
+    """
+    import time
+
+    from ai_engine.recommender.data_loader import MAIN_RENAME, load_datasets
+
+    df_main, _ = load_datasets()
+    df = df_main.rename(columns=MAIN_RENAME)[list(COLUMN_KINDS)]
+    df = pd.concat([df] * (n_rows // len(df) + 1), ignore_index=True).iloc[:n_rows]
+
+    def run(fn):
+        best = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    legacy = run(lambda: _legacy_parse(df))
+    fast = run(lambda: {col: parse_column(df[col], kind) for col, kind in COLUMN_KINDS.items()})
+    return {"rows": n_rows, "legacy_s": legacy, "spec_parser_s": fast, "speedup": legacy / fast}
+
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(
+        f"{result['rows']} rows: legacy {result['legacy_s']:.3f}s, "
+        f"spec_parser {result['spec_parser_s']:.3f}s ({result['speedup']:.1f}x)"
+    )
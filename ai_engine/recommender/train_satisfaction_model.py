@@ -1,72 +1,137 @@
 """
 train_satisfaction_model.py
 
-Train and save a satisfaction regressor and simple evaluation.
+Train, compare and save satisfaction regressors.
+
+Run (from the project root):
+    python -m ai_engine.recommender.train_satisfaction_model [--latency-budget-ms 1.0]
+    python -m ai_engine.recommender.train_satisfaction_model --incremental
+
 Outputs:
- - assets/satisfaction_model.pkl
+ - assets/model_registry/        every candidate, versioned, with metrics
+ - assets/satisfaction_model.pkl (the promoted candidate)
+ - assets/satisfaction_forest.npz (flattened forest, sklearn-free inference)
  - (optionally) assets/satisfaction_metrics.json
+ - raw_df.pkl refreshed with the precomputed `satisfaction_score` column
+
+Candidates from several model families are fitted in parallel (process
+pool), then scored serially; each records fit time, prediction latency
+and accuracy. The most accurate candidate within the latency budget is
+promoted.
+
+--incremental warm-starts the promoted model (adds trees / boosting
+iterations) when the catalog only grew, instead of a full search.
+Catalog versions hash raw_df's unscaled rows, so a new phone that
+extends a min/max (and rescales processed_df) still counts as "grown";
+X is the current scaling. Feature matrices are cached per catalog
+version (assets/feature_cache/).
 
-This script is self-contained and uses processed_df.pkl if available.
+Uses processed_df.pkl if available.
 If no ground-truth 'satisfaction' column exists, it synthesizes a proxy target
 from battery/ram/cam_resolution (normalized).
 """
 
+import argparse
+import hashlib
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.ensemble import (
+    ExtraTreesRegressor,
+    HistGradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import cross_val_score
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from ai_engine.recommender.model_registry import ModelRegistry
+from ai_engine.recommender.tree_ensemble import FlatForest
 
 # ---------- PATHS ----------
 BASE = Path(__file__).resolve().parent
 ASSETS_DIR = BASE / "assets"
-ASSETS_DIR.mkdir(exist_ok=True)
 PROCESSED_PATH = ASSETS_DIR / "processed_df.pkl"
 RAW_PATH = ASSETS_DIR / "raw_df.pkl"
 SCALER_PATH = ASSETS_DIR / "scaler.pkl"
 OUT_MODEL = ASSETS_DIR / "satisfaction_model.pkl"
 OUT_METRICS = ASSETS_DIR / "satisfaction_metrics.json"
+OUT_FLAT_MODEL = ASSETS_DIR / "satisfaction_forest.npz"
+OUT_STATE = ASSETS_DIR / "satisfaction_train_state.json"
+FEATURE_CACHE_DIR = ASSETS_DIR / "feature_cache"
+
+# Use canonical numeric features (these must match your data_loader)
+NUMERIC_FEATURES = ["price", "cam_resolution", "battery", "ram", "display_size", "weight", "release_year"]
+TARGET_COL = "satisfaction"
+RANDOM_STATE = 42
+TEST_PERCENT = 15
+
+# Incremental mode: warm start only while the catalog grew by at most this much
+MAX_INCREMENTAL_FRACTION = 0.25
+FEATURE_CACHE_KEEP = 5
+
+# ---------- SEARCH SPACE ----------
+# (family, estimator class, params). n_jobs=1: parallelism is across candidates.
+MODEL_FAMILIES = {
+    "random_forest": RandomForestRegressor,
+    "extra_trees": ExtraTreesRegressor,
+    "decision_tree": DecisionTreeRegressor,
+    "hist_gradient_boosting": HistGradientBoostingRegressor,
+    "ridge": Ridge,
+    "knn": KNeighborsRegressor,
+}
+
+SEARCH_SPACE = [
+    ("random_forest", {"n_estimators": 150, "max_depth": 12}),  # previous default
+    ("random_forest", {"n_estimators": 50, "max_depth": 10}),
+    ("random_forest", {"n_estimators": 20, "max_depth": 8}),
+    ("extra_trees", {"n_estimators": 100, "max_depth": 12}),
+    ("extra_trees", {"n_estimators": 30, "max_depth": 10}),
+    ("decision_tree", {"max_depth": 10}),
+    ("hist_gradient_boosting", {"max_iter": 200, "learning_rate": 0.1}),
+    ("ridge", {"alpha": 1.0}),
+    ("knn", {"n_neighbors": 5}),
+]
+
+_TREE_FAMILIES = {"random_forest", "extra_trees", "decision_tree"}
+WARM_START_FAMILIES = {"random_forest", "extra_trees", "hist_gradient_boosting"}
+
 
 # ---------- LOAD DATA ----------
-if PROCESSED_PATH.exists():
-    print("Loading processed_df.pkl (preferred)")
-    processed = joblib.load(PROCESSED_PATH)
-    # processed is expected to be normalized and include numeric features
-    df = processed.copy()
-else:
+def load_training_frame():
+    if PROCESSED_PATH.exists():
+        print("Loading processed_df.pkl (preferred)")
+        # processed is expected to be normalized and include numeric features
+        return joblib.load(PROCESSED_PATH).copy(), True
+
     # fallback to raw_df (will attempt minimal cleaning)
     if RAW_PATH.exists():
         print("processed_df not found — loading raw_df.pkl and building features")
-        df = joblib.load(RAW_PATH).copy()
-    else:
-        raise FileNotFoundError("No processed_df.pkl or raw_df.pkl found in assets. Run data_loader first.")
+        return joblib.load(RAW_PATH).copy(), False
 
-# ---------- Identify features ----------
-# Use canonical numeric features (these must match your data_loader)
-NUMERIC_FEATURES = ["price", "cam_resolution", "battery", "ram", "display_size", "weight", "release_year"]
+    raise FileNotFoundError("No processed_df.pkl or raw_df.pkl found in assets. Run data_loader first.")
 
-for feat in NUMERIC_FEATURES:
-    if feat not in df.columns:
-        raise KeyError(f"Expected feature '{feat}' not found in data. Found columns: {list(df.columns)[:20]}")
 
 # ---------- TARGET ----------
-# If dataset already has a column 'satisfaction' then use it.
-# Otherwise synthesize a proxy target.
-TARGET_COL = "satisfaction"
+def build_target(df: pd.DataFrame) -> np.ndarray:
+    # If dataset already has a column 'satisfaction' then use it.
+    # Otherwise synthesize a proxy target.
+    if TARGET_COL in df.columns:
+        print("Using real 'satisfaction' column as target.")
+        return df[TARGET_COL].astype(float).values
 
-if TARGET_COL in df.columns:
-    print("Using real 'satisfaction' column as target.")
-    y = df[TARGET_COL].astype(float).values
-else:
     print("No 'satisfaction' column found. Creating synthetic proxy target.")
     # proxy: weighted sum of battery, ram, cam_resolution (higher -> better),
     # price *negatively* correlated (lower price is better for satisfaction at same specs)
     # Normalize chosen columns to 0-1 for stable proxy.
     proxy_cols = ["battery", "ram", "cam_resolution", "price"]
-    # compute min/max safely
     df_subset = df[proxy_cols].astype(float).copy()
     # Protect against constant columns
     min_vals = df_subset.min()
@@ -91,66 +156,472 @@ else:
     # rescale to 0..1
     y_min, y_max = y_proxy.min(), y_proxy.max()
     if y_max - y_min > 0:
-        y = (y_proxy - y_min) / (y_max - y_min)
-    else:
-        y = np.clip(y_proxy, 0, 1)
+        return ((y_proxy - y_min) / (y_max - y_min)).values
+    return np.clip(y_proxy, 0, 1).values
+
 
 # ---------- FEATURES MATRIX ----------
-# If processed_df is normalized, prefer using its numeric features directly.
-if PROCESSED_PATH.exists():
-    X = df[NUMERIC_FEATURES].astype(float).values
-else:
+def build_features(df: pd.DataFrame, is_processed: bool) -> np.ndarray:
+    for feat in NUMERIC_FEATURES:
+        if feat not in df.columns:
+            raise KeyError(f"Expected feature '{feat}' not found in data. Found columns: {list(df.columns)[:20]}")
+
+    # If processed_df is normalized, prefer using its numeric features directly.
+    if is_processed:
+        return df[NUMERIC_FEATURES].astype(float).values
+
     # If raw_df, do simple numeric extraction and min-max scaling here for training
     from sklearn.preprocessing import MinMaxScaler
     scaler = MinMaxScaler()
     X = scaler.fit_transform(df[NUMERIC_FEATURES].astype(float).values)
     # Save this temporary scaler for later inference compatibility
     joblib.dump(scaler, ASSETS_DIR / "satisfaction_temp_scaler.pkl")
+    return X
 
-# ---------- Split ----------
-RANDOM_STATE = 42
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.15, random_state=RANDOM_STATE)
-
-# ---------- Train model ----------
-print("Training RandomForestRegressor (satisfaction predictor)...")
-model = RandomForestRegressor(
-    n_estimators=150,
-    max_depth=12,
-    random_state=RANDOM_STATE,
-    n_jobs=-1
-)
-model.fit(X_train, y_train)
-
-# ---------- Evaluate ----------
-y_pred = model.predict(X_test)
-mse = mean_squared_error(y_test, y_pred)
-mae = mean_absolute_error(y_test, y_pred)
-r2 = r2_score(y_test, y_pred)
-
-# Cross-validated MAE (optional quick check)
-cv_scores = None
-try:
-    cv_scores = cross_val_score(model, X, y, cv=5, scoring="neg_mean_absolute_error", n_jobs=-1)
-    cv_mae = -float(np.mean(cv_scores))
-except Exception as e:
-    cv_mae = None
-    print("CV scoring skipped:", e)
-
-metrics = {
-    "mse": float(mse),
-    "mae": float(mae),
-    "r2": float(r2),
-    "cv_mae": float(cv_mae) if cv_mae is not None else None,
-    "train_size": int(X_train.shape[0]),
-    "test_size": int(X_test.shape[0]),
-}
 
-print("Evaluation metrics:", metrics)
+# ---------- FEATURE CACHE (keyed by catalog version) ----------
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    One uint64 per row over model name + training features: a row whose
+    features change counts as a new row. Pass UNSCALED rows (see
+    unscaled_rows), so a min/max extension does not touch old rows.
+    """
+    cols = ["model"] + NUMERIC_FEATURES + ([TARGET_COL] if TARGET_COL in df.columns else [])
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+
+def unscaled_rows(df: pd.DataFrame, is_processed: bool) -> pd.DataFrame:
+    """
+    The raw (unscaled) feature rows behind `df`, for fingerprinting.
+    processed_df is min-max scaled, so its rows are matched with raw_df
+    by model; falls back to `df` when raw_df is missing or not aligned.
+    """
+    if not is_processed or not RAW_PATH.exists():
+        return df
+    raw_df = joblib.load(RAW_PATH)
+    if not raw_df["model"].reset_index(drop=True).equals(df["model"].reset_index(drop=True)):
+        return df
+    return raw_df
+
+
+def catalog_version(hashes: np.ndarray) -> str:
+    return hashlib.sha256(hashes.tobytes()).hexdigest()[:16]
+
+
+def split_test_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    Stable split by model name: a phone stays in train (or test) when
+    others are added, so warm-started and full models are comparable.
+    """
+    return pd.util.hash_pandas_object(df["model"], index=False).to_numpy() % 100 < TEST_PERCENT
+
+
+def load_cached_features(version: str, cache_dir: Path = None):
+    path = (cache_dir or FEATURE_CACHE_DIR) / f"{version}.npz"
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return {"version": version, "cached": True, **{k: data[k] for k in data.files}}
+
+
+def _prune_feature_cache(cache_dir: Path, keep: int = FEATURE_CACHE_KEEP) -> None:
+    state = load_train_state()
+    pinned = {f"{state['catalog_version']}.npz"} if state else set()
+    files = sorted(cache_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in files[keep:]:
+        if path.name not in pinned:
+            path.unlink(missing_ok=True)
+
+
+def cached_features(df: pd.DataFrame, is_processed: bool, cache_dir: Path = None, unscaled: pd.DataFrame = None) -> dict:
+    """
+    X / y / split / row hashes for `df`, rebuilt only when the catalog
+    version is not cached yet. The version hashes `unscaled` (default
+    `df`); X is always the current scaling of `df`.
+    """
+    cache_dir = cache_dir or FEATURE_CACHE_DIR
+    hashes = row_hashes(unscaled if unscaled is not None else df)
+    version = catalog_version(hashes)
+
+    cached = load_cached_features(version, cache_dir)
+    if cached is not None:
+        return cached
+
+    features = {
+        "X": build_features(df, is_processed),
+        "y": build_target(df),
+        "is_test": split_test_rows(df),
+        "row_hashes": hashes,
+    }
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    np.savez(cache_dir / f"{version}.npz", **features)
+    _prune_feature_cache(cache_dir)
+    return {"version": version, "cached": False, **features}
+
+
+# ---------- CANDIDATE EVALUATION ----------
+def make_estimator(family: str, params: dict):
+    cls = MODEL_FAMILIES[family]
+    params = dict(params)
+    if "random_state" in cls().get_params():
+        params.setdefault("random_state", RANDOM_STATE)
+    if "n_jobs" in cls().get_params():
+        params.setdefault("n_jobs", 1)
+    return cls(**params)
+
+
+def serving_predictor(family: str, model):
+    """
+    What serving would call: flattened forest for tree models, else sklearn.
+    """
+    return FlatForest.from_model(model) if family in _TREE_FAMILIES else model
+
+
+def measure_latency_ms(predictor, X: np.ndarray, repeats: int = 30) -> float:
+    """
+    Median wall time of one predict() call, in milliseconds.
+    """
+    predictor.predict(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictor.predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def score_candidate(family: str, model, X_test, y_test) -> dict:
+    """
+    Prediction latency (serving predictor) + accuracy on the test split.
+    """
+    predictor = serving_predictor(family, model)
+    y_pred = predictor.predict(X_test)
+
+    batch = np.resize(X_test, (1000, X_test.shape[1]))
+    return {
+        "latency_ms": round(measure_latency_ms(predictor, X_test[:1]), 4),
+        "batch_latency_ms": round(measure_latency_ms(predictor, batch, repeats=5), 4),
+        "metrics": {
+            "mse": float(mean_squared_error(y_test, y_pred)),
+            "mae": float(mean_absolute_error(y_test, y_pred)),
+            "r2": float(r2_score(y_test, y_pred)),
+        },
+    }
+
+
+def fit_candidate(family: str, params: dict, X_train, y_train):
+    """
+    Fit one candidate; returns (model, fit seconds).
+    Runs inside a worker process.
+    """
+    model = make_estimator(family, params)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    return model, time.perf_counter() - start
+
+
+def _fit_task(args):
+    return fit_candidate(*args)
+
+
+def run_search(X_train, y_train, X_test, y_test, space=SEARCH_SPACE, max_workers=None) -> list:
+    """
+    Fit every (family, params) candidate in a process pool, then score
+    them one by one in this process, so latencies are not measured
+    under pool contention.
+    Returns [(model, info), ...] in search-space order.
+    """
+    tasks = [(family, params, X_train, y_train) for family, params in space]
+
+    if max_workers == 1:
+        fitted = [_fit_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            fitted = list(pool.map(_fit_task, tasks))
+
+    results = []
+    for (family, params), (model, fit_seconds) in zip(space, fitted):
+        info = {
+            "family": family,
+            "params": params,
+            "fit_seconds": round(fit_seconds, 4),
+            **score_candidate(family, model, X_test, y_test),
+        }
+        results.append((model, info))
+    return results
+
+
+# ---------- INCREMENTAL (WARM START) ----------
+def fit_units(model) -> int:
+    """
+    Units of fitting work in a model: trees, boosting iterations, else 1.
+    """
+    if hasattr(model, "estimators_"):
+        return len(model.estimators_)
+    n_iter = getattr(model, "n_iter_", None)
+    return int(n_iter) if np.isscalar(n_iter) else 1
+
+
+def warm_start_fit(model, family: str, X_train, y_train, n_add: int):
+    """
+    Grow a fitted model by `n_add` trees / boosting iterations, keeping
+    the existing ones. Forest trees are added on the full current
+    training set; boosting continues from the existing ensemble.
+    """
+    if family in ("random_forest", "extra_trees"):
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_add)
+    elif family == "hist_gradient_boosting":
+        model.set_params(warm_start=True, max_iter=model.n_iter_ + n_add)
+    else:
+        raise ValueError(f"{family} does not support warm start")
+
+    model.fit(X_train, y_train)
+    model.set_params(warm_start=False)
+    return model
+
+
+def load_train_state():
+    try:
+        return json.loads(OUT_STATE.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def plan_incremental(state, features: dict, cache_dir: Path = None):
+    """
+    Decide whether the promoted model can be warm-started on `features`.
+    Returns (plan dict, None) or (None, reason for a full retrain).
+    """
+    if state is None or not OUT_MODEL.exists():
+        return None, "no promoted model / training state"
+    if state["family"] not in WARM_START_FAMILIES:
+        return None, f"{state['family']} does not support warm start"
+
+    previous = load_cached_features(state["catalog_version"], cache_dir)
+    if previous is None:
+        return None, f"features of catalog {state['catalog_version']} not cached"
+
+    old = previous["row_hashes"][~previous["is_test"]]
+    new = features["row_hashes"][~features["is_test"]]
+    added = int((~np.isin(new, old)).sum())
+    removed = int((~np.isin(old, new)).sum())
+    changed_fraction = (added + removed) / max(len(new), 1)
+
+    if removed:
+        return None, f"{removed} training rows changed or removed"
+    if changed_fraction > MAX_INCREMENTAL_FRACTION:
+        return None, f"{changed_fraction:.0%} of training rows changed"
+
+    units = state["units"]
+    return {
+        "added_rows": added,
+        "n_add": max(1, int(np.ceil(units * changed_fraction))),
+        "units": units,
+    }, None
+
+
+def train_incremental(features: dict):
+    """
+    Warm-start the promoted model on the grown catalog.
+    Returns (model, info), "unchanged", or None when a full retrain is
+    required.
+    """
+    state = load_train_state()
+    if state is not None and state["catalog_version"] == features["version"]:
+        print("Catalog unchanged since the last training run — nothing to do.")
+        return "unchanged"
+
+    plan, reason = plan_incremental(state, features)
+    if plan is None:
+        print(f"Incremental training not possible ({reason}); running full retrain.")
+        return None
+
+    train, test = ~features["is_test"], features["is_test"]
+    X_train, y_train = features["X"][train], features["y"][train]
+    X_test, y_test = features["X"][test], features["y"][test]
+
+    family = state["family"]
+    model = joblib.load(OUT_MODEL)
+
+    start = time.perf_counter()
+    model = warm_start_fit(model, family, X_train, y_train, plan["n_add"])
+    fit_seconds = time.perf_counter() - start
+
+    # Full retrain cost estimated from the measured cost per unit per row
+    full_estimate = state["seconds_per_unit_row"] * (plan["units"] + plan["n_add"]) * len(X_train)
+    info = {
+        "family": family,
+        "params": {**state.get("params", {}), "n_units": fit_units(model)},
+        "fit_seconds": round(fit_seconds, 4),
+        "incremental": {
+            "parent": state["version"],
+            "added_rows": plan["added_rows"],
+            "added_units": plan["n_add"],
+            "estimated_full_seconds": round(full_estimate, 4),
+            "saved_seconds": round(max(full_estimate - fit_seconds, 0.0), 4),
+        },
+        **score_candidate(family, model, X_test, y_test),
+    }
+
+    inc = info["incremental"]
+    saved_pct = inc["saved_seconds"] / full_estimate if full_estimate else 0.0
+    print(
+        f"Warm start: +{inc['added_rows']} rows, fitted {inc['added_units']}/{fit_units(model)} units "
+        f"in {fit_seconds:.2f}s (full retrain ≈ {full_estimate:.2f}s, saved {saved_pct:.0%})"
+    )
+    return model, info
+
+
+# ---------- PROMOTION ----------
+def promote(model, family: str, metrics: dict, state: dict = None, raw_scaler_path: Path = SCALER_PATH) -> None:
+    """
+    Make a candidate the serving model (canonical asset paths).
+    `state` (catalog version, cost per unit) enables later warm starts.
+    """
+    joblib.dump(model, OUT_MODEL)
+    with open(OUT_METRICS, "w") as f:
+        json.dump(metrics, f, indent=2)
+    if state is not None:
+        OUT_STATE.write_text(json.dumps(state, indent=2))
+
+    print(f"Saved satisfaction model to: {OUT_MODEL}")
+    print(f"Saved metrics to: {OUT_METRICS}")
+
+    # ---------- Export flattened forest ----------
+    if family in _TREE_FAMILIES:
+        FlatForest.from_model(model).save(OUT_FLAT_MODEL)
+        print(f"Saved flattened forest to: {OUT_FLAT_MODEL}")
+    else:
+        OUT_FLAT_MODEL.unlink(missing_ok=True)
+
+    # ---------- Precompute catalog scores ----------
+    # Serving is a top-k lookup on this column (see satisfaction_engine)
+    if RAW_PATH.exists() and raw_scaler_path.exists():
+        from ai_engine.recommender.satisfaction_engine import attach_satisfaction_scores
+
+        raw_df = attach_satisfaction_scores(
+            joblib.load(RAW_PATH), model=model, scaler=joblib.load(raw_scaler_path),
+            version=metrics.get("version"),
+        )
+        joblib.dump(raw_df, RAW_PATH)
+        print(f"Saved satisfaction scores to: {RAW_PATH}")
+
+
+def train_state(version: str, catalog_version: str, family: str, model, info: dict, n_train: int) -> dict:
+    units = fit_units(model)
+    fitted_units = info.get("incremental", {}).get("added_units", units)
+    return {
+        "version": version,
+        "catalog_version": catalog_version,
+        "family": family,
+        "params": info["params"],
+        "units": units,
+        "seconds_per_unit_row": info["fit_seconds"] / max(fitted_units * n_train, 1),
+    }
+
+
+# ---------- MAIN ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and register satisfaction models")
+    parser.add_argument("--latency-budget-ms", type=float, default=None,
+                        help="max single-row prediction latency of the promoted model")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--no-promote", action="store_true", help="register only")
+    parser.add_argument("--incremental", action="store_true",
+                        help="warm-start the promoted model on new catalog rows")
+    args = parser.parse_args(argv)
+
+    df, is_processed = load_training_frame()
+    features = cached_features(df, is_processed, unscaled=unscaled_rows(df, is_processed))
+    X, y = features["X"], features["y"]
+    if features["cached"]:
+        print(f"Reusing cached features for catalog {features['version']}")
+
+    # ---------- Split ----------
+    # Stable per-model split, so train/test stay fixed as the catalog grows
+    train, test = ~features["is_test"], features["is_test"]
+    X_train, X_test, y_train, y_test = X[train], X[test], y[train], y[test]
+
+    registry = ModelRegistry()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    extra = {
+        "created_at": stamp,
+        "catalog_version": features["version"],
+        "train_size": int(X_train.shape[0]),
+        "test_size": int(X_test.shape[0]),
+    }
+
+    # ---------- Incremental ----------
+    if args.incremental:
+        result = train_incremental(features)
+        if result == "unchanged":
+            return
+        if result is not None:
+            model, info = result
+            version = f"{stamp}-inc-{info['family']}"
+            flat = FlatForest.from_model(model) if info["family"] in _TREE_FAMILIES else None
+            registry.register(version, model, {**info, **extra}, flat_model=flat)
+            if args.no_promote:
+                return
+
+            registry.set_active(version)
+            metrics = {**info["metrics"], **extra, "version": version, "family": info["family"],
+                       "latency_ms": info["latency_ms"], "incremental": info["incremental"]}
+            promote(model, info["family"], metrics,
+                    state=train_state(version, features["version"], info["family"], model, info, len(X_train)))
+            return
+
+    # ---------- Search ----------
+    print(f"Evaluating {len(SEARCH_SPACE)} candidates (satisfaction predictor)...")
+    results = run_search(X_train, y_train, X_test, y_test, space=SEARCH_SPACE, max_workers=args.workers)
+
+    versions = []
+    for i, (model, info) in enumerate(results):
+        version = f"{stamp}-{i:02d}-{info['family']}"
+        flat = FlatForest.from_model(model) if info["family"] in _TREE_FAMILIES else None
+        registry.register(version, model, {**info, **extra}, flat_model=flat)
+        versions.append(version)
+        print(
+            f"   • {version}: mae={info['metrics']['mae']:.4f} "
+            f"fit={info['fit_seconds']:.2f}s latency={info['latency_ms']:.3f}ms"
+        )
+
+    # ---------- Select ----------
+    best = registry.select_best(max_latency_ms=args.latency_budget_ms, versions=versions)
+    print(f"Best under budget: {best['version']}")
+
+    if args.no_promote:
+        return
+
+    model = joblib.load(registry.root / best["path"])
+
+    # Cross-validated MAE (optional quick check)
+    try:
+        cv_scores = cross_val_score(
+            make_estimator(best["family"], best["params"]), X, y,
+            cv=5, scoring="neg_mean_absolute_error", n_jobs=-1,
+        )
+        cv_mae = -float(np.mean(cv_scores))
+    except Exception as e:
+        cv_mae = None
+        print("CV scoring skipped:", e)
+
+    metrics = {
+        **best["metrics"],
+        "cv_mae": float(cv_mae) if cv_mae is not None else None,
+        "train_size": best["train_size"],
+        "test_size": best["test_size"],
+        "version": best["version"],
+        "family": best["family"],
+        "latency_ms": best["latency_ms"],
+    }
+    print("Evaluation metrics:", metrics)
+
+    registry.set_active(best["version"])
+    promote(model, best["family"], metrics,
+            state=train_state(best["version"], features["version"], best["family"], model, best, len(X_train)))
 
-# ---------- Save model ----------
-joblib.dump(model, OUT_MODEL)
-with open(OUT_METRICS, "w") as f:
-    json.dump(metrics, f, indent=2)
 
-print(f"Saved satisfaction model to: {OUT_MODEL}")
-print(f"Saved metrics to: {OUT_METRICS}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+tree_ensemble.py
+================
+Flattened tree-ensemble predictor (no sklearn at inference).
+
+A fitted forest (RandomForestRegressor / ExtraTreesRegressor / single
+DecisionTreeRegressor) is exported into a handful of NumPy arrays:
+
+- feature, threshold : split test per node
+- left, right        : child node ids (global across trees)
+- value              : leaf prediction per node
+- roots              : root node id per tree
+
+Leaves point to themselves with an always-true test, so a batch is
+evaluated for ALL trees at once by `max_depth` vectorized steps.
+Predictions are bit-identical to sklearn (float32 inputs, sequential
+accumulation over trees).
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+_LEAF = -1  # sklearn TREE_LEAF
+
+
+def flatten_forest(model) -> dict:
+    """
+    Export a fitted sklearn tree regressor / forest into flat arrays.
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        estimators = [model]
+    trees = [est.tree_ for est in estimators]
+
+    if any(t.n_outputs != 1 for t in trees):
+        raise ValueError("Only single-output regressors can be flattened")
+
+    n_nodes = sum(t.node_count for t in trees)
+    feature = np.empty(n_nodes, dtype=np.int32)
+    threshold = np.empty(n_nodes, dtype=np.float64)
+    left = np.empty(n_nodes, dtype=np.int32)
+    right = np.empty(n_nodes, dtype=np.int32)
+    value = np.empty(n_nodes, dtype=np.float64)
+    roots = np.empty(len(trees), dtype=np.int32)
+
+    offset = 0
+    for i, t in enumerate(trees):
+        sl = slice(offset, offset + t.node_count)
+        ids = np.arange(offset, offset + t.node_count, dtype=np.int32)
+        is_leaf = t.children_left == _LEAF
+
+        feature[sl] = np.where(is_leaf, 0, t.feature)
+        threshold[sl] = np.where(is_leaf, np.inf, t.threshold)
+        left[sl] = np.where(is_leaf, ids, t.children_left + offset)
+        right[sl] = np.where(is_leaf, ids, t.children_right + offset)
+        value[sl] = t.value[:, 0, 0]
+        roots[i] = offset
+
+        offset += t.node_count
+
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "left": left,
+        "right": right,
+        "value": value,
+        "roots": roots,
+        "max_depth": np.int32(max(t.max_depth for t in trees)),
+        "n_features": np.int32(trees[0].n_features),
+    }
+
+
+class FlatForest:
+    """
+    Vectorized predictor over flatten_forest() arrays.
+    Drop-in for `model.predict(X)`.
+    """
+
+    def __init__(self, arrays: dict):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_features_in_ = int(arrays["n_features"])
+
+        # [left, right] interleaved: next node = children[2 * node + go_right]
+        self._children = np.stack([self.left, self.right], axis=1).ravel()
+
+    @classmethod
+    def from_model(cls, model) -> "FlatForest":
+        return cls(flatten_forest(model))
+
+    @classmethod
+    def load(cls, path) -> "FlatForest":
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def save(self, path) -> None:
+        np.savez_compressed(
+            Path(path),
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            max_depth=np.int32(self.max_depth),
+            n_features=np.int32(self.n_features_in_),
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = np.arange(n_samples, dtype=np.int64) * n_features
+
+        # (trees, samples): each row only touches one tree's nodes -> cache friendly
+        nodes = np.repeat(self.roots[:, None], n_samples, axis=1)
+
+        for _ in range(self.max_depth):
+            x = np.take(X_flat, row_offsets + np.take(self.feature, nodes))
+            go_right = x > np.take(self.threshold, nodes)
+            nodes = np.take(self._children, 2 * nodes + go_right)
+
+        leaf_values = np.take(self.value, nodes)
+
+        # Same accumulation order as sklearn (tree by tree) -> exact parity
+        out = np.zeros(n_samples, dtype=np.float64)
+        for t in range(self.n_trees):
+            out += leaf_values[t]
+        out /= self.n_trees
+        return out
+
+    def predict(self, X, chunk_size: int = 4096) -> np.ndarray:
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected X of shape (n, {self.n_features_in_}), got {X.shape}")
+
+        if len(X) <= chunk_size:
+            return self._predict_chunk(X)
+        return np.concatenate([
+            self._predict_chunk(X[i:i + chunk_size])
+            for i in range(0, len(X), chunk_size)
+        ])
@@ -1,15 +1,21 @@
 """
 Sentence-transformer based semantic encoder
 """
-from sentence_transformers import SentenceTransformer
+import threading
+
 
 class NLQueryEncoder:
     _model = None
+    _lock = threading.Lock()
 
     @classmethod
     def load(cls):
+        # Double-checked so concurrent first requests load the model once
         if cls._model is None:
-            cls._model = SentenceTransformer("all-MiniLM-L6-v2")
+            with cls._lock:
+                if cls._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    cls._model = SentenceTransformer("all-MiniLM-L6-v2")
         return cls._model
 
     @classmethod
@@ -0,0 +1,98 @@
+"""
+Aho-Corasick multi-pattern matcher over lowercase text.
+
+Built once from {label: [phrases]}; find() reports every phrase
+occurrence in a single left-to-right pass, keeps whole-word matches only
+and resolves overlaps leftmost-longest ("low light" wins over "light").
+"""
+from collections import deque
+import re
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_CLAUSE_RE = re.compile(r"[,.;:!?]|\b(?:but|and|or)\b")
+
+NEGATORS = {
+    "not", "no", "without", "never", "dont", "don't", "doesnt", "doesn't",
+    "isnt", "isn't", "nothing", "hate", "avoid",
+}
+NEGATION_WINDOW = 3  # words before a match that can negate it
+
+
+class KeywordAutomaton:
+    def __init__(self, keyword_map: dict):
+        # node = index; goto[node] = {char: node}; out[node] = [(label, phrase)]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for label, phrases in keyword_map.items():
+            for phrase in phrases:
+                self._add(phrase.lower(), label)
+        self._build_fail_links()
+
+    def _add(self, phrase: str, label: str):
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((label, phrase))
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @staticmethod
+    def _is_boundary(text: str, i: int) -> bool:
+        return i < 0 or i >= len(text) or not text[i].isalnum()
+
+    def find(self, text: str) -> list:
+        """
+        Non-overlapping whole-word matches as (start, end, label, phrase),
+        in text order.
+        """
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+
+        found = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for label, phrase in out[node]:
+                start = i - len(phrase) + 1
+                if self._is_boundary(text, start - 1) and self._is_boundary(text, i + 1):
+                    found.append((start, i + 1, label, phrase))
+
+        # Leftmost-longest, non-overlapping
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        matches, last_end = [], -1
+        for m in found:
+            if m[0] >= last_end:
+                matches.append(m)
+                last_end = m[1]
+        return matches
+
+    @staticmethod
+    def is_negated(text: str, start: int, window: int = NEGATION_WINDOW) -> bool:
+        """
+        True when one of the `window` words before `start` (within the
+        same clause) is a negator.
+        """
+        clause = _CLAUSE_RE.split(text[:start].lower())[-1]
+        before = _WORD_RE.findall(clause)[-window:]
+        return any(w in NEGATORS or w.endswith("n't") for w in before)
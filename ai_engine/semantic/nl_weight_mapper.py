@@ -1,39 +1,79 @@
 """
 Maps natural language intent to feature weights
+
+Keywords are matched in one pass (KeywordAutomaton, whole words only).
+A negated mention ("not for gaming", "don't care about camera") lowers
+the feature instead of boosting it; keywords naming an UNWANTED property
+("heavy", "expensive") flip that: "not heavy" boosts weight.
 """
+from .keyword_automaton import KeywordAutomaton
 
 KEYWORD_MAP = {
-    "camera": ["camera", "photo", "video", "low light"],
-    "battery": ["battery", "long lasting", "all day"],
-    "performance": ["fast", "gaming", "performance"],
-    "price": ["cheap", "budget", "affordable"],
-    "weight": ["light", "compact"],
-    "display_size": ["big screen", "small screen"]
+    "camera": ["camera", "photo", "photos", "photography", "video", "selfie", "low light"],
+    "battery": ["battery", "long lasting", "all day", "battery life"],
+    "performance": ["fast", "gaming", "performance", "smooth", "multitasking", "slow", "laggy"],
+    "price": ["cheap", "budget", "affordable", "expensive", "pricey"],
+    "weight": ["light", "lightweight", "compact", "heavy", "bulky"],
+    "display_size": ["big screen", "small screen", "large screen", "big display", "small display"]
+}
+
+# Keywords that name what the user does NOT want (polarity -1)
+UNWANTED_KEYWORDS = {"slow", "laggy", "expensive", "pricey", "heavy", "bulky"}
+
+# Intent -> weight added to each feature when the intent is requested
+INTENT_ADJUSTMENTS = {
+    "camera": {"cam_resolution": 0.25},
+    "battery": {"battery": 0.25},
+    "performance": {"ram": 0.15, "release_year": 0.10},
+    "price": {"price": 0.25},
+    "weight": {"weight": 0.25},
+    "display_size": {"display_size": 0.25},
+}
+
+BASE_WEIGHTS = {
+    "price": 0.15,
+    "cam_resolution": 0.15,
+    "battery": 0.15,
+    "ram": 0.15,
+    "display_size": 0.15,
+    "weight": 0.10,
+    "release_year": 0.15,
 }
 
+DEEMPHASIZE_FACTOR = 0.5
+
+MATCHER = KeywordAutomaton(KEYWORD_MAP)
+
+
+def detect_intents(nl_query: str) -> dict:
+    """
+    intent -> +1 (wanted) / -1 (explicitly not important).
+    The first mention of an intent wins.
+    """
+    intents = {}
+    for start, _, intent, phrase in MATCHER.find(nl_query):
+        if intent in intents:
+            continue
+        polarity = -1 if phrase in UNWANTED_KEYWORDS else 1
+        if MATCHER.is_negated(nl_query, start):
+            polarity = -polarity
+        intents[intent] = polarity
+    return intents
+
+
 def infer_weights(nl_query: str):
-    weights = {
-        "price": 0.15,
-        "cam_resolution": 0.15,
-        "battery": 0.15,
-        "ram": 0.15,
-        "display_size": 0.15,
-        "weight": 0.10,
-        "release_year": 0.15,
-    }
-
-    text = nl_query.lower()
-
-    for feature, keywords in KEYWORD_MAP.items():
-        if any(k in text for k in keywords):
+    weights = dict(BASE_WEIGHTS)
+
+    for intent, polarity in detect_intents(nl_query).items():
+        adjustments = INTENT_ADJUSTMENTS[intent]
+        if polarity > 0:
             for f in weights:
                 weights[f] *= 0.85
-            if feature == "camera":
-                weights["cam_resolution"] += 0.25
-            elif feature == "battery":
-                weights["battery"] += 0.25
-            elif feature == "price":
-                weights["price"] += 0.25
+            for f, boost in adjustments.items():
+                weights[f] += boost
+        else:
+            for f in adjustments:
+                weights[f] *= DEEMPHASIZE_FACTOR
 
     total = sum(weights.values())
     return {k: v / total for k, v in weights.items()}
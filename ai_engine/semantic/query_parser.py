@@ -0,0 +1,261 @@
+"""
+Rule-based NL query -> hard constraints
+
+    "Samsung or Xiaomi under $500 with at least 8GB RAM and 5G"
+      -> brand "", price 500, ram 8, ...   (normalize_user_input shape)
+         constraints: {"brand": {"in": ["samsung", "xiaomi"]},
+                       "price": {"max": 500.0}, "ram": {"min": 8.0},
+                       "5G": {"eq": 1}}
+
+Constraints are applied as cheap vectorized filters (apply_constraints)
+BEFORE any embedding work, shrinking the candidate pool.
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from .keyword_automaton import KeywordAutomaton
+
+# -------------------------
+# VOCABULARY
+# -------------------------
+BRAND_ALIASES = {
+    "iphone": "apple",
+    "galaxy": "samsung",
+    "pixel": "google",
+    "redmi": "xiaomi",
+    "mi": "xiaomi",
+}
+
+MAX_WORDS = (
+    "under", "below", "less than", "at most", "up to", "upto", "max", "maximum",
+    "no more than", "cheaper than", "lighter than", "smaller than", "within", "<", "<=",
+)
+MIN_WORDS = (
+    "at least", "over", "above", "more than", "min", "minimum", "from", "starting",
+    "newer than", "after", "bigger than", "larger than", ">", ">=",
+)
+
+_NUM = r"\d+(?:,\d{3})*(?:\.\d+)?"
+_UNIT = r"tb|gb|mah|mp|inches|inch|in\b|\"|grams|gram|kg|g\b|usd|dollars|bucks|\$"
+QUANTITY_RE = re.compile(
+    r"(?P<cur>\$|usd\s*)?(?P<num>" + _NUM + r")\s*(?P<k>k\b)?\s*(?P<unit>" + _UNIT + r")?(?P<plus>\+)?",
+    re.I,
+)
+_BOUND = r"\$?\s*" + _NUM + r"\s*(?:k\b)?\s*(?:" + _UNIT + r")?"
+BETWEEN_RE = re.compile(
+    r"between\s+(?P<lo>" + _BOUND + r")\s*(?:\band\b|\bto\b|-)\s*(?P<hi>" + _BOUND + r")"
+    r"|(?P<lo2>\$\s*" + _NUM + r"\s*(?:k\b)?)\s*(?:-|\bto\b)\s*(?P<hi2>" + _BOUND + r")",
+    re.I,
+)
+_COMPARATOR_RE = re.compile(
+    r"(" + "|".join(re.escape(w) for w in sorted(MAX_WORDS + MIN_WORDS, key=len, reverse=True)) + r")\s*$"
+)
+_CLAUSE_RE = re.compile(r"[,.;:!?]|\b(?:and|with|but)\b")
+_PRICE_CONTEXT_RE = re.compile(r"\b(budget|price|cost|costs|priced|spend|\$|usd|dollars?)\b")
+
+FIVE_G_RE = re.compile(r"\b5g\b", re.I)
+
+# "tb" is storage only (no storage constraint); "gb" is RAM unless
+# followed by storage / rom / internal, or too large to be RAM
+# ("iphone 15 128gb" is a storage variant)
+RAM_MAX_GB = 24
+UNIT_FIELDS = {
+    "tb": None, "gb": "ram",
+    "mah": "battery",
+    "mp": "cam_resolution",
+    "inches": "display_size", "inch": "display_size", "in": "display_size", '"': "display_size",
+    "grams": "weight", "gram": "weight", "g": "weight", "kg": "weight",
+    "usd": "price", "dollars": "price", "bucks": "price", "$": "price",
+}
+
+# Operator when the query gives no comparator ("8GB RAM" = at least 8GB)
+DEFAULT_OPS = {
+    "price": "max",
+    "ram": "min",
+    "battery": "min",
+    "cam_resolution": "min",
+    "release_year": None,  # a bare year ("phone 2024") is a hint, not a filter
+    "display_size": None,  # preference only
+    "weight": None,
+}
+
+NUMERIC_FIELDS = ["price", "cam_resolution", "battery", "ram", "display_size", "weight", "release_year"]
+
+
+def empty_query() -> dict:
+    """
+    Same shape as views.normalize_user_input, plus `constraints`.
+    """
+    return {
+        "brand": "",
+        **{f: 0.0 for f in NUMERIC_FIELDS},
+        "release_year": 0,
+        "performance_profile": "balanced",
+        "constraints": {},
+    }
+
+
+# -------------------------
+# PARSING
+# -------------------------
+def _comparator(text: str, start: int):
+    clause = _CLAUSE_RE.split(text[:start])[-1]
+    m = _COMPARATOR_RE.search(clause.rstrip())
+    if not m:
+        return None
+    return "max" if m.group(1) in MAX_WORDS else "min"
+
+
+def _value(num: str, k: bool, unit: str) -> float:
+    value = float(num.replace(",", "")) * (1000 if k else 1)
+    if unit == "tb":
+        value *= 1024
+    elif unit == "kg":
+        value *= 1000
+    return value
+
+
+def _field(m, text: str):
+    unit = (m.group("unit") or "").lower().strip()
+    if m.group("cur"):
+        unit = "$"
+    if unit:
+        if unit in ("gb", "tb") and re.match(r"\s*(storage|rom|internal)", text[m.end():]):
+            return None
+        if unit == "gb" and _value(m.group("num"), m.group("k"), unit) > RAM_MAX_GB:
+            return None
+        return UNIT_FIELDS[unit]
+
+    value = float(m.group("num").replace(",", ""))
+    if 2000 <= value <= 2100 and "." not in m.group("num"):
+        return "release_year"
+
+    clause = _CLAUSE_RE.split(text[:m.start()])[-1]
+    if _comparator(text, m.start()) or _PRICE_CONTEXT_RE.search(clause + text[m.end():m.end() + 12]):
+        return "price"
+    return None
+
+
+def _set(result: dict, field: str, op, value: float):
+    result[field] = int(value) if field == "release_year" else value
+    if op is not None:
+        result["constraints"].setdefault(field, {})[op] = value
+
+
+@lru_cache(maxsize=8)
+def _brand_matcher(brands: tuple) -> KeywordAutomaton:
+    """
+    One automaton per brand vocabulary (the catalog's brands rarely change).
+    """
+    vocab = {b: [b] for b in brands}
+    for alias, brand in BRAND_ALIASES.items():
+        if brand in vocab:
+            vocab[brand].append(alias)
+    return KeywordAutomaton(vocab)
+
+
+def _parse_brands(text: str, brands) -> dict:
+    matcher = _brand_matcher(tuple(str(b).lower() for b in brands))
+
+    wanted, excluded = [], []
+    for start, _, brand, _ in matcher.find(text):
+        target = excluded if matcher.is_negated(text, start) else wanted
+        if brand not in target:
+            target.append(brand)
+
+    out = {}
+    if wanted:
+        out["in"] = wanted
+    if excluded:
+        out["not_in"] = excluded
+    return out
+
+
+def parse_query(nl_query: str, brands=()) -> dict:
+    """
+    Extract hard constraints from an NL query. `brands` is the catalog's
+    brand vocabulary (e.g. raw_df["brand"].unique()).
+    """
+    result = empty_query()
+    text = (nl_query or "").lower()
+    if not text.strip():
+        return result
+
+    # Ranges first ("between $300 and $600"), then mask them out
+    for m in BETWEEN_RE.finditer(text):
+        lo = QUANTITY_RE.search(m.group("lo") or m.group("lo2"))
+        hi = QUANTITY_RE.search(m.group("hi") or m.group("hi2"))
+        span = m.group(0)
+        field = _field(hi, span) or _field(lo, span)
+        if field is None:
+            if hi.group("unit") or lo.group("unit"):
+                continue  # storage range: not a constraint
+            field = "price"
+        for op, q in (("min", lo), ("max", hi)):
+            _set(result, field, op, _value(q.group("num"), q.group("k"), (q.group("unit") or "").lower()))
+    blank = lambda m: " " * len(m.group(0))
+    masked = FIVE_G_RE.sub(blank, BETWEEN_RE.sub(blank, text))
+
+    for m in QUANTITY_RE.finditer(masked):
+        field = _field(m, masked)
+        if field is None:
+            continue
+        unit = (m.group("unit") or "").lower().strip()
+        value = _value(m.group("num"), m.group("k"), unit)
+        op = "min" if m.group("plus") else _comparator(masked, m.start()) or DEFAULT_OPS[field]
+        _set(result, field, op, value)
+
+    five_g = FIVE_G_RE.search(text)
+    if five_g and not KeywordAutomaton.is_negated(text, five_g.start()):
+        result["constraints"]["5G"] = {"eq": 1}
+
+    brand_constraint = _parse_brands(text, brands)
+    if brand_constraint:
+        result["constraints"]["brand"] = brand_constraint
+        if len(brand_constraint.get("in", [])) == 1:
+            result["brand"] = brand_constraint["in"][0]
+
+    return result
+
+
+# -------------------------
+# FILTERING
+# -------------------------
+def constraint_mask(df, constraints: dict) -> np.ndarray:
+    """
+    Boolean row mask for `constraints` (columns missing from df are
+    ignored).
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for field, ops in constraints.items():
+        if field not in df.columns:
+            continue
+        if field == "brand":
+            col = df["brand"].astype(str).str.lower().to_numpy()
+            if "in" in ops:
+                mask &= np.isin(col, ops["in"])
+            if "not_in" in ops:
+                mask &= ~np.isin(col, ops["not_in"])
+            continue
+
+        col = df[field].to_numpy(dtype=float)
+        if "min" in ops:
+            mask &= col >= ops["min"]
+        if "max" in ops:
+            mask &= col <= ops["max"]
+        if "eq" in ops:
+            mask &= col == ops["eq"]
+    return mask
+
+
+def apply_constraints(df, constraints: dict, fallback: bool = True):
+    """
+    Filter df by constraints. With `fallback`, an over-constrained query
+    returns df unchanged rather than nothing.
+    """
+    if not constraints:
+        return df
+    filtered = df[constraint_mask(df, constraints)]
+    return df if (fallback and filtered.empty) else filtered
@@ -1,25 +1,78 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
 from .embedding_model import NLQueryEncoder
+from ai_engine.telemetry.spans import span
+
+
+def semantic_texts(df) -> list:
+    return (
+        df["brand"].astype(str) + " " +
+        df["model"].astype(str) + " " +
+        df["cam_resolution"].astype(str) + "MP camera " +
+        df["battery"].astype(str) + "mAh battery"
+    ).tolist()
+
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=-1, keepdims=True)
+    return X / np.where(norms > 0, norms, 1.0)
+
 
 class SemanticSmartphoneRecommender:
-    def __init__(self, df):
+    """
+    Query -> catalog cosine ranking over a fixed embedding matrix.
+
+    - Shared across threads: every attribute is read-only after __init__
+      (the embedding matrix is flagged non-writeable), recommend() keeps
+      all per-request state in locals
+    - rank() returns catalog row positions + scores; recommend() builds a
+      new frame from them and never writes to self.df
+    """
+
+    def __init__(self, df, embeddings=None, encoder=None):
         self.df = df.copy()
-        self.df["semantic_text"] = (
-            df["brand"] + " " +
-            df["model"] + " " +
-            df["cam_resolution"].astype(str) + "MP camera " +
-            df["battery"].astype(str) + "mAh battery"
-        )
-        self.embeddings = self._build_embeddings()
+        self._encode = encoder or NLQueryEncoder.encode
+
+        if embeddings is None:
+            embeddings = NLQueryEncoder.load().encode(semantic_texts(self.df))
+        if len(embeddings) != len(self.df):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(self.df)} catalog rows")
+
+        # Unit rows: cosine similarity is a single mat-vec
+        self.embeddings = np.ascontiguousarray(_normalize(embeddings))
+        self.embeddings.setflags(write=False)
 
-    def _build_embeddings(self):
-        encoder = NLQueryEncoder.load()
-        return encoder.encode(self.df["semantic_text"].tolist())
+    def scores(self, nl_query, rows=None):
+        """
+        Cosine similarity of the query to every catalog row, or only to
+        the given row positions.
+        """
+        with span("semantic.encode_query"):
+            query_vec = _normalize(self._encode(nl_query))
+        with span("semantic.score"):
+            E = self.embeddings if rows is None else self.embeddings[rows]
+            return E @ query_vec
+
+    def rank(self, nl_query, top_n=3):
+        """
+        (row positions, scores) of the top_n matches, best first.
+        Equal scores within the result keep catalog order.
+        """
+        sims = self.scores(nl_query)
+
+        n = len(sims)
+        top_n = max(0, min(int(top_n), n))
+        if top_n < n:
+            candidates = np.argpartition(-sims, top_n - 1)[:top_n] if top_n else np.empty(0, dtype=np.intp)
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.lexsort((candidates, -sims[candidates]))]
+        return order, sims[order]
 
     def recommend(self, nl_query, top_n=3):
-        query_vec = NLQueryEncoder.encode(nl_query)
-        sims = cosine_similarity([query_vec], self.embeddings)[0]
-        self.df["match_score"] = sims
-        self.df["feature_scores"] = [{} for _ in range(len(self.df))]
-        return self.df.sort_values("match_score", ascending=False).head(top_n)
+        rows, scores = self.rank(nl_query, top_n)
+        return self.df.iloc[rows].assign(
+            match_score=scores.astype(float),
+            feature_scores=[{} for _ in range(len(rows))],
+        )
@@ -0,0 +1,253 @@
+"""
+telemetry.profiler
+
+Opt-in sampling profiler for production requests.
+NO Django imports.
+
+- One daemon thread samples the stacks of the threads currently being
+  tracked (sys._current_frames) every `interval` seconds; it sleeps when
+  nothing is tracked, so idle overhead is zero
+- A request is tracked when it is drawn by `sample_rate`, or always when
+  a latency threshold is set (then kept only if it turns out slow)
+- Kept profiles (collapsed stacks + normalized input + stage spans) go to
+  a bounded on-disk ring: the oldest files are evicted past `max_profiles`
+- aggregate() / write_collapsed() merge profiles into the collapsed-stack
+  format read by flamegraph.pl, speedscope and inferno
+
+No external profiler dependency (stdlib only).
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_INTERVAL = 0.005  # 200 Hz
+DEFAULT_MAX_PROFILES = 200
+MAX_STACK_DEPTH = 128
+
+
+# -----------------------------
+# STACK SAMPLING
+# -----------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or Path(code.co_filename).stem
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame, depth: int = MAX_STACK_DEPTH) -> str:
+    """
+    "root;caller;...;leaf" for a frame (collapsed-stack notation).
+    """
+    labels = []
+    while frame is not None and len(labels) < depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Shared sampler thread; track()/untrack() a thread id to collect
+    {collapsed stack: samples} for it.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._tracked = {}  # thread id -> Counter
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._tracked:
+                    self._wakeup.clear()
+                    continue
+                # Under the lock: untrack() never sees a counter mid-update
+                for tid, samples in self._tracked.items():
+                    frame = frames.get(tid)
+                    if frame is not None:
+                        samples[collapse_stack(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def track(self, thread_id: int = None) -> int:
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            self._tracked[thread_id] = Counter()
+            self._ensure_thread()
+        self._wakeup.set()
+        return thread_id
+
+    def untrack(self, thread_id: int) -> Counter:
+        with self._lock:
+            return self._tracked.pop(thread_id, Counter())
+
+
+# -----------------------------
+# ON-DISK RING
+# -----------------------------
+class ProfileRing:
+    """
+    Directory of at most `max_profiles` JSON profiles (oldest evicted).
+    File names sort by creation time, across processes.
+    """
+
+    def __init__(self, root, max_profiles: int = DEFAULT_MAX_PROFILES):
+        self.root = Path(root)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def paths(self) -> list:
+        if not self.root.exists():
+            return []
+        return sorted(self.root.glob("profile-*.json"))
+
+    def write(self, profile: dict) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"profile-{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}.json"
+
+        fd, tmp_name = tempfile.mkstemp(prefix=".profile.", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            json.dump(profile, f, default=str)
+        os.replace(tmp_name, path)
+
+        self.evict()
+        return path
+
+    def evict(self):
+        with self._lock:
+            paths = self.paths()
+            for path in paths[:max(0, len(paths) - self.max_profiles)]:
+                path.unlink(missing_ok=True)
+
+    def load(self) -> list:
+        profiles = []
+        for path in self.paths():
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue  # evicted or half-written by another process
+        return profiles
+
+
+# -----------------------------
+# REQUEST HOOK
+# -----------------------------
+class RequestProfiler:
+    """
+    Decides which requests to profile and persists the kept ones.
+
+        with profiler.track(context=lambda: {...}) as trace:
+            response = handle(request)
+
+    `context` is only called for profiles that are kept.
+    """
+
+    def __init__(
+        self,
+        root,
+        sample_rate: float = 0.0,
+        latency_threshold_ms: float = None,
+        max_profiles: int = DEFAULT_MAX_PROFILES,
+        interval: float = DEFAULT_INTERVAL,
+        sampler: StackSampler = None,
+    ):
+        self.sample_rate = sample_rate
+        self.latency_threshold_ms = latency_threshold_ms
+        self.ring = ProfileRing(root, max_profiles)
+        self.sampler = sampler or StackSampler(interval)
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.latency_threshold_ms is not None
+
+    def _keep_reason(self, sampled: bool, latency_ms: float):
+        if sampled:
+            return "sampled"
+        if self.latency_threshold_ms is not None and latency_ms >= self.latency_threshold_ms:
+            return "slow"
+        return None
+
+    @contextmanager
+    def track(self, context=None):
+        if not self.enabled:
+            yield None
+            return
+
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.latency_threshold_ms is None:
+            yield None
+            return
+
+        thread_id = self.sampler.track()
+        start = time.perf_counter()
+        trace = {}
+        try:
+            yield trace
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            samples = self.sampler.untrack(thread_id)
+            reason = self._keep_reason(sampled, latency_ms)
+            if reason:
+                try:
+                    self.ring.write({
+                        "created": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                        "reason": reason,
+                        "latency_ms": round(latency_ms, 3),
+                        "interval_ms": self.sampler.interval * 1000,
+                        **(context() if context else {}),
+                        **trace,
+                        "samples": dict(samples),
+                    })
+                except Exception:
+                    # Profiling must never break the request
+                    logger.exception("Failed to save request profile")
+
+
+# -----------------------------
+# AGGREGATION
+# -----------------------------
+def aggregate(profiles, mode: str = None, min_latency_ms: float = None) -> Counter:
+    """
+    Sum collapsed-stack samples over profiles (optionally one engine mode
+    or only profiles at least `min_latency_ms` slow).
+    """
+    total = Counter()
+    for profile in profiles:
+        if mode and profile.get("mode") != mode:
+            continue
+        if min_latency_ms is not None and profile.get("latency_ms", 0) < min_latency_ms:
+            continue
+        total.update(profile.get("samples", {}))
+    return total
+
+
+def write_collapsed(stacks: Counter, out) -> int:
+    """
+    "frame;frame;frame count" lines, heaviest first. Returns line count.
+    """
+    for stack, count in stacks.most_common():
+        out.write(f"{stack} {count}\n")
+    return len(stacks)
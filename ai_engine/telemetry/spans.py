@@ -0,0 +1,231 @@
+"""
+telemetry.spans
+
+Lightweight per-stage latency instrumentation.
+NO Django imports.
+
+- span("stage") context manager / @timed("stage") decorator
+- Every finished span feeds an in-process histogram for its stage
+  (Prometheus-style cumulative buckets); spans that raise also bump a
+  per-stage error counter, so a "Safe recommendation failure" can be
+  traced to the stage that failed
+- collect_spans() records the spans of one request (contextvar, so
+  threads / async tasks never mix), e.g. for a Server-Timing header
+- render_prometheus() exposes everything in Prometheus text format
+
+Histograms are per process: with several workers, each one reports its
+own series (scrape every worker, or aggregate in Prometheus).
+"""
+
+import bisect
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Upper bounds in seconds (+Inf is implicit)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+METRIC_PREFIX = "recommend"
+
+
+# -----------------------------
+# HISTOGRAMS
+# -----------------------------
+class Histogram:
+    """
+    Cumulative-bucket latency histogram (seconds), thread-safe.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last = +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return {"buckets": cumulative, "sum": total, "count": running}
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bucket bound holding the q-quantile (coarse; for logs and
+        tests, Prometheus computes its own).
+        """
+        snap = self.snapshot()
+        if not snap["count"]:
+            return 0.0
+        rank = q * snap["count"]
+        for bound, cum in zip(self.buckets + (float("inf"),), snap["buckets"]):
+            if cum >= rank:
+                return bound
+        return float("inf")
+
+
+class StageMetrics:
+    """
+    stage name -> Histogram, plus per-stage error counts.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> Histogram:
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, Histogram(self.buckets))
+        return hist
+
+    def observe(self, stage: str, seconds: float):
+        self.histogram(stage).observe(seconds)
+
+    def error(self, stage: str):
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def stages(self) -> dict:
+        with self._lock:
+            return dict(self._histograms)
+
+    def errors(self) -> dict:
+        with self._lock:
+            return dict(self._errors)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+
+METRICS = StageMetrics()
+
+# Spans of the current request (None when not collecting)
+_request_spans = ContextVar("request_spans", default=None)
+
+
+# -----------------------------
+# SPANS
+# -----------------------------
+@contextmanager
+def span(stage: str, metrics: StageMetrics = None):
+    """
+    Time the enclosed block as `stage`.
+    """
+    metrics = metrics or METRICS
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        metrics.error(stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe(stage, elapsed)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def timed(stage: str):
+    """
+    Decorator form of span().
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect_spans():
+    """
+    Collect (stage, seconds) for every span finished inside the block.
+    """
+    spans = []
+    token = _request_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _request_spans.reset(token)
+
+
+# -----------------------------
+# EXPORT
+# -----------------------------
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+def server_timing(spans) -> str:
+    """
+    Server-Timing header value; repeated stages (e.g. one explain per
+    result) are summed.
+    """
+    totals = {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(
+        f"{_TOKEN_RE.sub('_', stage)};dur={seconds * 1000:.2f}"
+        for stage, seconds in totals.items()
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus(metrics: StageMetrics = None, prefix: str = METRIC_PREFIX) -> str:
+    """
+    Prometheus text exposition format (version 0.0.4).
+    """
+    metrics = metrics or METRICS
+    name = f"{prefix}_stage_seconds"
+    lines = [
+        f"# HELP {name} Latency of each recommendation pipeline stage.",
+        f"# TYPE {name} histogram",
+    ]
+    for stage, hist in sorted(metrics.stages().items()):
+        snap = hist.snapshot()
+        label = f'stage="{_escape(stage)}"'
+        for bound, cum in zip(hist.buckets + (float("inf"),), snap["buckets"]):
+            lines.append(f'{name}_bucket{{{label},le="{_le(bound)}"}} {cum}')
+        lines.append(f"{name}_sum{{{label}}} {snap['sum']!r}")
+        lines.append(f"{name}_count{{{label}}} {snap['count']}")
+
+    errors = f"{prefix}_stage_errors_total"
+    lines += [
+        f"# HELP {errors} Exceptions raised inside each stage.",
+        f"# TYPE {errors} counter",
+    ]
+    for stage, count in sorted(metrics.errors().items()):
+        lines.append(f'{errors}{{stage="{_escape(stage)}"}} {count}')
+
+    return "\n".join(lines) + "\n"
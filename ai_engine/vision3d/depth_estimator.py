@@ -32,10 +32,16 @@ class DepthEstimator:
     Thin wrapper around a singleton MiDaS depth model.
     """
 
-    def estimate(self, image_path):
+    def estimate(self, image_path, max_size: int = 1024, upsample: bool = False):
         """
         Estimate normalized depth map from image.
 
+        Args:
+            image_path: local image path
+            max_size: longest side the image is downscaled to
+            upsample: resize the model output (384px) back to the image
+                size, for high-detail meshes (see write_glb_tiled)
+
         Returns:
             np.ndarray of shape (H, W) normalized to [0, 1]
         """
@@ -43,7 +49,7 @@ class DepthEstimator:
         image = Image.open(image_path).convert("RGB")
 
         # Limit resolution for stability
-        image.thumbnail((1024, 1024))
+        image.thumbnail((max_size, max_size))
 
         inputs = _PROCESSOR(images=image, return_tensors="pt")
         inputs = {k: v.to(_DEVICE) for k, v in inputs.items()}
@@ -51,6 +57,14 @@ class DepthEstimator:
         with torch.no_grad():
             depth = _MODEL(**inputs).predicted_depth
 
+            if upsample:
+                depth = torch.nn.functional.interpolate(
+                    depth.unsqueeze(1),
+                    size=image.size[::-1],
+                    mode="bicubic",
+                    align_corners=False,
+                )
+
         depth = depth.squeeze().cpu().numpy()
 
         # Normalize depth map
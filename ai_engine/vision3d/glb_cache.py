@@ -0,0 +1,193 @@
+"""
+vision3d.glb_cache
+
+Content-addressed cache for generated GLB meshes.
+NO Django imports.
+
+- Blobs are keyed by source digest + pipeline version + parameters
+- manifest.json maps phone names to blob keys
+- Writes are atomic (temp file + os.replace), half-written GLBs are never served
+- Total size on disk is bounded with LRU eviction (mtime is bumped on every hit)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PIPELINE_VERSION = "depth-mesh-v2"  # v2: vertex normals in every GLB
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+
+# -----------------------------
+# KEYS
+# -----------------------------
+def model_safe_name(model_name: str) -> str:
+    return model_name.lower().replace(" ", "_")
+
+
+def file_digest(path, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(source_digest: str, params: dict = None, version: str = PIPELINE_VERSION) -> str:
+    """
+    Stable key for a (source, pipeline version, parameters) triple.
+    """
+    payload = json.dumps(
+        {"source": source_digest, "version": version, "params": params or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class GLBCache:
+    """
+    On-disk GLB store:
+
+        <root>/manifest.json        name -> key
+        <root>/objects/<key>.glb    immutable blobs
+    """
+
+    def __init__(self, root, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifest_path = self.root / "manifest.json"
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    # -------------------------
+    # BLOBS
+    # -------------------------
+    def path_for(self, key: str) -> Path:
+        return self.objects_dir / f"{key}.glb"
+
+    def get(self, key: str):
+        """
+        Return the blob path for `key` (marking it recently used) or None.
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @contextmanager
+    def writer(self, key: str):
+        """
+        Yield a temporary .glb path; publish it under `key` only if the
+        block finishes without error and the file is non-empty.
+        """
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{key}.", suffix=".tmp.glb", dir=self.objects_dir
+        )
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+
+        try:
+            yield tmp_path
+            if tmp_path.stat().st_size == 0:
+                raise RuntimeError("GLB export produced an empty file")
+            os.replace(tmp_path, self.path_for(key))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self.evict()
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        with self.writer(key) as tmp_path:
+            tmp_path.write_bytes(data)
+        return self.path_for(key)
+
+    # -------------------------
+    # MANIFEST
+    # -------------------------
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        fd, tmp_name = tempfile.mkstemp(prefix=".manifest.", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_name, self.manifest_path)
+
+    def record(self, name: str, key: str) -> None:
+        with self._lock:
+            manifest = self._read_manifest()
+            if manifest.get(name) != key:
+                manifest[name] = key
+                self._write_manifest(manifest)
+
+    def lookup(self, name: str):
+        return self._read_manifest().get(name)
+
+    def resolve(self, name: str):
+        """
+        Path of the current GLB for a phone name, or None.
+        """
+        key = self.lookup(name)
+        return self.get(key) if key else None
+
+    # -------------------------
+    # EVICTION
+    # -------------------------
+    def _blobs(self):
+        blobs = []
+        for path in self.objects_dir.glob("*.glb"):
+            if path.name.startswith("."):
+                continue  # in-flight temp file
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((st.st_mtime, st.st_size, path))
+        return blobs
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._blobs())
+
+    def evict(self) -> list:
+        """
+        Drop least-recently-used blobs until the cache fits in max_bytes.
+        Returns the evicted keys.
+        """
+        with self._lock:
+            blobs = sorted(self._blobs())
+            total = sum(size for _, size, _ in blobs)
+            evicted = []
+
+            for _, size, path in blobs:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted.append(path.stem)
+
+            if evicted:
+                gone = set(evicted)
+                manifest = self._read_manifest()
+                kept = {n: k for n, k in manifest.items() if k not in gone}
+                if len(kept) != len(manifest):
+                    self._write_manifest(kept)
+
+            return evicted
@@ -2,12 +2,76 @@
 vision3d.mesh_builder
 
 Converts a normalized depth map into a triangulated 3D mesh.
+
+Two paths, same geometry (grid vertices, winding, vertex normals):
+- depth_to_mesh: in-memory trimesh (small / medium maps)
+- write_glb_tiled: streams the mesh to a GLB strip by strip, so peak
+  memory is bounded by the strip size instead of the map resolution
 """
 
+import json
+import struct
+
 import numpy as np
 import trimesh
 
 
+# glTF constants
+_GLB_MAGIC = b"glTF"
+_CHUNK_JSON = b"JSON"
+_CHUNK_BIN = b"BIN\x00"
+_FLOAT = 5126
+_UNSIGNED_INT = 5125
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+
+def _grid_faces(w: int, row_start: int, row_stop: int) -> np.ndarray:
+    """
+    Faces (two triangles per quad) for every quad whose top row is in
+    [row_start, row_stop), using global vertex indices on a w-wide grid.
+    """
+    ys = np.arange(row_start, row_stop, dtype=np.int64)[:, None]
+    xs = np.arange(w - 1, dtype=np.int64)[None, :]
+    i = (ys * w + xs).ravel()
+
+    faces = np.empty((i.size, 2, 3), dtype=np.int64)
+    faces[:, 0] = np.stack([i, i + 1, i + w], axis=1)
+    faces[:, 1] = np.stack([i + 1, i + w + 1, i + w], axis=1)
+    return faces.reshape(-1, 3)
+
+
+def _grid_positions(depth_rows: np.ndarray, xs: np.ndarray, ys: np.ndarray, depth_scale: float) -> np.ndarray:
+    """
+    (rows, w, 3) vertex positions of a block of depth rows; ys are the
+    block's own row coordinates.
+    """
+    block = np.empty(depth_rows.shape + (3,))
+    block[..., 0] = xs[None, :]
+    block[..., 1] = -ys[:, None]
+    block[..., 2] = np.asarray(depth_rows, dtype=np.float64) * depth_scale
+    return block
+
+
+def _grid_normals(block: np.ndarray) -> np.ndarray:
+    """
+    Area-weighted vertex normals of a (rows, w, 3) vertex block with the
+    _grid_faces winding. Rows on the block edge only see the faces inside
+    the block, so callers pass one extra row above / below a strip.
+    """
+    p00, p01 = block[:-1, :-1], block[:-1, 1:]
+    p10, p11 = block[1:, :-1], block[1:, 1:]
+    n1 = np.cross(p01 - p00, p10 - p00)  # (i, i + 1, i + w)
+    n2 = np.cross(p11 - p01, p10 - p01)  # (i + 1, i + w + 1, i + w)
+
+    acc = np.zeros_like(block)
+    acc[:-1, :-1] += n1
+    acc[:-1, 1:] += n1 + n2
+    acc[1:, :-1] += n1 + n2
+    acc[1:, 1:] += n2
+    return acc / np.maximum(np.linalg.norm(acc, axis=-1, keepdims=True), 1e-12)
+
+
 def depth_to_mesh(depth_map: np.ndarray, depth_scale: float = 1.0) -> trimesh.Trimesh:
     """
     Convert a depth map (H x W, normalized [0,1]) into a 3D mesh.
@@ -36,14 +100,7 @@ def depth_to_mesh(depth_map: np.ndarray, depth_scale: float = 1.0) -> trimesh.Tr
     vertices = np.stack([xv, -yv, zv], axis=-1).reshape(-1, 3)
 
     # Build faces (two triangles per quad)
-    faces = []
-    for y in range(h - 1):
-        for x in range(w - 1):
-            i = y * w + x
-            faces.append([i, i + 1, i + w])
-            faces.append([i + 1, i + w + 1, i + w])
-
-    faces = np.array(faces, dtype=np.int64)
+    faces = _grid_faces(w, 0, h - 1)
 
     mesh = trimesh.Trimesh(
         vertices=vertices,
@@ -51,9 +108,136 @@ def depth_to_mesh(depth_map: np.ndarray, depth_scale: float = 1.0) -> trimesh.Tr
         process=True
     )
 
-    mesh.remove_degenerate_faces()
-    mesh.remove_duplicate_faces()
+    # trimesh 4.x API (remove_degenerate_faces / remove_duplicate_faces are gone)
+    mesh.update_faces(mesh.nondegenerate_faces())
+    mesh.update_faces(mesh.unique_faces())
     mesh.remove_unreferenced_vertices()
     mesh.fix_normals()
 
+    # Cached vertex normals are exported as the GLB NORMAL attribute
+    mesh.vertex_normals
+
     return mesh
+
+
+def write_glb_tiled(
+    depth_map: np.ndarray,
+    output_path,
+    depth_scale: float = 1.0,
+    strip_rows: int = 256,
+) -> dict:
+    """
+    Stream a depth map (H x W, normalized [0,1]) to a GLB file.
+
+    The grid topology is known up front, so the GLB header and buffer
+    layout are written first and vertices / faces are then appended one
+    horizontal strip at a time. Vertex indices are global, so the faces of
+    a strip reach into the first row of the next strip (one-row overlap)
+    and the seams are stitched without duplicated vertices. Vertex
+    normals are computed per strip from the neighbouring rows, so they
+    are continuous across seams. A full grid has no degenerate, duplicate
+    or unreferenced faces, so depth_to_mesh's cleanup has nothing to do
+    here.
+
+    depth_map may be an np.memmap; only `strip_rows` rows are materialized
+    at once.
+
+    Returns:
+        dict with vertex / face counts and file size in bytes
+    """
+
+    if depth_map.ndim != 2:
+        raise ValueError("Depth map must be 2D")
+
+    h, w = depth_map.shape
+    if h < 2 or w < 2:
+        raise ValueError("Depth map must be at least 2x2")
+    if strip_rows < 1:
+        raise ValueError("strip_rows must be >= 1")
+
+    n_vertices = h * w
+    n_faces = 2 * (h - 1) * (w - 1)
+    if n_vertices > np.iinfo(np.uint32).max:
+        raise ValueError("Depth map too large for 32-bit indices")
+
+    position_bytes = n_vertices * 3 * 4
+    normal_bytes = n_vertices * 3 * 4
+    index_bytes = n_faces * 3 * 4
+
+    z_bounds = sorted([
+        float(np.float32(float(np.min(depth_map)) * depth_scale)),
+        float(np.float32(float(np.max(depth_map)) * depth_scale)),
+    ])
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "vision3d.mesh_builder"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0, "NORMAL": 2}, "indices": 1, "mode": 4}]}],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": _FLOAT,
+                "count": n_vertices,
+                "type": "VEC3",
+                "min": [-0.5, -0.5, z_bounds[0]],
+                "max": [0.5, 0.5, z_bounds[1]],
+            },
+            {
+                "bufferView": 1,
+                "componentType": _UNSIGNED_INT,
+                "count": n_faces * 3,
+                "type": "SCALAR",
+            },
+            {
+                "bufferView": 2,
+                "componentType": _FLOAT,
+                "count": n_vertices,
+                "type": "VEC3",
+            },
+        ],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": position_bytes, "target": _ARRAY_BUFFER},
+            {"buffer": 0, "byteOffset": position_bytes, "byteLength": index_bytes, "target": _ELEMENT_ARRAY_BUFFER},
+            {"buffer": 0, "byteOffset": position_bytes + index_bytes, "byteLength": normal_bytes,
+             "target": _ARRAY_BUFFER},
+        ],
+        "buffers": [{"byteLength": position_bytes + index_bytes + normal_bytes}],
+    }
+
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    bin_length = position_bytes + index_bytes + normal_bytes  # already 4-byte aligned
+    total_length = 12 + 8 + len(json_chunk) + 8 + bin_length
+
+    # Same XY layout as depth_to_mesh
+    xs = np.linspace(-0.5, 0.5, w)
+    ys = np.linspace(-0.5, 0.5, h)
+
+    with open(output_path, "wb") as f:
+        f.write(struct.pack("<4sII", _GLB_MAGIC, 2, total_length))
+        f.write(struct.pack("<I4s", len(json_chunk), _CHUNK_JSON))
+        f.write(json_chunk)
+        f.write(struct.pack("<I4s", bin_length, _CHUNK_BIN))
+
+        # 1️⃣ Vertices, strip by strip
+        for r0 in range(0, h, strip_rows):
+            r1 = min(r0 + strip_rows, h)
+            block = _grid_positions(depth_map[r0:r1], xs, ys[r0:r1], depth_scale)
+            f.write(block.astype("<f4").tobytes())
+
+        # 2️⃣ Faces, strip by strip (quads of the last row of a strip
+        #    use the first row of the next one -> stitched seam)
+        for r0 in range(0, h - 1, strip_rows):
+            r1 = min(r0 + strip_rows, h - 1)
+            f.write(_grid_faces(w, r0, r1).astype("<u4").tobytes())
+
+        # 3️⃣ Normals, strip by strip (one halo row on each side)
+        for r0 in range(0, h, strip_rows):
+            r1 = min(r0 + strip_rows, h)
+            a, b = max(r0 - 1, 0), min(r1 + 1, h)
+            normals = _grid_normals(_grid_positions(depth_map[a:b], xs, ys[a:b], depth_scale))
+            f.write(normals[r0 - a:r1 - a].astype("<f4").tobytes())
+
+    return {"vertices": n_vertices, "faces": n_faces, "bytes": total_length}
@@ -8,13 +8,21 @@ NO networking.
 
 from pathlib import Path
 from ai_engine.vision3d.depth_estimator import DepthEstimator
-from ai_engine.vision3d.mesh_builder import depth_to_mesh
+from ai_engine.vision3d.mesh_builder import depth_to_mesh, write_glb_tiled
+
+# Above this many depth pixels the mesh is streamed to disk in strips.
+# The model's own output (~384 px) stays in memory; upsampled maps
+# (upsample=True, image resolution) are tiled.
+TILED_MIN_PIXELS = 512 * 512
 
 
 def generate_phone_glb_from_image(
     image_path: str,
     output_path: Path,
     model_name: str,
+    depth_scale: float = 1.0,
+    max_size: int = 1024,
+    upsample: bool = False,
 ) -> None:
     """
     Generate a 3D GLB model from a phone image.
@@ -22,6 +30,9 @@ def generate_phone_glb_from_image(
     - image_path: local filesystem path to input image
     - output_path: final .glb path (must be absolute)
     - model_name: used for logging only
+    - depth_scale: depth exaggeration passed to depth_to_mesh
+    - max_size: longest image side fed to the depth model
+    - upsample: keep the depth map at image resolution (high detail)
     """
 
     image_path = Path(image_path)
@@ -34,19 +45,22 @@ def generate_phone_glb_from_image(
 
     # 1️⃣ Estimate depth
     estimator = DepthEstimator()
-    depth_map = estimator.estimate(image_path)
+    depth_map = estimator.estimate(image_path, max_size=max_size, upsample=upsample)
 
     if depth_map is None:
         raise RuntimeError("Depth estimation failed")
 
-    # 2️⃣ Build mesh
-    mesh = depth_to_mesh(depth_map)
+    # 2️⃣ + 3️⃣ Build mesh & export GLB
+    if depth_map.size > TILED_MIN_PIXELS:
+        # Bounded memory: vertices / faces streamed strip by strip
+        write_glb_tiled(depth_map, output_path, depth_scale=depth_scale)
+    else:
+        mesh = depth_to_mesh(depth_map, depth_scale=depth_scale)
 
-    if mesh is None:
-        raise RuntimeError("Mesh generation failed")
+        if mesh is None:
+            raise RuntimeError("Mesh generation failed")
 
-    # 3️⃣ Export GLB
-    mesh.export(output_path)
+        mesh.export(output_path)
 
     if not output_path.exists():
         raise RuntimeError("GLB export failed")
@@ -0,0 +1,143 @@
+"""
+vision3d.phone_template
+
+Parametric placeholder phone built from ONE template mesh.
+NO Django imports.
+
+Placeholders only differ in width / height / thickness, so instead of
+building a new box (+ camera bump) per model we:
+- build the template geometry once per process
+- describe each phone as transform parameters on a shared template GLB
+  (cheap, served through the API), or
+- instance a per-phone mesh by rescaling template vertices when a
+  standalone GLB is really needed
+"""
+
+from functools import lru_cache
+from math import hypot
+
+import numpy as np
+import trimesh
+
+
+TEMPLATE_VERSION = "phone-template-v1"
+
+# Reference phone the shared template GLB is exported at (mm)
+REFERENCE_DIMS_MM = {"width": 70.0, "height": 150.0, "thickness": 8.0}
+
+# Camera bump stays rigid whatever the body size (mm)
+CAMERA_BUMP_MM = (15.0, 2.0, 15.0)
+
+# Used when only the screen diagonal is known: 19.5:9 panel + bezels
+_SCREEN_ASPECT = (9.0, 19.5)
+_BEZEL_MM = 4.0
+
+
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+# -----------------------------
+# TEMPLATE (built once)
+# -----------------------------
+@lru_cache(maxsize=1)
+def _template():
+    """
+    Unit body box + camera bump.
+
+    Returns:
+        (vertices, faces, bump_mask) — read-only arrays
+    """
+    body = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    bump = trimesh.creation.box(extents=CAMERA_BUMP_MM)
+
+    vertices = np.vstack([body.vertices, bump.vertices])
+    faces = np.vstack([body.faces, bump.faces + len(body.vertices)])
+    bump_mask = np.zeros(len(vertices), dtype=bool)
+    bump_mask[len(body.vertices):] = True
+
+    for arr in (vertices, faces, bump_mask):
+        arr.flags.writeable = False
+    return vertices, faces, bump_mask
+
+
+# -----------------------------
+# PARAMETERS
+# -----------------------------
+def phone_dimensions(specs: dict = None) -> dict:
+    """
+    Body dimensions in mm.
+
+    Explicit width_mm / height_mm / thickness_mm win; otherwise width and
+    height are estimated from display_size (inches); otherwise reference.
+    """
+    specs = specs or {}
+    dims = dict(REFERENCE_DIMS_MM)
+
+    display = _to_float(specs.get("display_size"))
+    if display:
+        aspect_w, aspect_h = _SCREEN_ASPECT
+        k = display * 25.4 / hypot(aspect_w, aspect_h)
+        dims["width"] = round(aspect_w * k + 2 * _BEZEL_MM, 1)
+        dims["height"] = round(aspect_h * k + 2 * _BEZEL_MM, 1)
+
+    for key in dims:
+        value = _to_float(specs.get(f"{key}_mm"))
+        if value:
+            dims[key] = value
+
+    return dims
+
+
+def phone_transform(specs: dict = None) -> dict:
+    """
+    Per-phone parameters for the shared template GLB.
+
+    `scale` is in template axes (x = width, y = thickness, z = height)
+    relative to REFERENCE_DIMS_MM.
+    """
+    dims = phone_dimensions(specs)
+    ref = REFERENCE_DIMS_MM
+    return {
+        "template": TEMPLATE_VERSION,
+        "dimensions_mm": dims,
+        "scale": [
+            round(dims["width"] / ref["width"], 4),
+            round(dims["thickness"] / ref["thickness"], 4),
+            round(dims["height"] / ref["height"], 4),
+        ],
+    }
+
+
+# -----------------------------
+# MESHES
+# -----------------------------
+def instance_mesh(specs: dict = None) -> trimesh.Trimesh:
+    """
+    Template rescaled to a phone's body; the camera bump keeps its size
+    and stays glued to the back / top of the body.
+    """
+    dims = phone_dimensions(specs)
+    vertices, faces, bump_mask = _template()
+
+    extents = np.array([dims["width"], dims["thickness"], dims["height"]])
+    out = vertices.copy()
+    out[~bump_mask] *= extents
+    out[bump_mask] += [
+        0.0,
+        extents[1] / 2 + CAMERA_BUMP_MM[1] / 2,
+        extents[2] / 2 - CAMERA_BUMP_MM[2] / 2,
+    ]
+
+    return trimesh.Trimesh(vertices=out, faces=faces.copy(), process=False)
+
+
+def export_template(output_path) -> None:
+    """
+    Write the shared template GLB (reference dimensions).
+    """
+    instance_mesh().export(output_path)
@@ -3,27 +3,56 @@ vision3d.pipeline.py
 
 High-level orchestration for 3D phone generation.
 SAFE for Django imports.
-Cache-aware and idempotent.
+Cache-aware and idempotent: meshes are content-addressed by
+source image digest + PIPELINE_PARAMS (see glb_cache).
 """
 
 import threading
 from pathlib import Path
 from django.conf import settings
 
-def generate_phone_3d_model(model_name: str, save_path: str):
+from ai_engine.vision3d.glb_cache import (
+    DEFAULT_MAX_BYTES,
+    GLBCache,
+    cache_key,
+    file_digest,
+    model_safe_name,
+)
+
+# Everything that changes the generated mesh must be part of the cache key
+PIPELINE_PARAMS = {
+    "depth_scale": 1.0,
+    "max_size": 1024,
+    "upsample": False,  # True + larger max_size -> tiled high-detail mesh
+}
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+_INFLIGHT = set()
+
+
+def get_glb_cache() -> GLBCache:
     """
-    Generates a 3D .glb model from 2D rendering.
-    This is a placeholder example; integrate your 2D→3D engine here.
+    Lazily build the shared GLB cache under MEDIA_ROOT/3d_models.
     """
-    import trimesh
-    import pyrender
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = GLBCache(
+                Path(settings.MEDIA_ROOT) / "3d_models",
+                max_bytes=getattr(settings, "GLB_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            )
+        return _CACHE
+
 
-    # STEP 1: Generate a simple box representing phone dimensions
-    width, height, depth = 0.07, 0.15, 0.008  # meters, example dimensions
-    mesh = trimesh.creation.box(extents=[width, height, depth])
+def generate_phone_3d_model(model_name: str, save_path: str, specs: dict = None):
+    """
+    Generates a placeholder 3D .glb model for a phone.
+    The parametric template is rescaled; no mesh is rebuilt per model.
+    """
+    from ai_engine.vision3d.phone_template import instance_mesh
 
-    # STEP 2: Export to .glb
-    mesh.export(save_path)
+    instance_mesh(specs).export(save_path)
 
 def run_3d_job(image_path: str, model_name: str) -> None:
     """
@@ -34,24 +63,44 @@ def run_3d_job(image_path: str, model_name: str) -> None:
     - model_name: phone model name
     """
 
-    model_safe = model_name.lower().replace(" ", "_")
-    output_glb = Path(settings.MEDIA_ROOT) / "3d_models" / f"{model_safe}.glb"
+    image_path = Path(image_path)
+    if not image_path.exists():
+        print(f"[3D PIPELINE ERROR] {model_name}: image not found {image_path}")
+        return
+
+    cache = get_glb_cache()
+    key = cache_key(file_digest(image_path), PIPELINE_PARAMS)
+    model_safe = model_safe_name(model_name)
 
-    # ✅ HARD STOP if already generated
-    if output_glb.exists():
+    # ✅ HARD STOP if this image + params was already generated
+    if cache.get(key) is not None:
+        cache.record(model_safe, key)
         return
 
+    with _CACHE_LOCK:
+        if key in _INFLIGHT:
+            return
+        _INFLIGHT.add(key)
+
     def _job():
         try:
             from ai_engine.vision3d.worker import generate_3d_phone
-            generate_3d_phone(
-                image_path=image_path,
-                output_path=output_glb,
-                model_name=model_name,
-            )
+            with cache.writer(key) as tmp_glb:
+                ok = generate_3d_phone(
+                    image_path=image_path,
+                    output_path=tmp_glb,
+                    model_name=model_name,
+                    **PIPELINE_PARAMS,
+                )
+                if not ok:
+                    raise RuntimeError("3D worker failed")
+            cache.record(model_safe, key)
         except Exception as e:
             # Never crash Django thread
             print(f"[3D PIPELINE ERROR] {model_name}: {e}")
+        finally:
+            with _CACHE_LOCK:
+                _INFLIGHT.discard(key)
 
     thread = threading.Thread(target=_job, daemon=True)
     thread.start()
@@ -12,13 +12,19 @@ def generate_3d_phone(
     image_path: str,
     output_path: Path,
     model_name: str,
-) -> None:
+    depth_scale: float = 1.0,
+    max_size: int = 1024,
+    upsample: bool = False,
+) -> bool:
     """
     Background 3D generation job.
 
     - image_path: local filesystem path to phone image
     - output_path: final .glb output path
     - model_name: phone model name (for logging only)
+    - depth_scale / max_size / upsample: mesh parameters (part of the cache key)
+
+    Returns True when the .glb was written.
     """
 
     try:
@@ -28,10 +34,16 @@ def generate_3d_phone(
             image_path=image_path,
             output_path=output_path,
             model_name=model_name,
+            depth_scale=depth_scale,
+            max_size=max_size,
+            upsample=upsample,
         )
 
-        if not output_path.exists():
+        if not Path(output_path).exists():
             raise RuntimeError("3D generation finished but .glb not found")
 
+        return True
+
     except Exception as e:
         print(f"[3D WORKER ERROR] {model_name}: {e}")
+        return False
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from ai_engine.evaluation import benchmark as bm
+from ai_engine.evaluation.synthetic_catalog import sample_user_inputs, synthetic_catalog
+
+SOURCE = pd.DataFrame({
+    "model": ["A1", "B1", "C1"],
+    "brand": ["Samsung", "Xiaomi", "Apple"],
+    "price": [300.0, 450.0, 999.0],
+    "cam_resolution": [50.0, 108.0, 48.0],
+    "battery": [5000.0, 4500.0, 3300.0],
+    "ram": [6.0, 8.0, 8.0],
+    "display_size": [6.5, 6.7, 6.1],
+    "weight": [190.0, 200.0, 170.0],
+    "release_year": [2022, 2023, 2024],
+})
+
+
+def test_synthetic_catalog_scales_source():
+    df = synthetic_catalog(1000, source=SOURCE, seed=1)
+
+    assert len(df) == 1000
+    assert df["model"].is_unique
+    assert df.iloc[:3]["price"].tolist() == SOURCE["price"].tolist()
+    assert set(df["brand"]) == set(SOURCE["brand"])
+    assert df["price"].between(270, 1099).all()
+    assert len(sample_user_inputs(df, n=4)) == 4
+
+
+def test_suite_reports_percentiles_and_skips():
+    bm.CASES["always_skips"] = lambda catalog: (_ for _ in ()).throw(bm.SkipCase("not here"))
+    try:
+        report = bm.run_suite(
+            [400], ["resolve_brand", "always_skips"], source=SOURCE,
+            repeats=5, warmup=0, time_budget_s=1,
+        )
+    finally:
+        del bm.CASES["always_skips"]
+
+    ok, skipped = report["results"]
+    assert ok["status"] == "ok" and ok["rows"] == 400
+    assert ok["p50_ms"] <= ok["p95_ms"] <= ok["p99_ms"]
+    assert ok["throughput_qps"] > 0 and ok["peak_mb"] > 0
+    assert skipped == {"case": "always_skips", "rows": 400, "status": "skipped", "reason": "not here"}
+
+
+def test_compare_flags_regressions(tmp_path):
+    def report(p50):
+        return {"results": [{"case": "x", "rows": 10, "status": "ok", "p50_ms": p50, "p95_ms": 2.0, "peak_mb": 1.0}]}
+
+    bm.save_report(report(1.0), tmp_path / "base.json")
+    baseline = bm.load_report(tmp_path / "base.json")
+
+    assert bm.compare(report(1.1), baseline, tolerance=0.2)[0]["regression"] == []
+    assert bm.compare(report(1.5), baseline, tolerance=0.2)[0]["regression"] == ["p50_ms"]
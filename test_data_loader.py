@@ -0,0 +1,142 @@
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.recommender import data_loader as dl
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    data_dir, assets_dir = tmp_path / "data", tmp_path / "assets"
+    data_dir.mkdir()
+    assets_dir.mkdir()
+    for name in dl.INPUT_FILES:
+        shutil.copy(dl.DATA_DIR / name, data_dir / name)
+
+    monkeypatch.setattr(dl, "DATA_DIR", data_dir)
+    monkeypatch.setattr(dl, "ASSETS_DIR", assets_dir)
+    monkeypatch.setattr(dl, "MANIFEST_PATH", assets_dir / "build_manifest.json")
+    monkeypatch.setattr(dl, "PARSED_CACHE_PATH", assets_dir / "parsed_rows.pkl")
+    monkeypatch.setattr(dl, "MODEL_PATH", assets_dir / "satisfaction_model.pkl")  # no model
+    monkeypatch.setattr(dl, "ENRICHMENT_PATH", assets_dir / "enrichment" / "enrichment.pkl")  # none
+    return data_dir, assets_dir
+
+
+def full_pipeline():
+    raw_df = dl.clean_features(dl.prepare_raw_dataframe(*dl.load_datasets()))
+    processed_df, scaler = dl.build_processed_dataframe(raw_df)
+    return raw_df, processed_df, scaler
+
+
+def test_first_build_matches_full_pipeline(build):
+    _, assets_dir = build
+    dl.main([])
+
+    raw_df, processed_df, scaler = full_pipeline()
+    pd.testing.assert_frame_equal(joblib.load(assets_dir / "raw_df.pkl"), raw_df)
+    pd.testing.assert_frame_equal(joblib.load(assets_dir / "processed_df.pkl"), processed_df)
+    assert np.array_equal(joblib.load(assets_dir / "scaler.pkl").data_max_, scaler.data_max_)
+
+
+def test_unchanged_inputs_skip_the_run(build, capsys):
+    _, assets_dir = build
+    dl.main([])
+    mtime = (assets_dir / "raw_df.pkl").stat().st_mtime_ns
+
+    dl.main([])
+    assert "Inputs unchanged" in capsys.readouterr().out
+    assert (assets_dir / "raw_df.pkl").stat().st_mtime_ns == mtime
+
+
+def test_added_phone_only_parses_new_row(build, capsys):
+    data_dir, assets_dir = build
+    dl.main([])
+    capsys.readouterr()
+
+    main_csv = data_dir / dl.INPUT_FILES[0]
+    df = pd.read_csv(main_csv, encoding="latin1")
+    new = df.iloc[[0]].assign(**{"Model Name": "iPhone 99 1TB", "Launched Price (USA)": "USD 99,999"})
+    pd.concat([df, new]).to_csv(main_csv, index=False, encoding="latin1")
+
+    dl.main([])
+    out = capsys.readouterr().out
+    assert "1 parsed" in out
+    assert "scaler: updated" in out  # new max price
+
+    raw_df, processed_df, scaler = full_pipeline()
+    pd.testing.assert_frame_equal(joblib.load(assets_dir / "raw_df.pkl"), raw_df)
+    pd.testing.assert_frame_equal(joblib.load(assets_dir / "processed_df.pkl"), processed_df)
+    assert np.array_equal(joblib.load(assets_dir / "scaler.pkl").data_max_, scaler.data_max_)
+
+
+def test_scores_recomputed_only_for_changed_rows(build, monkeypatch, capsys):
+    pytest.importorskip("sklearn")
+    from sklearn.tree import DecisionTreeRegressor
+    from ai_engine.recommender import satisfaction_engine as se
+
+    data_dir, assets_dir = build
+    X = np.random.default_rng(0).random((50, len(se.NUMERIC_FEATURES)))
+    joblib.dump(DecisionTreeRegressor(max_depth=4).fit(X, X[:, 2]), dl.MODEL_PATH)
+    monkeypatch.setattr(se, "MODEL_PATH", dl.MODEL_PATH)
+    monkeypatch.setattr(se, "FLAT_MODEL_PATH", assets_dir / "missing.npz")
+
+    dl.main([])
+    assert "scores recomputed: " in capsys.readouterr().out
+
+    main_csv = data_dir / dl.INPUT_FILES[0]
+    df = pd.read_csv(main_csv, encoding="latin1")
+    new = df.iloc[[5]].assign(**{"Model Name": "Galaxy Test"})
+    pd.concat([df, new]).to_csv(main_csv, index=False, encoding="latin1")
+
+    dl.main([])
+    out = capsys.readouterr().out
+    assert "scaler: unchanged" in out
+    assert "scores recomputed: 1" in out
+
+    raw_df = joblib.load(assets_dir / "raw_df.pkl")
+    expected = se.attach_satisfaction_scores(full_pipeline()[0], scaler=joblib.load(assets_dir / "scaler.pkl"))
+    assert np.allclose(raw_df[se.SCORE_COLUMN], expected[se.SCORE_COLUMN])
+
+
+def test_rebuild_keeps_enrichment(build, capsys):
+    pytest.importorskip("bs4")
+    from ai_engine.live_data.enrich_catalog import enrichment_table, lookup_name, merge_enrichment
+
+    data_dir, assets_dir = build
+    dl.main([])
+
+    # enrich_catalog: artifact + enriched raw_df.pkl
+    raw_df = joblib.load(assets_dir / "raw_df.pkl")
+    name = lookup_name(raw_df["model"].iloc[0])
+    specs = {"width_mm": 71.5, "gsma_chipset": "Test Chip", "gsma_url": "https://example/test.php"}
+    enriched = enrichment_table({name: {"name": name, "status": "ok", "specs": specs}})
+    dl.ENRICHMENT_PATH.parent.mkdir()
+    joblib.dump(enriched, dl.ENRICHMENT_PATH)
+    joblib.dump(merge_enrichment(raw_df, enriched), assets_dir / "raw_df.pkl")
+
+    main_csv = data_dir / dl.INPUT_FILES[0]
+    df = pd.read_csv(main_csv, encoding="latin1")
+    new = df.iloc[[3]].assign(**{"Model Name": "Galaxy Enriched Test"})
+    pd.concat([df, new]).to_csv(main_csv, index=False, encoding="latin1")
+
+    dl.main([])
+    assert "1 parsed" in capsys.readouterr().out
+
+    rebuilt = joblib.load(assets_dir / "raw_df.pkl")
+    assert len(rebuilt) == len(raw_df) + 1
+    assert rebuilt["width_mm"].iloc[0] == 71.5 and rebuilt["gsma_chipset"].iloc[0] == "Test Chip"
+    assert rebuilt["gsma_url"].notna().sum() == (rebuilt["model"].map(lookup_name) == name).sum()
+    assert not any(c.startswith("gsma") for c in joblib.load(assets_dir / "processed_df.pkl").columns)
+
+
+def test_feature_changes_with_duplicated_keys():
+    previous = pd.DataFrame({"brand": ["A", "A", "B"], "model": ["X", "X", "Y"], **{
+        f: [1.0, 2.0, 3.0] for f in dl.NUMERIC_FEATURES
+    }})
+    current = pd.concat([previous, previous.iloc[[2]].assign(model="Z")], ignore_index=True)
+    current.loc[2, "price"] = 9.0
+
+    assert dl._feature_changes(current, previous).tolist() == [False, True, True, True]
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("joblib")
+
+from ai_engine.live_data.enrich_catalog import (
+    enrichment_table,
+    load_checkpoint,
+    merge_enrichment,
+    parse_typed_specs,
+    raw_spec_fields,
+    run_enrichment,
+)
+
+
+PHONE_HTML = """
+<table>
+<tr><td data-spec="nettech">GSM / HSPA / LTE / 5G</td></tr>
+<tr><td data-spec="year">2024, August 13</td></tr>
+<tr><td data-spec="dimensions">152.8 x 72 x 8.5 mm (6.02 x 2.83 x 0.33 in)</td></tr>
+<tr><td data-spec="weight">198 g (6.98 oz)</td></tr>
+<tr><td data-spec="displaysize">6.3 inches, 98.0 cm2</td></tr>
+<tr><td data-spec="chipset">Google Tensor G4 (4 nm)</td></tr>
+<tr><td data-spec="internalmemory">128GB 12GB RAM, 256GB 12GB RAM</td></tr>
+<tr><td data-spec="cam1modules">50 MP, f/1.7, 25mm (wide)</td></tr>
+<tr><td data-spec="batdescription1">Li-Ion 4,700 mAh</td></tr>
+<tr><td data-spec="price">$ 799.00 / € 899.00</td></tr>
+</table>
+"""
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.searches = []
+
+    def search(self, name):
+        self.searches.append(name)
+        return None if name == "Unknown" else f"https://example/{name}.php"
+
+    def get_text(self, url):
+        return PHONE_HTML
+
+
+def test_parse_typed_specs():
+    typed = parse_typed_specs(raw_spec_fields(PHONE_HTML))
+
+    assert (typed["height_mm"], typed["width_mm"], typed["thickness_mm"]) == (152.8, 72.0, 8.5)
+    assert typed["gsma_weight_g"] == 198.0
+    assert typed["gsma_display_in"] == 6.3
+    assert typed["gsma_battery_mah"] == 4700.0
+    assert typed["gsma_ram_gb"] == 12.0
+    assert typed["gsma_main_camera_mp"] == 50.0
+    assert typed["gsma_5g"] == 1
+    assert typed["gsma_year"] == 2024
+    assert typed["gsma_price_usd"] == 799.0
+
+
+def test_resume_skips_finished_and_merges_variants(tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    fetcher = FakeFetcher()
+
+    run_enrichment(["Pixel 9", "Unknown"], fetcher, checkpoint, images_dir=None, workers=2)
+    with open(checkpoint, "a") as f:
+        f.write('{"status": "ok"}\n[1, 2]\n')  # partial records
+        f.write('{"name": "torn')  # crash mid-write
+
+    done = run_enrichment(["Pixel 9", "Unknown", "Pixel 8"], fetcher, checkpoint, images_dir=None)
+    assert sorted(fetcher.searches) == ["Pixel 8", "Pixel 9", "Unknown"]
+    assert set(load_checkpoint(checkpoint)) == {"Pixel 9", "Pixel 8", "Unknown"}
+
+    raw = pd.DataFrame({"model": ["Pixel 9 128GB", "Pixel 9 256GB", "Unknown"], "price": [799, 899, 1]})
+    merged = merge_enrichment(raw, enrichment_table(done))
+
+    assert list(merged["price"]) == [799, 899, 1]
+    assert list(merged["width_mm"].iloc[:2]) == [72.0, 72.0]
+    assert pd.isna(merged["width_mm"].iloc[2])
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.evaluation import evaluate as ev
+from ai_engine.evaluation import metrics as M
+
+
+def test_legacy_average_precision_skips_duplicates():
+    assert M.average_precision_at_k([1, 1, 2], [1, 2], 3) == pytest.approx((1 + 2 / 3) / 2)
+    assert M.average_precision_at_k([1, 2], [], 2) == 0.0
+
+
+def test_vectorized_metrics_match_reference():
+    rng = np.random.default_rng(0)
+    recs = [list(rng.integers(0, 30, size=rng.integers(0, 8))) for _ in range(300)]
+    rel = [list(set(rng.integers(0, 30, size=rng.integers(0, 5)))) for _ in range(300)]
+    R, G = M.to_matrix(recs, width=8), M.to_matrix(rel)
+
+    hits = M.hit_matrix(R, G)
+    n_rel = M.relevant_counts(G)
+
+    expected_map = np.mean([M.average_precision_at_k(r, g, 8) for r, g in zip(recs, rel)])
+    expected_recall = np.mean([len(set(r) & set(g)) / len(g) if g else 0.0 for r, g in zip(recs, rel)])
+    assert M.map_at_k(hits, n_rel, 8) == pytest.approx(expected_map)
+    assert M.recall_at_k(hits, n_rel) == pytest.approx(expected_recall)
+
+
+def test_ndcg_coverage_diversity():
+    R = np.array([[3, 1, M.PAD], [2, 2, 0]])
+    G = M.to_matrix([[1], [0, 2]])
+    hits = M.hit_matrix(R, G)
+
+    assert hits.tolist() == [[False, True, False], [True, False, True]]  # repeated 2 counted once
+    ndcg_user0 = (1 / np.log2(3)) / 1.0
+    ndcg_user1 = (1 + 1 / np.log2(4)) / (1 + 1 / np.log2(3))
+    assert M.ndcg_at_k(hits, M.relevant_counts(G)) == pytest.approx((ndcg_user0 + ndcg_user1) / 2)
+
+    assert M.coverage(R, n_items=8) == 4 / 8
+
+    features = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [-1.0, 0.0]])
+    assert M.diversity(np.array([[0, 1], [0, 2], [0, 3]]), features) == pytest.approx((1 + 0 + 2) / 3)
+
+
+def test_evaluate_reports_quality_and_latency(monkeypatch):
+    catalog = pd.DataFrame({
+        "model": ["A 128GB", "A 256GB", "B", "C"],
+        "brand": ["X", "X", "Y", "Z"],
+        "price": [100.0, 120.0, 300.0, 900.0],
+        "cam_resolution": [12.0, 12.0, 50.0, 108.0],
+        "battery": [4000.0, 4000.0, 5000.0, 4500.0],
+        "ram": [4.0, 4.0, 8.0, 12.0],
+        "display_size": [6.1, 6.1, 6.5, 6.8],
+        "weight": [170.0, 170.0, 190.0, 220.0],
+        "release_year": [2022, 2022, 2023, 2024],
+    })
+    profiles = ev.make_profiles(catalog, n=20, seed=1)
+    assert {"A 128GB", "A 256GB"} in [set(p["relevant"]) for p in profiles]
+
+    # Oracle ranks the relevant models first; "cheapest" ignores the user
+    monkeypatch.setitem(ev.ENGINES, "oracle", lambda cat, row_of: lambda p, k: ev._rows(p["relevant"], row_of)[:k])
+    monkeypatch.setitem(ev.ENGINES, "cheapest", lambda cat, row_of: lambda p, k: [0, 1][:k])
+
+    report = ev.evaluate(catalog, profiles, engines=["oracle", "cheapest"], k=2)
+    oracle, cheapest = report["engines"]["oracle"], report["engines"]["cheapest"]
+
+    assert oracle["map@2"] == oracle["ndcg@2"] == oracle["recall@2"] == 1.0
+    assert cheapest["recall@2"] < 1.0 and cheapest["coverage"] == 0.5
+    assert oracle["p50_ms"] >= 0 and oracle["throughput_qps"] > 0
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from ai_engine.recommender.explainability import (
+    explain_batch,
+    explain_recommendation,
+    scores_to_matrix,
+)
+
+FEATURES = ["price", "cam_resolution", "battery", "ram", "display_size", "weight", "release_year", "chipset"]
+
+
+def test_batch_matches_per_item_explanations():
+    rng = np.random.default_rng(0)
+    # Rounded so ties (and the stable tie order) get exercised
+    items = [
+        {f: float(s) for f, s in zip(FEATURES, rng.integers(0, 11, len(FEATURES)) / 10) if rng.random() > 0.2}
+        for _ in range(500)
+    ] + [{}]
+
+    matrix, features = scores_to_matrix(items, FEATURES)
+    batch = explain_batch(matrix, features)
+
+    assert batch == [explain_recommendation(fs) for fs in items]
+
+
+def test_batch_top_k_and_shape_checks():
+    matrix = np.array([[0.9, 0.8, 0.95, 0.1]])
+    out = explain_batch(matrix, ["price", "ram", "battery", "weight"], top_k=2)
+    assert out[0]["top_features"] == [
+        "The battery capacity supports long daily usage.",
+        "It fits well within your budget.",
+    ]
+    assert out[0]["cons"] == ["Weight"]
+    assert explain_batch(np.empty((0, 4)), ["a", "b", "c", "d"]) == []
+
+    with pytest.raises(ValueError):
+        explain_batch(matrix, ["price"])
+
+
+def test_batch_many_features_no_pattern_collisions():
+    # (n_features + 1) ** n_features overflows int64 from ~16 features on
+    features = [f"feature_{i}" for i in range(24)]
+    rng = np.random.default_rng(3)
+    scores = rng.uniform(size=(300, len(features)))
+    scores[rng.uniform(size=scores.shape) < 0.2] = np.nan
+
+    batch = explain_batch(scores, features, top_k=len(features))
+    for row, explanation in zip(scores, batch):
+        fs = {f: s for f, s in zip(features, row) if not np.isnan(s)}
+        assert explanation == explain_recommendation(fs, top_k=len(features))
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.recommender.fusion_engine import FusionRecommender, fuse, ranks
+from ai_engine.recommender.materialized import base_model
+from ai_engine.recommender.recommender_engine import SmartphoneRecommender
+from ai_engine.recommender.satisfaction_engine import SCORE_COLUMN
+from ai_engine.semantic.nl_weight_mapper import infer_weights
+from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "model": [f"Phone {i % 120} {rng.choice(['128GB', '256GB'])}" for i in range(n)],
+        "brand": rng.choice(["Samsung", "Apple", "Xiaomi"], size=n),
+        "price": rng.uniform(100, 1500, size=n).round(),
+        "cam_resolution": rng.choice([12.0, 48.0, 50.0, 108.0, 200.0], size=n),
+        "battery": rng.integers(3000, 6000, size=n).astype(float),
+        "ram": rng.choice([4.0, 6.0, 8.0, 12.0], size=n),
+        "display_size": rng.uniform(5.8, 6.9, size=n).round(1),
+        "weight": rng.uniform(150, 240, size=n).round(),
+        "release_year": rng.integers(2018, 2025, size=n),
+        "5G": rng.integers(0, 2, size=n).astype(float),
+        SCORE_COLUMN: rng.uniform(1, 5, size=n),
+    }, index=np.arange(500, 500 + n))
+
+
+@pytest.fixture
+def semantic(catalog):
+    # One-hot "embeddings": the query "row 7" matches catalog row 7 only
+    def encoder(text):
+        vec = np.zeros(len(catalog))
+        vec[int(text.split()[-1])] = 1.0
+        return vec
+    return SemanticSmartphoneRecommender(catalog, embeddings=np.eye(len(catalog)), encoder=encoder)
+
+
+USER = {"brand": "samsung", "price": 800.0, "cam_resolution": 50.0, "battery": 5000.0,
+        "ram": 8.0, "display_size": 6.5, "weight": 190.0, "release_year": 2020,
+        "performance_profile": "balanced"}
+
+
+def test_fuse_methods():
+    a, b = np.array([3.0, 2.0, 1.0]), np.array([1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(ranks(a), [1, 2, 3])
+
+    linear = fuse({"feature": a, "semantic": b, "satisfaction": None}, {"feature": 3, "semantic": 1}, "linear")
+    np.testing.assert_allclose(linear, [0.75, 0.5, 0.25])
+
+    rrf = fuse({"feature": a}, {"feature": 1}, "rrf")
+    assert rrf[0] == pytest.approx(1.0) and np.all(np.diff(rrf) < 0)
+
+    with pytest.raises(ValueError):
+        fuse({"feature": a}, {"feature": 1}, "max")
+
+
+def test_candidates_match_view_filters(catalog):
+    engine = FusionRecommender(catalog)
+    pool = catalog[
+        (catalog["brand"].str.lower() == "samsung")
+        & catalog["price"].between(800 * 0.7, 800 * 1.3)
+        & (catalog["release_year"] >= 2018)
+    ]
+    pool = pool.assign(base=pool["model"].map(base_model)).drop_duplicates(subset=["base"])
+    assert catalog.index[engine.candidates(USER)].tolist() == pool.index.tolist()
+
+    only_5g = engine.candidates(USER, {"5G": {"eq": 1}})
+    assert (catalog["5G"].to_numpy()[only_5g] == 1).all()
+    impossible = engine.candidates(USER, {"ram": {"min": 64}})
+    np.testing.assert_array_equal(impossible, engine.candidates(USER))  # dropped, not empty
+
+
+def test_feature_signal_alone_matches_hybrid_scores(catalog):
+    engine = FusionRecommender(catalog, weights={"satisfaction": 0}, method="linear")
+    rows, scores, signals, _ = engine.rank(USER, top_n=5)
+
+    hybrid, _ = SmartphoneRecommender(df=catalog).score_rows(catalog, USER)
+    candidates = engine.candidates(USER)
+    expected = candidates[np.argsort(-hybrid[candidates], kind="stable")[:5]]
+    np.testing.assert_array_equal(rows, expected)
+    assert list(signals) == ["feature"]
+
+
+def test_signals_share_candidates_and_shift_ranking(catalog, semantic):
+    engine = FusionRecommender(catalog, semantic_engine=semantic,
+                               weights={"feature": 0.1, "semantic": 5.0, "satisfaction": 0.1})
+    target = int(engine.candidates(USER)[-1])
+
+    result = engine.recommend(USER, nl_query=f"row {target}", top_n=3)
+    assert result["signals"] == ["feature", "semantic", "satisfaction"]
+    top = result["items"][0]
+    assert top["model"] == catalog["model"].iloc[target]
+    assert set(top["signal_scores"]) == set(result["signals"])
+    assert set(top["feature_scores"]) == set(SmartphoneRecommender.FEATURES)
+    assert all(0 <= item["match_score"] <= 1 for item in result["items"])
+
+    # No query: semantic drops out
+    assert engine.recommend(USER, top_n=3)["signals"] == ["feature", "satisfaction"]
+
+
+def test_empty_pool_and_bad_config(catalog, semantic):
+    engine = FusionRecommender(catalog)
+    assert engine.recommend({**USER, "brand": "nokia"})["items"] == []
+    with pytest.raises(ValueError):
+        FusionRecommender(catalog, method="borda")
+    with pytest.raises(ValueError):
+        FusionRecommender(catalog.iloc[:10], semantic_engine=semantic)
+
+
+def test_hybrid_results_are_catalog_positions(catalog):
+    engine = SmartphoneRecommender(df=catalog)
+    batch = engine.results(USER, top_n=5)
+    items = engine.recommend(USER, top_n=5)["items"]
+
+    assert (catalog["brand"].iloc[batch.rows] == "Samsung").all()
+    assert catalog["model"].iloc[batch.rows].tolist() == [item["model"] for item in items]
+    np.testing.assert_allclose(batch.scores, [item["match_score"] for item in items])
+    np.testing.assert_allclose(batch.matches[0], list(items[0]["feature_scores"].values()))
+
+
+def test_query_intents_reweight_the_feature_signal(catalog):
+    engine = FusionRecommender(catalog)
+    rows = engine.candidates(USER)
+    X = catalog[SmartphoneRecommender.FEATURES].to_numpy(dtype=float)[rows]
+
+    plain, _ = engine.signal_scores(rows, USER)
+    no_intent, _ = engine.signal_scores(rows, USER, nl_query="row 7")
+    np.testing.assert_array_equal(no_intent["feature"], plain["feature"])
+
+    camera, _ = engine.signal_scores(rows, USER, nl_query="great camera for photos")
+    expected, _ = engine.feature_engine.score_matrix(
+        X, {**USER, "feature_weights": infer_weights("great camera for photos")}
+    )
+    np.testing.assert_allclose(camera["feature"], expected)
+    assert not np.allclose(camera["feature"], plain["feature"])
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from ai_engine.vision3d.glb_cache import GLBCache, cache_key, file_digest
+
+
+def test_key_changes_with_image_and_params(tmp_path):
+    img = tmp_path / "phone.jpg"
+    img.write_bytes(b"image-v1")
+    k1 = cache_key(file_digest(img), {"depth_scale": 1.0})
+
+    assert k1 == cache_key(file_digest(img), {"depth_scale": 1.0})
+    assert k1 != cache_key(file_digest(img), {"depth_scale": 2.0})
+
+    img.write_bytes(b"image-v2")
+    assert k1 != cache_key(file_digest(img), {"depth_scale": 1.0})
+
+
+def test_failed_write_is_never_published(tmp_path):
+    cache = GLBCache(tmp_path)
+
+    with pytest.raises(ValueError):
+        with cache.writer("abc") as tmp_glb:
+            tmp_glb.write_bytes(b"half")
+            raise ValueError("export crashed")
+
+    assert cache.get("abc") is None
+    assert list(cache.objects_dir.iterdir()) == []
+
+
+def test_manifest_and_lru_eviction(tmp_path):
+    cache = GLBCache(tmp_path, max_bytes=25)
+
+    cache.put_bytes("old", b"x" * 10)
+    cache.record("phone_a", "old")
+    os.utime(cache.path_for("old"), (1, 1))
+
+    cache.put_bytes("mid", b"x" * 10)
+    cache.record("phone_b", "mid")
+    assert cache.resolve("phone_a") == cache.path_for("old")  # touch -> recently used
+    os.utime(cache.path_for("mid"), (2, 2))
+
+    cache.put_bytes("new", b"x" * 10)
+
+    assert cache.get("mid") is None
+    assert cache.get("old") is not None
+    assert cache.lookup("phone_b") is None
+    assert cache.total_bytes() <= 25
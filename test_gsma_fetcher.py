@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("django")
+
+from ai_engine.live_data.fetcher import GSMAFetcher, TokenBucket
+from ai_engine.live_data.gsma_scraper import fetch_phone_image, fetch_phone_specs
+
+
+SEARCH_HTML = b'<div class="makers"><ul><li><a href="pixel_9-123.php">Pixel 9</a></li></ul></div>'
+PHONE_HTML = b"""
+<div class="specs-photo-main"><img src="/img/pixel_9.jpg"></div>
+<table><tr><th>Battery</th><td>4700 mAh</td></tr><tr><th>RAM</th><td>12GB</td></tr></table>
+"""
+PAGES = {
+    "/pixel_9-123.php": PHONE_HTML,
+    "/img/pixel_9.jpg": b"\xff\xd8fake-jpeg",
+}
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    hits = Counter()
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        StubHandler.hits[path] += 1
+
+        if path == "/results.php3":
+            body = SEARCH_HTML
+        elif path in PAGES:
+            body = PAGES[path]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.hits.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+def test_specs_and_image_share_one_search(stub_url, tmp_path):
+    fetcher = GSMAFetcher(cache_dir=tmp_path / "http", base_url=stub_url, rate=1000)
+
+    specs = fetch_phone_specs("Pixel 9", fetcher=fetcher)
+    image = fetch_phone_image("Pixel 9", fetcher=fetcher, images_dir=tmp_path / "img")
+
+    assert specs == {"Battery": "4700 mAh", "RAM": "12GB"}
+    assert (tmp_path / "img" / "pixel_9.jpg").read_bytes() == PAGES["/img/pixel_9.jpg"]
+    assert image.endswith("pixel_9.jpg")
+    assert StubHandler.hits["/results.php3"] == 1
+    assert StubHandler.hits["/pixel_9-123.php"] == 1
+
+
+def test_stale_cache_is_revalidated_with_etag(stub_url, tmp_path):
+    url = stub_url + "pixel_9-123.php"
+
+    first = GSMAFetcher(cache_dir=tmp_path, base_url=stub_url, rate=1000)
+    assert first.get(url) == PHONE_HTML
+
+    # New process, cache considered stale -> conditional GET -> 304
+    second = GSMAFetcher(cache_dir=tmp_path, base_url=stub_url, rate=1000, fresh_for=0)
+    assert second.get(url) == PHONE_HTML
+    assert second.stats["revalidated"] == 1
+
+    # Fresh cache -> no network at all
+    third = GSMAFetcher(cache_dir=tmp_path, base_url=stub_url, rate=1000)
+    assert third.get(url) == PHONE_HTML
+    assert third.stats["network"] == 0
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # first token is free, the next five wait ~1/50 s each
+    assert time.monotonic() - start >= 5 / 50 * 0.9
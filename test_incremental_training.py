@@ -0,0 +1,115 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+import ai_engine.recommender.train_satisfaction_model as tsm
+from ai_engine.recommender import model_registry
+
+
+def make_catalog(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n, len(tsm.NUMERIC_FEATURES))), columns=tsm.NUMERIC_FEATURES)
+    df.insert(0, "model", [f"Phone {seed}-{i}" for i in range(n)])
+    # Keep ranges fixed so growing the catalog does not rescale old rows
+    df.loc[0, tsm.NUMERIC_FEATURES] = 0.0
+    df.loc[1, tsm.NUMERIC_FEATURES] = 1.0
+    return df
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    monkeypatch.setattr(tsm, "PROCESSED_PATH", tmp_path / "processed_df.pkl")
+    monkeypatch.setattr(tsm, "RAW_PATH", tmp_path / "raw_df.pkl")
+    monkeypatch.setattr(tsm, "OUT_MODEL", tmp_path / "satisfaction_model.pkl")
+    monkeypatch.setattr(tsm, "OUT_METRICS", tmp_path / "satisfaction_metrics.json")
+    monkeypatch.setattr(tsm, "OUT_FLAT_MODEL", tmp_path / "satisfaction_forest.npz")
+    monkeypatch.setattr(tsm, "OUT_STATE", tmp_path / "satisfaction_train_state.json")
+    monkeypatch.setattr(tsm, "FEATURE_CACHE_DIR", tmp_path / "feature_cache")
+    monkeypatch.setattr(tsm, "SEARCH_SPACE", [("random_forest", {"n_estimators": 40, "max_depth": 6})])
+    monkeypatch.setattr(model_registry, "REGISTRY_DIR", tmp_path / "registry")
+    return tmp_path
+
+
+def test_feature_cache_is_keyed_by_catalog_version(assets):
+    df = make_catalog(200)
+    first = tsm.cached_features(df, is_processed=True)
+    second = tsm.cached_features(df, is_processed=True)
+
+    assert not first["cached"] and second["cached"]
+    assert np.array_equal(first["X"], second["X"])
+
+    grown = pd.concat([df, make_catalog(10, seed=1)], ignore_index=True)
+    assert tsm.cached_features(grown, is_processed=True)["version"] != first["version"]
+
+
+def test_split_is_stable_as_catalog_grows():
+    df = make_catalog(300)
+    grown = pd.concat([df, make_catalog(50, seed=1)], ignore_index=True)
+    assert np.array_equal(tsm.split_test_rows(grown)[:300], tsm.split_test_rows(df))
+
+
+def test_incremental_adds_trees_and_reports_savings(assets, capsys):
+    df = make_catalog(400)
+    joblib.dump(df, tsm.PROCESSED_PATH)
+    tsm.main(["--workers", "1"])
+
+    state = json.loads(tsm.OUT_STATE.read_text())
+    assert state["units"] == 40
+
+    # Unchanged catalog: nothing to do
+    tsm.main(["--incremental"])
+    assert "nothing to do" in capsys.readouterr().out
+
+    grown = pd.concat([df, make_catalog(20, seed=1)], ignore_index=True)
+    joblib.dump(grown, tsm.PROCESSED_PATH)
+    tsm.main(["--incremental"])
+
+    model = joblib.load(tsm.OUT_MODEL)
+    assert 40 < len(model.estimators_) < 50
+
+    metrics = json.loads(tsm.OUT_METRICS.read_text())
+    inc = metrics["incremental"]
+    assert inc["parent"] == state["version"]
+    assert inc["added_rows"] > 0
+    assert inc["estimated_full_seconds"] >= 0
+    assert "Warm start" in capsys.readouterr().out
+
+
+def test_rescaled_catalog_falls_back_to_full_retrain(assets, capsys):
+    df = make_catalog(200)
+    joblib.dump(df, tsm.PROCESSED_PATH)
+    tsm.main(["--workers", "1"])
+
+    rescaled = df.assign(price=df["price"] * 0.5)
+    joblib.dump(rescaled, tsm.PROCESSED_PATH)
+    tsm.main(["--incremental", "--workers", "1"])
+
+    assert "running full retrain" in capsys.readouterr().out
+    assert len(joblib.load(tsm.OUT_MODEL).estimators_) == 40
+
+
+def test_min_max_extension_still_warm_starts(assets, capsys):
+    from sklearn.preprocessing import MinMaxScaler
+
+    def save(raw):
+        processed = raw.copy()
+        processed[tsm.NUMERIC_FEATURES] = MinMaxScaler().fit_transform(raw[tsm.NUMERIC_FEATURES])
+        joblib.dump(raw, tsm.RAW_PATH)
+        joblib.dump(processed, tsm.PROCESSED_PATH)
+
+    raw = make_catalog(400)
+    save(raw)
+    tsm.main(["--workers", "1"])
+
+    # A pricier phone rescales every processed row, but no raw row changed
+    flagship = make_catalog(10, seed=1).assign(price=3.0)
+    save(pd.concat([raw, flagship], ignore_index=True))
+    tsm.main(["--incremental"])
+
+    assert "Warm start" in capsys.readouterr().out
+    assert len(joblib.load(tsm.OUT_MODEL).estimators_) > 40
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from ai_engine.recommender import data_loader as dl
+from ai_engine.recommender import ingest
+
+
+@pytest.mark.parametrize("chunksize", [97, 100_000])
+def test_streaming_matches_in_memory_pipeline(tmp_path, chunksize):
+    out = tmp_path / "raw_catalog.csv"
+    stats = ingest.ingest(output_path=out, chunksize=chunksize)
+
+    expected = dl.clean_features(dl.prepare_raw_dataframe(*dl.load_datasets())).reset_index(drop=True)
+    streamed = ingest.load_catalog(out)
+
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+    assert stats["rows_written"] == len(expected)
+    assert stats["duplicates_dropped"] == stats["rows_read"] - len(expected)
+
+
+def test_join_by_model_key(tmp_path):
+    main = tmp_path / "main.csv"
+    extra = tmp_path / "extra.csv"
+    cols = list(dl.MAIN_RENAME) + [
+        "Launched Price (China)", "Launched Price (India)", "Launched Price (Pakistan)",
+        "Launched Price (Dubai)", "Front Camera", "Processor",
+    ]
+    row = {
+        "Company Name": "Acme", "Launched Price (USA)": "USD 499", "Mobile Weight": "180g",
+        "RAM": "8GB", "Back Camera": "50MP", "Battery Capacity": "5,000mAh",
+        "Screen Size": "6.5 inches", "Launched Year": 2024,
+    }
+    pd.DataFrame(
+        [{**row, "Model Name": "One"}, {**row, "Model Name": "Two"}, {**row, "Model Name": "One"}],
+        columns=cols,
+    ).to_csv(main, index=False)
+    pd.DataFrame({
+        "Brand": ["Acme", "Acme"], "Model": ["Two", "Other"],
+        "5G": ["Yes", "No"], "Chipset": ["X1", "X2"], "Display_Type": ["OLED", "IPS LCD"],
+    }).to_csv(extra, index=False)
+
+    out = tmp_path / "out.csv"
+    stats = ingest.ingest(main, extra, out, chunksize=1, join_on="model")
+    df = ingest.load_catalog(out)
+
+    assert list(df["model"]) == ["One", "Two"]
+    assert df.loc[df["model"] == "Two", "chipset"].item() == "X1"
+    assert df.loc[df["model"] == "Two", "5G"].item() == 1
+    assert pd.isna(df.loc[df["model"] == "One", "chipset"].item())
+    assert stats["duplicates_dropped"] == 1
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import pytest
+
+from web import loadtest as lt
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def stub_app(environ, start_response):
+    body = json.loads(environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0)) or b"{}")
+    if body.get("mode") == "semantic":
+        start_response("200 OK", [("Content-Type", "application/json")])
+        return [b'{"results": [], "error": "Safe recommendation failure"}']
+    if body.get("mode") == "broken":
+        start_response("500 Internal Server Error", [])
+        return [b""]
+    start_response("200 OK", [("Content-Type", "application/json")])
+    return [b'{"results": []}']
+
+
+@pytest.fixture
+def server():
+    httpd = make_server("127.0.0.1", 0, stub_app, handler_class=QuietHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_port
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_stages_report_rps_latency_and_errors(server):
+    lt.wait_ready(server, timeout=5)
+    recorder = lt.Recorder()
+    mix = lt.parse_mix(["hybrid=2", "semantic=1", "broken=1"])
+    payloads = [{"price": 500.0, "nl_query": "cheap"}]
+
+    for stage, concurrency in enumerate([1, 2]):
+        lt.run_stage(server, concurrency, 0.3, payloads, mix, recorder, stage, t0=0.0)
+
+    stages = lt.summarize(recorder.records, [1, 2], 0.3)
+    assert [s["concurrency"] for s in stages] == [1, 2]
+    for s in stages:
+        assert s["requests"] > 0 and s["rps"] > 0
+        assert s["p50_ms"] <= s["p95_ms"] <= s["p99_ms"]
+        assert set(s["by_mode"]) <= {"hybrid", "semantic", "broken"}
+    total = {k: sum(s["outcomes"].get(k, 0) for s in stages) for k in ("ok", "app_error", "http_500")}
+    assert all(total.values())  # each outcome drawn at least once
+
+    assert lt.timeline(recorder.records, [])[0]["rps"] > 0
+
+
+def test_compare_and_mix():
+    assert lt.parse_mix(["hybrid=3", "semantic"]) == {"hybrid": 0.75, "semantic": 0.25}
+
+    before = {"stages": [{"concurrency": 4, "rps": 10.0, "p95_ms": 100.0, "error_rate": 0.0}]}
+    after = {"stages": [{"concurrency": 4, "rps": 20.0, "p95_ms": 50.0, "error_rate": 0.01}]}
+    (row,) = lt.compare_reports(after, before)
+    assert row["rps_ratio"] == 2.0 and row["p95_ratio"] == 0.5
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_process_tree_rss():
+    rss = lt.process_tree_rss_mb(os.getpid())
+    assert rss[os.getpid()] > 0
+
+
+def test_stage_against_the_django_app_passes_csrf(tmp_path):
+    # The real server enforces CsrfViewMiddleware (as Client(enforce_csrf_checks=True))
+    pytest.importorskip("django")
+    pytest.importorskip("sentence_transformers")  # imported by the views
+    port = lt.free_port()
+    proc = lt.start_server("wsgi", port, 1, tmp_path / "server.log")
+    recorder = lt.Recorder()
+    try:
+        lt.wait_ready(port, proc)
+        assert "X-CSRFToken" in lt.csrf_headers(port)
+        lt.run_stage(port, 1, 1.0, [{"price": 500.0, "ram": 8}], {"hybrid": 1.0}, recorder, 0, t0=0.0)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    outcomes = {r[4] for r in recorder.records}
+    assert "ok" in outcomes and outcomes <= {"ok", "app_error"}
@@ -0,0 +1,88 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.recommender import materialized as mat
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.default_rng(0)
+    n = 400
+    models = [f"Phone {i % 150} {rng.choice(['128GB', '256GB'])}" for i in range(n)]
+    return pd.DataFrame({
+        "model": models,
+        "brand": rng.choice(["Samsung", "Apple", "Xiaomi", "Google"], size=n),
+        "price": rng.uniform(80, 2000, size=n).round(),
+        "cam_resolution": rng.choice([12.0, 48.0, 50.0, 108.0, 200.0], size=n),
+        "battery": rng.integers(3000, 6000, size=n).astype(float),
+        "ram": rng.choice([4.0, 6.0, 8.0, 12.0], size=n),
+        "release_year": rng.integers(2018, 2025, size=n),
+    }, index=np.arange(1000, 1000 + n))
+
+
+def live_cold_start(catalog, brand, top_n=5):
+    # The view's live cold-start path
+    pool = catalog
+    if brand:
+        pool = pool[pool["brand"].str.lower() == brand.lower()]
+    pool = pool.assign(base=pool["model"].map(mat.base_model)).drop_duplicates(subset=["base"])
+    return pool.sort_values("release_year", ascending=False, kind="stable").head(top_n).index.tolist()
+
+
+def test_cold_start_matches_live_path(catalog):
+    m = mat.build_materialized(catalog)
+    for brand in ["", "samsung", "Apple", " xiaomi "]:
+        assert mat.lookup(m, "cold_start", brand) == live_cold_start(catalog, brand.strip())
+
+
+def test_presets_per_brand_bucket_and_profile(catalog):
+    m = mat.build_materialized(catalog)
+
+    rows = mat.lookup(m, "camera", "google", price=600, profile="battery", top_n=10)
+    picked = catalog.loc[rows]
+    assert (picked["brand"] == "Google").all()
+    assert picked["price"].between(500, 800, inclusive="left").all()
+    assert picked["model"].map(mat.base_model).is_unique
+    keys = list(zip(-picked["cam_resolution"], -picked["release_year"], -picked["battery"]))
+    assert keys == sorted(keys)
+
+    cheapest = catalog.loc[mat.lookup(m, "budget")]["price"].tolist()
+    assert cheapest == sorted(cheapest) and cheapest[0] == catalog["price"].min()
+
+
+def test_uncovered_requests(catalog):
+    m = mat.build_materialized(catalog, top_n=5)
+    assert mat.lookup(m, "cold_start", "nokia") == []
+    assert mat.lookup(m, "unknown") is None
+    assert mat.lookup(m, "camera", profile="gaming") is None
+    assert mat.lookup(m, "camera", top_n=6) is None
+    assert mat.lookup(None, "camera") is None
+
+
+def test_rebuilt_when_catalog_version_changes(catalog, tmp_path):
+    path = tmp_path / "lists.pkl"
+    first = mat.load_materialized(catalog, path)
+    assert path.exists()
+    assert mat.load_materialized(catalog, path)["catalog_version"] == first["catalog_version"]
+
+    newer = catalog.copy()
+    newer.loc[newer.index[0], ["release_year", "brand"]] = [2030, "Nokia"]
+    refreshed = mat.load_materialized(newer, path)
+    assert refreshed["catalog_version"] != first["catalog_version"]
+    assert mat.lookup(refreshed, "cold_start")[0] == newer.index[0]
+    assert joblib.load(path)["catalog_version"] == refreshed["catalog_version"]
+
+
+@pytest.mark.parametrize("content", [b"", b"not a pickle", None])
+def test_corrupt_artifact_is_rebuilt(catalog, tmp_path, content):
+    path = tmp_path / "lists.pkl"
+    if content is None:
+        joblib.dump(["wrong", "shape"], path)  # loads, but has no .get
+    else:
+        path.write_bytes(content)
+
+    materialized = mat.load_materialized(catalog, path)
+    assert materialized["catalog_version"] == mat.catalog_version(catalog)
+    assert joblib.load(path)["catalog_version"] == materialized["catalog_version"]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from ai_engine.vision3d.mesh_builder import _grid_faces, depth_to_mesh, write_glb_tiled
+
+
+def test_grid_faces_match_quad_loop():
+    h, w = 5, 7
+    expected = []
+    for y in range(h - 1):
+        for x in range(w - 1):
+            i = y * w + x
+            expected.append([i, i + 1, i + w])
+            expected.append([i + 1, i + w + 1, i + w])
+
+    assert np.array_equal(_grid_faces(w, 0, h - 1), np.array(expected))
+
+
+@pytest.mark.parametrize("strip_rows", [1, 3, 64])
+def test_tiled_glb_matches_in_memory_mesh(tmp_path, strip_rows):
+    rng = np.random.default_rng(0)
+    depth = rng.random((23, 17))
+    out = tmp_path / "tiled.glb"
+
+    info = write_glb_tiled(depth, out, depth_scale=0.5, strip_rows=strip_rows)
+    assert info["bytes"] == out.stat().st_size
+
+    loaded = trimesh.load(out, force="mesh", process=False)
+    reference = depth_to_mesh(depth, depth_scale=0.5)
+
+    assert len(loaded.vertices) == depth.size
+    assert len(loaded.faces) == info["faces"] == len(reference.faces)
+    assert np.allclose(
+        np.sort(loaded.vertices, axis=0), np.sort(reference.vertices, axis=0), atol=1e-6
+    )
+    assert np.array_equal(loaded.faces, _grid_faces(17, 0, 22))
+
+
+@pytest.mark.parametrize("strip_rows", [1, 4, 64])
+def test_both_paths_export_matching_vertex_normals(tmp_path, strip_rows):
+    yy, xx = np.mgrid[0:31, 0:29]
+    depth = 0.5 + 0.5 * np.sin(xx / 6.0) * np.cos(yy / 5.0)  # smooth surface
+
+    reference = depth_to_mesh(depth, depth_scale=0.3)
+    reference.export(tmp_path / "mesh.glb")
+    write_glb_tiled(depth, tmp_path / "tiled.glb", depth_scale=0.3, strip_rows=strip_rows)
+
+    normals = []
+    for name in ("mesh.glb", "tiled.glb"):
+        (mesh,) = trimesh.load(tmp_path / name, process=False).geometry.values()
+        assert "vertex_normals" in mesh._cache.cache  # loaded from the NORMAL attribute
+        order = np.lexsort(np.round(mesh.vertices[:, :2], 6).T)
+        normals.append(mesh.vertex_normals[order])
+
+    # trimesh weights by face angle, the tiled writer by face area
+    assert (np.einsum("ij,ij->i", *normals) > 0.999).all()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from ai_engine.recommender.model_registry import ModelRegistry
+from ai_engine.recommender.tree_ensemble import FlatForest
+from ai_engine.recommender.train_satisfaction_model import run_search
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 7))
+    y = X[:, 2] * 0.35 + X[:, 3] * 0.25 - X[:, 0] * 0.15
+    return X[:250], y[:250], X[250:], y[250:]
+
+
+@pytest.fixture(scope="module")
+def results(data):
+    space = [
+        ("random_forest", {"n_estimators": 10, "max_depth": 6}),
+        ("ridge", {"alpha": 1.0}),
+    ]
+    return run_search(*data, space=space, max_workers=1)
+
+
+def test_search_records_metrics_and_latency(results):
+    families = [info["family"] for _, info in results]
+    assert families == ["random_forest", "ridge"]
+    for _, info in results:
+        assert info["latency_ms"] > 0
+        assert info["fit_seconds"] >= 0
+        assert set(info["metrics"]) == {"mse", "mae", "r2"}
+
+
+def test_select_best_respects_latency_budget(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    for version, mae, latency in [("slow", 0.01, 5.0), ("fast", 0.05, 0.2), ("mid", 0.03, 1.0)]:
+        registry.register(version, {"stub": version}, {"latency_ms": latency, "metrics": {"mae": mae}})
+
+    assert registry.select_best()["version"] == "slow"
+    assert registry.select_best(max_latency_ms=1.0)["version"] == "mid"
+    assert registry.select_best(max_latency_ms=0.01)["version"] == "fast"  # nothing fits
+    assert registry.select_best(versions=["fast", "mid"])["version"] == "mid"
+
+
+def test_register_and_load_prefers_flat(tmp_path, results, data):
+    registry = ModelRegistry(tmp_path)
+    (forest, forest_info), (ridge, ridge_info) = results
+
+    registry.register("rf", forest, forest_info, flat_model=FlatForest.from_model(forest))
+    registry.register("ridge", ridge, ridge_info)
+    registry.set_active("rf")
+
+    assert registry.active == "rf"
+    assert isinstance(registry.load("rf"), FlatForest)
+    X_test = data[2]
+    assert np.array_equal(registry.load("rf").predict(X_test), forest.predict(X_test))
+    assert np.allclose(registry.load("ridge").predict(X_test), ridge.predict(X_test))
+
+    with pytest.raises(KeyError):
+        registry.set_active("missing")
+
+
+def test_select_best_stays_in_the_active_run(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    for version, run, mae in [("old-a", "20240101", 0.01), ("new-a", "20250101", 0.04), ("new-b", "20250101", 0.03)]:
+        registry.register(version, {"stub": version}, {"created_at": run, "latency_ms": 1.0, "metrics": {"mae": mae}})
+
+    assert registry.select_best()["version"] == "new-b"  # latest run, no active model
+    registry.set_active("old-a")
+    assert [e["version"] for e in registry.run_entries()] == ["old-a"]
+    assert registry.select_best()["version"] == "old-a"
+    assert registry.select_best(versions=["new-a", "old-a"])["version"] == "old-a"
@@ -0,0 +1,39 @@
+import pytest
+
+from ai_engine.semantic.keyword_automaton import KeywordAutomaton
+from ai_engine.semantic.nl_weight_mapper import BASE_WEIGHTS, detect_intents, infer_weights
+
+
+def test_automaton_whole_words_and_longest_match():
+    matcher = KeywordAutomaton({"a": ["light", "low light"], "b": ["he", "hers"], "c": ["fast"]})
+    found = [(label, phrase) for _, _, label, phrase in matcher.find("Low light at breakfast, hers")]
+    assert found == [("a", "low light"), ("b", "hers")]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("great camera for low light", {"camera": 1}),
+    ("for gaming and long lasting battery", {"performance": 1, "battery": 1}),
+    ("not heavy please", {"weight": 1}),
+    ("heavy is fine, cheap", {"weight": -1, "price": 1}),
+    ("I don't care about camera", {"camera": -1}),
+    ("no compromise, great camera", {"camera": 1}),
+    ("breakfast delight", {}),
+])
+def test_detect_intents(query, expected):
+    assert detect_intents(query) == expected
+
+
+def test_every_intent_changes_weights():
+    for query, feature in [
+        ("fast phone", "ram"),
+        ("compact phone", "weight"),
+        ("big screen phone", "display_size"),
+    ]:
+        weights = infer_weights(query)
+        base = sum(BASE_WEIGHTS.values())
+        assert weights[feature] > BASE_WEIGHTS[feature] / base
+        assert sum(weights.values()) == pytest.approx(1.0)
+
+
+def test_negated_intent_is_deemphasized():
+    assert infer_weights("not for gaming")["ram"] < infer_weights("")["ram"]
@@ -0,0 +1,72 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ai_engine.recommender.results import ResultBatch
+from web.recommender_app.pagination import ResultCache, decode_cursor, encode_cursor, page_bounds
+from web.recommender_app.serializers import ResultSerializer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_expires_and_stays_bounded():
+    clock = FakeClock()
+    cache = ResultCache(max_entries=2, ttl_s=10, clock=clock)
+
+    a = cache.put("a")
+    b = cache.put("b")
+    assert cache.get(a) == "a"  # a is now most recent
+    c = cache.put("c")
+    assert len(cache) == 2
+    assert cache.get(b) is None and cache.get(a) == "a" and cache.get(c) == "c"
+
+    clock.now = 10
+    assert cache.get(a) is None and len(cache) == 1
+    assert cache.get("unknown") is None
+
+
+def test_cache_is_thread_safe():
+    cache = ResultCache(max_entries=50, ttl_s=60)
+
+    def work(i):
+        token = cache.put(i)
+        return cache.get(token) in (i, None)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert all(pool.map(work, range(2000)))
+    assert len(cache) <= 50
+
+
+def test_cursor_and_page_bounds():
+    token, offset = decode_cursor(encode_cursor("tok:en", 15))
+    assert (token, offset) == ("tok:en", 15)
+    assert decode_cursor("garbage") is None
+    assert decode_cursor("tok:-1") is None
+    assert decode_cursor(":5") is None
+
+    assert page_bounds(0, 5, 12) == (0, 5, 5)
+    assert page_bounds(10, 5, 12) == (10, 12, None)
+    assert page_bounds(40, 5, 12) == (12, 12, None)
+
+
+def test_ndjson_stream_pages_through_batch():
+    catalog = pd.DataFrame({
+        "model": [f"M{i}" for i in range(120)],
+        "brand": "Acme",
+        "price": 300.0, "cam_resolution": 50.0, "battery": 5000.0, "ram": 8.0,
+        "display_size": 6.5, "display_type": "OLED", "weight": 190.0, "release_year": 2023,
+    })
+    serializer = ResultSerializer(catalog, "/m.glb")
+    batch = ResultBatch(list(range(119, -1, -1)), 0.5)
+
+    lines = list(serializer.ndjson({"total": len(batch)}, batch, chunk=50))
+    assert json.loads(lines[0]) == {"total": 120}
+    assert [json.loads(line)["model"] for line in lines[1:]] == [f"M{i}" for i in range(119, -1, -1)]
+    assert all(line.endswith("\n") for line in lines)
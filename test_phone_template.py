@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from ai_engine.vision3d.phone_template import instance_mesh, phone_transform
+
+
+def _legacy_placeholder(width, height, thickness):
+    box = trimesh.creation.box(extents=[width, thickness, height])
+    cam_size = [15, 2, 15]
+    camera_bump = trimesh.creation.box(extents=cam_size)
+    camera_bump.apply_translation([0, thickness/2 + cam_size[1]/2, height/2 - cam_size[2]/2])
+    return trimesh.util.concatenate([box, camera_bump])
+
+
+def test_instance_matches_legacy_placeholder():
+    specs = {"width_mm": 72, "height_mm": 160, "thickness_mm": 9}
+    mesh = instance_mesh(specs)
+    legacy = _legacy_placeholder(72, 160, 9)
+
+    assert np.allclose(mesh.vertices, legacy.vertices)
+    assert np.array_equal(mesh.faces, legacy.faces)
+
+
+def test_transform_is_relative_to_reference():
+    assert phone_transform({})["scale"] == [1.0, 1.0, 1.0]
+
+    big = phone_transform({"display_size": 6.9})
+    small = phone_transform({"display_size": 5.4})
+    assert big["scale"][2] > 1.0 > small["scale"][2]
+
+
+def test_shared_template_glb_scales_to_instances(tmp_path, monkeypatch):
+    from web.recommender_app.utils import phone_3d
+
+    monkeypatch.setattr(phone_3d, "STATIC_DIR", tmp_path)
+    (tmp_path / phone_3d.TEMPLATE_STATIC_PATH).parent.mkdir(parents=True)
+    path = phone_3d.shared_template_path()
+    assert path.endswith(phone_3d.TEMPLATE_STATIC_PATH)
+
+    # Body box only: the camera bump sticks out of the back (+y)
+    template = trimesh.load(path, force="mesh").vertices
+    template = template[template[:, 1] <= template[:, 1].min() * -1]
+    specs = {"width_mm": 75, "height_mm": 165, "thickness_mm": 9}
+    scaled = template * phone_transform(specs)["scale"]
+    assert np.allclose(np.ptp(scaled, axis=0), [75, 9, 165], atol=0.01)  # scale is rounded
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from ai_engine.semantic.query_parser import apply_constraints, parse_query
+
+BRANDS = ["Apple", "Samsung", "Xiaomi", "Google"]
+
+
+@pytest.mark.parametrize("query, field, ops", [
+    ("under $500", "price", {"max": 500.0}),
+    ("phone for 300 dollars", "price", {"max": 300.0}),
+    ("below 1.2k usd", "price", {"max": 1200.0}),
+    ("between $300 and $600", "price", {"min": 300.0, "max": 600.0}),
+    ("at least 8GB RAM", "ram", {"min": 8.0}),
+    ("12GB+ ram", "ram", {"min": 12.0}),
+    ("5000mAh battery", "battery", {"min": 5000.0}),
+    ("108MP camera", "cam_resolution", {"min": 108.0}),
+    ("lighter than 190g", "weight", {"max": 190.0}),
+    ("between 6.1 and 6.7 inch", "display_size", {"min": 6.1, "max": 6.7}),
+    ("released after 2022", "release_year", {"min": 2022.0}),
+])
+def test_numeric_constraints(query, field, ops):
+    assert parse_query(query, BRANDS)["constraints"][field] == ops
+
+
+def test_full_query_shape():
+    out = parse_query("Samsung or Xiaomi under $500 with at least 8GB RAM and 5G", BRANDS)
+    assert out["price"] == 500.0 and out["ram"] == 8.0
+    assert out["constraints"] == {
+        "price": {"max": 500.0},
+        "ram": {"min": 8.0},
+        "5G": {"eq": 1},
+        "brand": {"in": ["samsung", "xiaomi"]},
+    }
+    assert "weight" not in out["constraints"]  # "5G" is not 5 grams
+
+
+def test_storage_and_preferences_are_not_constraints():
+    out = parse_query("256GB storage, 6.5 inch screen", BRANDS)
+    assert out["constraints"] == {}
+    assert out["display_size"] == 6.5
+
+
+def test_brands_aliases_and_negation():
+    assert parse_query("an iphone", BRANDS)["brand"] == "apple"
+    out = parse_query("not samsung, no 5g needed", BRANDS)
+    assert out["constraints"] == {"brand": {"not_in": ["samsung"]}}
+
+
+def test_apply_constraints_filters_and_falls_back():
+    df = pd.DataFrame({
+        "brand": ["Samsung", "Xiaomi", "Apple"],
+        "price": [450.0, 300.0, 999.0],
+        "ram": [8.0, 6.0, 8.0],
+        "5G": [1.0, 1.0, 1.0],
+    })
+    out = apply_constraints(df, parse_query("Samsung or Xiaomi under $500, 8GB RAM", BRANDS)["constraints"])
+    assert out["brand"].tolist() == ["Samsung"]
+
+    impossible = parse_query("under $10", BRANDS)["constraints"]
+    assert len(apply_constraints(df, impossible)) == 3
+    assert apply_constraints(df, impossible, fallback=False).empty
+
+
+def test_ranges_storage_and_bare_years():
+    assert parse_query("between $1k to $2k", BRANDS)["constraints"] == {"price": {"min": 1000.0, "max": 2000.0}}
+    assert parse_query("under 1tb", BRANDS)["constraints"] == {}
+
+    out = parse_query("samsung phone 2024", BRANDS)
+    assert out["release_year"] == 2024
+    assert "release_year" not in out["constraints"]
+
+
+def test_storage_variants_are_not_ram():
+    assert parse_query("iphone 15 128gb", BRANDS)["constraints"] == {"brand": {"in": ["apple"]}}
+    out = parse_query("samsung 256GB under 800", BRANDS)
+    assert out["constraints"] == {"brand": {"in": ["samsung"]}, "price": {"max": 800.0}}
+    assert out["ram"] == 0.0
+    assert parse_query("12gb ram, 512 gb", BRANDS)["constraints"] == {"ram": {"min": 12.0}}
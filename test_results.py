@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.recommender.explainability import explain_recommendation, scores_to_matrix
+from ai_engine.recommender.results import FEATURES, ResultBatch
+from web.recommender_app.serializers import ResultSerializer, catalog_fragments
+
+
+@pytest.fixture
+def catalog():
+    return pd.DataFrame({
+        "model": ["A1", "B2 128GB", "C3"],
+        "brand": ["Acme", "Bolt", "Core"],
+        "price": [199.0, 499.0, float("nan")],
+        "cam_resolution": [12.0, 50.0, 108.0],
+        "battery": [4000.0, 5000.0, 6000.0],
+        "ram": [4.0, 8.0, 12.0],
+        "display_size": [6.1, 6.5, 6.8],
+        "display_type": ["IPS", "AMOLED", "OLED"],
+        "weight": [170.0, 190.0, 210.0],
+        "release_year": [2021, 2022, 2023],
+    })
+
+
+def test_batch_slices():
+    matches = np.array([[0.9] * len(FEATURES), [0.1] + [np.nan] * (len(FEATURES) - 1)])
+    batch = ResultBatch([2, 0], [0.8, 0.3], matches)
+
+    assert batch.rows.tolist() == [2, 0] and batch.scores.tolist() == [0.8, 0.3]
+    with pytest.raises(AttributeError):
+        batch.extra = 1  # __slots__
+    with pytest.raises(TypeError):
+        batch[0]
+
+    tail = batch[1:]
+    assert len(tail) == 1 and tail.rows.tolist() == [0] and tail.matches.shape == (1, len(FEATURES))
+    assert len(ResultBatch.empty()) == 0
+    with pytest.raises(ValueError):
+        ResultBatch([0, 1], [0.5, 0.5], np.zeros((1, len(FEATURES))))
+
+
+def test_explanations_match_per_item():
+    rng = np.random.default_rng(0)
+    feature_scores = [
+        dict(zip(FEATURES, rng.uniform(size=len(FEATURES)))),
+        {"price": 0.2, "battery": 0.95},
+    ]
+    matches, _ = scores_to_matrix(feature_scores, FEATURES)
+    batch = ResultBatch([2, 0], [0.9, 0.7], matches)
+
+    assert batch.explanations() == [explain_recommendation(s) for s in feature_scores]
+    assert ResultBatch([1], 0.5).explanations() == [explain_recommendation({})]
+
+
+def test_serializer_writes_full_items(catalog):
+    serializer = ResultSerializer(catalog, "/static/phone.glb")
+    batch = ResultBatch([1, 2], [0.12345, 0.5])
+    meta = {"engine_mode": "hybrid", "cold_start_used": False}
+
+    body = serializer.render(meta, serializer.items(batch, batch.explanations()))
+    data = json.loads(body)
+
+    assert list(data) == ["engine_mode", "cold_start_used", "results"]
+    first = data["results"][0]
+    assert list(first) == ["brand", "model", "score", "why", "pros", "cons", "specs", "3d_model_url", "3d_transform"]
+    assert first["model"] == "B2 128GB" and first["score"] == 0.123
+    assert first["specs"]["display"] == '6.5" AMOLED' and first["specs"]["year"] == 2022
+    assert first["3d_model_url"] == "/static/phone.glb"
+
+    head, tail = catalog_fragments(catalog.iloc[2].to_dict(), "/m.glb")
+    assert head.startswith('{"brand": "Core"') and tail.endswith("}")
+    assert json.loads(serializer.render({}, [])) == {"results": []}
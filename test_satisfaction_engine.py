@@ -0,0 +1,76 @@
+import joblib
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.ensemble import RandomForestRegressor
+
+from ai_engine.recommender import satisfaction_engine as se
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    raw_df = joblib.load(se.ASSETS_DIR / "raw_df.pkl")
+    scaler = joblib.load(se.SCALER_PATH)
+
+    X = scaler.transform(raw_df[se.NUMERIC_FEATURES].astype(float))
+    y = X[:, 2] + X[:, 3] - 0.5 * X[:, 0]
+    model = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=0).fit(X, y)
+
+    model_path = tmp_path / "satisfaction_model.pkl"
+    joblib.dump(model, model_path)
+    monkeypatch.setattr(se, "MODEL_PATH", model_path)
+    return raw_df, model, scaler
+
+
+def test_precomputed_lookup_matches_per_request_inference(catalog):
+    raw_df, model, scaler = catalog
+    scored = se.attach_satisfaction_scores(raw_df, model=model, scaler=scaler)
+    engine = se.SatisfactionRecommender(scored)
+
+    pool = raw_df[raw_df["price"] < 600]
+    ranked = engine.recommend({}, top_n=5, df_override=pool)
+
+    preds = model.predict(scaler.transform(pool[se.NUMERIC_FEATURES].astype(float)))
+    norm = (preds - preds.min()) / (preds.max() - preds.min())
+    assert np.allclose(ranked["match_score"].to_numpy(), np.sort(norm)[::-1][:5])
+    assert list(ranked.columns) == ["model", "match_score", "feature_scores"]
+    assert "match_score" not in raw_df.columns
+
+
+def test_missing_score_column_is_computed_once(catalog):
+    raw_df, model, scaler = catalog
+    engine = se.SatisfactionRecommender(raw_df)
+
+    expected = model.predict(scaler.transform(raw_df[se.NUMERIC_FEATURES].astype(float)))
+    assert np.allclose(engine.scores_for(raw_df), expected)
+
+
+def test_latency_budget_selects_the_served_scores(catalog, tmp_path, monkeypatch):
+    from sklearn.linear_model import Ridge
+    from ai_engine.recommender import model_registry
+    from ai_engine.recommender.model_registry import ModelRegistry
+
+    raw_df, forest, scaler = catalog
+    X = scaler.transform(raw_df[se.NUMERIC_FEATURES].astype(float))
+    ridge = Ridge().fit(X, X[:, 1])
+
+    monkeypatch.setattr(model_registry, "REGISTRY_DIR", tmp_path / "registry")
+    registry = ModelRegistry()
+    run = {"created_at": "20250101T000000"}
+    registry.register("rf", forest, {**run, "latency_ms": 5.0, "metrics": {"mae": 0.01}})
+    registry.register("ridge", ridge, {**run, "latency_ms": 0.1, "metrics": {"mae": 0.2}})
+    registry.set_active("rf")
+
+    scored = se.attach_satisfaction_scores(raw_df, model=forest, scaler=scaler, version="rf")
+
+    # No budget / a budget the promoted model fits: precomputed scores
+    for budget in (None, 10.0):
+        engine = se.SatisfactionRecommender(scored, latency_budget_ms=budget)
+        assert engine.model_version == "rf"
+        assert np.array_equal(engine.scores_for(raw_df), scored[se.SCORE_COLUMN].to_numpy())
+
+    # A tighter budget serves the faster model's scores
+    engine = se.SatisfactionRecommender(scored, latency_budget_ms=1.0)
+    assert engine.model_version == "ridge"
+    assert np.allclose(engine.scores_for(raw_df), ridge.predict(X))
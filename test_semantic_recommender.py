@@ -0,0 +1,83 @@
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+
+DIM = 16
+
+
+def hash_encoder(text):
+    # Deterministic bag-of-words vector, no model download
+    vec = np.zeros(DIM, dtype=np.float32)
+    for word in text.lower().split():
+        vec[zlib.crc32(word.encode()) % DIM] += 1.0
+    return vec
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "brand": rng.choice(["Samsung", "Apple", "Xiaomi"], size=n),
+        "model": [f"Phone {i}" for i in range(n)],
+        "cam_resolution": rng.integers(12, 200, size=n),
+        "battery": rng.integers(3000, 6000, size=n),
+        "price": rng.uniform(100, 1500, size=n),
+    })
+
+
+@pytest.fixture
+def recommender(catalog):
+    embeddings = np.random.default_rng(1).normal(size=(len(catalog), DIM))
+    return SemanticSmartphoneRecommender(catalog, embeddings=embeddings, encoder=hash_encoder)
+
+
+def expected(recommender, query, top_n):
+    q = hash_encoder(query)
+    E = recommender.embeddings
+    sims = (E @ q) / (np.linalg.norm(q) or 1.0)
+    return np.argsort(-sims, kind="stable")[:top_n]
+
+
+def test_rank_matches_brute_force(recommender):
+    rows, scores = recommender.rank("cheap samsung camera", top_n=10)
+    np.testing.assert_array_equal(rows, expected(recommender, "cheap samsung camera", 10))
+    assert np.all(np.diff(scores) <= 0)
+    assert len(recommender.rank("x", top_n=0)[0]) == 0
+    assert len(recommender.rank("x", top_n=10_000)[0]) == len(recommender.df)
+
+
+def test_recommend_leaves_shared_state_untouched(recommender, catalog):
+    before = recommender.df.copy()
+    result = recommender.recommend("long battery", top_n=5)
+
+    assert list(result.columns[-2:]) == ["match_score", "feature_scores"]
+    pd.testing.assert_frame_equal(recommender.df, before)
+    assert "match_score" not in recommender.df
+    with pytest.raises(ValueError):
+        recommender.embeddings[0, 0] = 1.0
+
+
+def test_concurrent_recommend_is_consistent(recommender):
+    queries = [f"{w} phone {i}" for i in range(40) for w in ("camera", "battery", "gaming")]
+    truth = {q: recommender.df["model"].iloc[expected(recommender, q, 5)].tolist() for q in queries}
+
+    def call(q):
+        return q, recommender.recommend(q, top_n=5)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(call, queries * 5))
+
+    for q, df in results:
+        assert df["model"].tolist() == truth[q]
+        assert np.all(np.diff(df["match_score"].to_numpy()) <= 0)
+
+
+def test_embedding_count_must_match(catalog):
+    with pytest.raises(ValueError):
+        SemanticSmartphoneRecommender(catalog, embeddings=np.zeros((3, DIM)), encoder=hash_encoder)
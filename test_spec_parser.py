@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_engine.recommender import spec_parser as sp
+
+
+@pytest.mark.parametrize("kind, raw, expected", [
+    ("battery", "5,110mAh", 5110.0),
+    ("battery", "4085 mAh", 4085.0),
+    ("capacity", "1.5GB", 1.5),
+    ("capacity", "1TB", 1024.0),
+    ("capacity", "512MB", 0.5),
+    ("weight", "222.8g", 222.8),
+    ("weight", "0.2 kg", 200.0),
+    ("display", "6.1 inches", 6.1),
+    ("display", '6.7"', 6.7),
+    ("camera", "48MP + 13MP + 12MP", 48.0),
+    ("camera", "13MP (f/1.8, AF)", 13.0),
+    ("battery", 5000, 5000.0),
+])
+def test_parse_value_units(kind, raw, expected):
+    assert sp.parse_value(raw, kind) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("USD 799", (799.0, "USD")),
+    ("USD 634.99", (634.99, "USD")),
+    ("PKR 224,999", (224999.0, "PKR")),
+    ("INR 1,04,999", (104999.0, "INR")),
+    ("$799", (799.0, "USD")),
+    ("799 EUR", (799.0, "EUR")),
+    ("799", (799.0, None)),
+])
+def test_parse_price(raw, expected):
+    assert sp.parse_price(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["Not available", "USD 396,22", "USD 5 EUR", ""])
+def test_malformed_price_is_nan(raw):
+    assert np.isnan(sp.parse_price(raw)[0])
+
+
+def test_parse_column_missing_vs_malformed():
+    values = pd.Series(["8GB", None, "unknown", "8GB", np.nan, "12GB"])
+    out = sp.parse_column(values, "capacity")
+
+    assert np.array_equal(out, [8.0, np.nan, np.nan, 8.0, np.nan, 12.0], equal_nan=True)
+    assert sp.malformed_values(values, "capacity") == ["unknown"]
+    with pytest.raises(sp.SpecParseError, match="1 malformed capacity"):
+        sp.parse_column(values, "capacity", errors="raise")
+
+
+def test_price_column_rejects_other_currency():
+    amounts, currencies = sp.parse_price_column(["USD 799", "PKR 1,000", "899", None], currency="USD")
+    assert np.array_equal(amounts, [799.0, np.nan, 899.0, np.nan], equal_nan=True)
+    assert list(currencies) == ["USD", "PKR", None, None]  # reported, amount rejected
+
+
+def test_faster_than_legacy_passes():
+    result = sp.benchmark(n_rows=50_000, repeats=1)
+    assert result["speedup"] > 1
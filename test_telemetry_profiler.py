@@ -0,0 +1,91 @@
+import io
+import time
+
+from ai_engine.telemetry.profiler import (
+    ProfileRing,
+    RequestProfiler,
+    StackSampler,
+    aggregate,
+    write_collapsed,
+)
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampler_captures_the_tracked_thread():
+    sampler = StackSampler(interval=0.001)
+    tid = sampler.track()
+    busy_wait(0.1)
+    samples = sampler.untrack(tid)
+
+    assert sum(samples.values()) > 5
+    assert any(stack.endswith("test_telemetry_profiler:busy_wait") for stack in samples)
+    assert all(";" in stack for stack in samples)
+
+
+def test_ring_keeps_only_the_newest(tmp_path):
+    ring = ProfileRing(tmp_path, max_profiles=3)
+    for i in range(5):
+        ring.write({"i": i, "samples": {}})
+
+    assert [p["i"] for p in ring.load()] == [2, 3, 4]
+
+
+def test_slow_requests_are_kept_fast_ones_dropped(tmp_path):
+    profiler = RequestProfiler(tmp_path, latency_threshold_ms=50, interval=0.001)
+
+    with profiler.track(context=lambda: {"mode": "hybrid", "input": {"price": 500.0}}):
+        busy_wait(0.001)
+    assert profiler.ring.load() == []
+
+    with profiler.track(context=lambda: {"mode": "hybrid", "input": {"price": 500.0}}) as trace:
+        trace["note"] = "slow"
+        busy_wait(0.08)
+
+    (profile,) = profiler.ring.load()
+    assert profile["reason"] == "slow" and profile["latency_ms"] >= 50
+    assert profile["input"] == {"price": 500.0} and profile["note"] == "slow"
+    assert profile["samples"]
+
+
+def test_sample_rate_and_disabled(tmp_path):
+    with RequestProfiler(tmp_path / "off").track() as trace:
+        assert trace is None
+
+    profiler = RequestProfiler(tmp_path / "all", sample_rate=1.0, interval=0.001)
+    with profiler.track():
+        pass
+    assert profiler.ring.load()[0]["reason"] == "sampled"
+
+
+def test_aggregate_to_collapsed_stacks():
+    profiles = [
+        {"mode": "hybrid", "latency_ms": 300, "samples": {"view;engine": 3, "view;explain": 1}},
+        {"mode": "hybrid", "latency_ms": 10, "samples": {"view;engine": 2}},
+        {"mode": "semantic", "latency_ms": 500, "samples": {"view;encode": 7}},
+    ]
+
+    assert aggregate(profiles, mode="hybrid") == {"view;engine": 5, "view;explain": 1}
+    assert aggregate(profiles, min_latency_ms=100) == {"view;engine": 3, "view;explain": 1, "view;encode": 7}
+
+    out = io.StringIO()
+    assert write_collapsed(aggregate(profiles), out) == 3
+    assert out.getvalue().splitlines()[0] == "view;encode 7"
+
+
+def test_profile_write_errors_are_logged_not_raised(tmp_path, caplog):
+    profiler = RequestProfiler(tmp_path, sample_rate=1.0, interval=0.001)
+
+    def broken_context():
+        raise RuntimeError("context exploded")
+
+    with caplog.at_level("ERROR", logger="ai_engine.telemetry.profiler"):
+        with profiler.track(context=broken_context):
+            busy_wait(0.001)
+
+    assert profiler.ring.load() == []
+    assert "context exploded" in caplog.text
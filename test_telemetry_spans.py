@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from ai_engine.telemetry import spans as tel
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    fresh = tel.StageMetrics()
+    monkeypatch.setattr(tel, "METRICS", fresh)
+    return fresh
+
+
+def test_spans_feed_histograms_and_request_collector(metrics):
+    @tel.timed("explain")
+    def explain():
+        return "ok"
+
+    with tel.collect_spans() as collected:
+        with tel.span("view"):
+            with tel.span("filter"):
+                pass
+            assert explain() == "ok"
+            explain()
+
+    assert [stage for stage, _ in collected] == ["filter", "explain", "explain", "view"]
+    assert metrics.histogram("explain").snapshot()["count"] == 2
+
+    header = tel.server_timing(collected)
+    assert header.startswith("filter;dur=")
+    assert header.count("explain;dur=") == 1  # repeated stages are summed
+
+
+def test_spans_outside_a_request_are_not_collected(metrics):
+    with tel.collect_spans() as collected:
+        pass
+    with tel.span("filter"):
+        pass
+    assert collected == []
+    assert metrics.histogram("filter").snapshot()["count"] == 1
+
+
+def test_errors_are_counted_per_stage(metrics):
+    with pytest.raises(KeyError):
+        with tel.span("engine.hybrid"):
+            raise KeyError("brand")
+    assert metrics.errors() == {"engine.hybrid": 1}
+    assert metrics.histogram("engine.hybrid").snapshot()["count"] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = tel.Histogram(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.05, 2.0):
+        hist.observe(seconds)
+
+    snap = hist.snapshot()
+    assert snap["buckets"] == [1, 3, 4]
+    assert snap["count"] == 4 and snap["sum"] == pytest.approx(2.105)
+    assert hist.quantile(0.5) == 0.1
+
+
+def test_threads_do_not_share_request_spans(metrics):
+    seen = {}
+
+    def request(name):
+        with tel.collect_spans() as collected:
+            for _ in range(50):
+                with tel.span(name):
+                    pass
+        seen[name] = {stage for stage, _ in collected}
+
+    threads = [threading.Thread(target=request, args=(f"stage{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == {f"stage{i}": {f"stage{i}"} for i in range(4)}
+
+
+def test_prometheus_text_format(metrics):
+    with tel.span("filter"):
+        pass
+    with pytest.raises(ValueError):
+        with tel.span("engine.semantic"):
+            raise ValueError
+
+    text = tel.render_prometheus()
+    assert "# TYPE recommend_stage_seconds histogram" in text
+    assert 'recommend_stage_seconds_bucket{stage="filter",le="+Inf"} 1' in text
+    assert 'recommend_stage_seconds_count{stage="engine.semantic"} 1' in text
+    assert 'recommend_stage_errors_total{stage="engine.semantic"} 1' in text
+    assert text.endswith("\n")
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from ai_engine.recommender.tree_ensemble import FlatForest
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(42)
+    X = rng.random((600, 7))
+    y = X[:, 2] * 0.35 + X[:, 3] * 0.25 - X[:, 0] * 0.15 + rng.normal(0, 0.01, 600)
+    return X, y
+
+
+@pytest.mark.parametrize("model", [
+    RandomForestRegressor(n_estimators=150, max_depth=12, random_state=42, n_jobs=1),
+    ExtraTreesRegressor(n_estimators=20, random_state=0),
+    DecisionTreeRegressor(max_depth=5, random_state=0),
+])
+def test_exact_parity_with_sklearn(data, model):
+    X, y = data
+    model.fit(X, y)
+    flat = FlatForest.from_model(model)
+
+    X_new = np.random.default_rng(1).random((1000, 7))
+    assert np.array_equal(flat.predict(X_new), model.predict(X_new))
+    assert np.array_equal(flat.predict(X_new, chunk_size=7), model.predict(X_new))
+
+
+def test_save_load_roundtrip(data, tmp_path):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    path = tmp_path / "forest.npz"
+    FlatForest.from_model(model).save(path)
+
+    assert np.array_equal(FlatForest.load(path).predict(X), model.predict(X))
@@ -0,0 +1,164 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("django")
+pytest.importorskip("sentence_transformers")  # imported by the views
+
+# The Django project lives in web/ (settings module "web.settings")
+sys.path.append(str(Path(__file__).resolve().parent / "web"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "web.settings")
+
+import django
+
+django.setup()
+
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from ai_engine.recommender.results import ResultBatch
+from recommender_app import views
+from recommender_app.pagination import ResultCache
+
+USER = {"price": 500, "ram": 8, "battery": 5000}
+
+
+class StubEngine:
+    """
+    Hybrid engine stand-in: the first top_n catalog rows, counting calls.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def results(self, user_input, top_n=5):
+        self.calls.append(top_n)
+        rows = np.arange(top_n)
+        return ResultBatch(rows, np.linspace(1.0, 0.5, top_n))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module", autouse=True)
+def test_environment():
+    setup_test_environment()  # allows the test client's host
+    yield
+    teardown_test_environment()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    stub = StubEngine()
+    monkeypatch.setattr(views, "get_hybrid_engine", lambda: stub)
+    monkeypatch.setattr(views, "result_cache", ResultCache(ttl_s=60, clock=Clock()))
+    return stub
+
+
+def post(payload, **headers):
+    return Client().post("/recommend/", json.dumps(payload), content_type="application/json", **headers)
+
+
+def test_cursor_serves_next_page_without_rescoring(engine):
+    first = json.loads(post({**USER, "top_n": 6, "page_size": 4}).content)
+    assert (first["total"], first["offset"], len(first["results"])) == (6, 0, 4)
+
+    second = json.loads(post({"cursor": first["next_cursor"]}).content)
+    assert (second["offset"], len(second["results"]), second["next_cursor"]) == (4, 2, None)
+    assert second["results"][0]["model"] == views.raw_df["model"].iloc[4]
+    assert engine.calls == [6]
+
+
+def test_expired_or_invalid_cursor(engine):
+    cursor = json.loads(post({**USER, "top_n": 4, "page_size": 2}).content)["next_cursor"]
+    views.result_cache._clock.now += 61
+
+    for bad in (cursor, "not-a-cursor"):
+        body = json.loads(post({"cursor": bad}).content)
+        assert body == {"results": [], "error": "Cursor expired or invalid"}
+    assert engine.calls == [4]
+
+
+@override_settings(RECOMMEND_MAX_TOP_N=3)
+def test_top_n_is_capped(engine):
+    body = json.loads(post({**USER, "top_n": 50}).content)
+    assert engine.calls == [3]
+    assert body["total"] == 3 and body["next_cursor"] is None
+
+    assert "top_n must be an integer" in json.loads(post({**USER, "top_n": "many"}).content)["error"]
+
+
+@pytest.mark.parametrize("payload, headers", [
+    ({"stream": True}, {}),
+    ({}, {"HTTP_ACCEPT": "application/x-ndjson"}),
+])
+def test_ndjson_stream(engine, payload, headers):
+    response = post({**USER, "top_n": 4, **payload}, **headers)
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert lines[0]["engine_mode"] == "hybrid" and lines[0]["total"] == 4
+    assert [item["model"] for item in lines[1:]] == views.raw_df["model"].iloc[:4].tolist()
+
+
+@override_settings(RECOMMEND_SERVER_TIMING=True)
+def test_server_timing_names_the_engine_stage(engine):
+    timing = post({**USER, "mode": "hybrid"})["Server-Timing"]
+    stages = {part.split(";")[0] for part in timing.split(", ")}
+    assert {"view", "filter", "engine.hybrid", "response"} <= stages
+
+    unknown = post({**USER, "mode": "telepathy"})["Server-Timing"]
+    assert "engine.unknown" in unknown and "telepathy" not in unknown
+
+
+def test_presets_are_served_from_materialized_lists(engine, monkeypatch):
+    seen = []
+
+    def lookup(lists, name, **kwargs):
+        seen.append(name)
+        return views.raw_df.index[:3].tolist()
+
+    monkeypatch.setattr(views, "lookup", lookup)
+    preset = views.PRESETS[0]
+
+    body = json.loads(post({**USER, "preset": preset.upper()}).content)
+    assert body["preset"] == preset and body["total"] == 3
+    assert json.loads(post({}).content)["cold_start_used"] is True
+    assert seen == [preset, "cold_start"]
+
+    # Unknown preset: live engine
+    assert json.loads(post({**USER, "preset": "nope"}).content)["preset"] is None
+    assert engine.calls == [views.DEFAULT_TOP_N]
+
+
+@pytest.mark.parametrize("getter, attr, cls", [
+    ("get_hybrid_engine", "_hybrid_engine", "SmartphoneRecommender"),
+    ("get_satisfaction_engine", "_satisfaction_engine", "SatisfactionRecommender"),
+    ("get_fusion_engine", "_fusion_engine", "FusionRecommender"),
+])
+def test_concurrent_first_requests_build_one_engine(monkeypatch, getter, attr, cls):
+    built = []
+
+    def slow_engine(*args, **kwargs):
+        time.sleep(0.05)
+        built.append(object())
+        return built[-1]
+
+    monkeypatch.setattr(views, attr, None)
+    monkeypatch.setattr(views, cls, slow_engine)
+    monkeypatch.setattr(views, "get_fusion_semantic_engine", lambda: None)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        engines = list(pool.map(lambda _: getattr(views, getter)(), range(8)))
+    assert len(built) == 1 and all(e is built[0] for e in engines)
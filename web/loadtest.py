@@ -0,0 +1,487 @@
+"""
+LOCAL LOAD TEST
+===============
+End-to-end throughput of the Django service on one Linux box, offline.
+
+Run (from web/):
+    python loadtest.py --server wsgi --ramp 1 4 8 16 --stage-seconds 15
+    python loadtest.py --server asgi --mix hybrid=0.5 satisfaction=0.3 semantic=0.2
+    python loadtest.py --compare loadtest_report.json   # diff against an earlier run
+
+1. Start the app in a subprocess:
+     wsgi  -> gunicorn when installed, else the stdlib threading server
+     asgi  -> uvicorn (required for ASGI)
+2. Build request payloads from the catalog (known-item profiles, see
+   ai_engine.evaluation.evaluate) and draw a mode per request from --mix
+3. Ramp concurrency stage by stage; each client thread sends requests
+   back to back, with the CSRF cookie + X-CSRFToken header the browser
+   sends (token taken from the index page, like index.js)
+4. Sample the RSS of the server process tree every second (/proc)
+5. Report per stage RPS, latency percentiles, HTTP and application error
+   rates (the view answers 200 with an "error" key on failure), and a
+   per-second timeline, to a JSON report file
+
+The client side uses the stdlib only (no Django import here).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from pathlib import Path
+
+import numpy as np
+
+WEB_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = WEB_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_MIX = {"hybrid": 0.5, "satisfaction": 0.3, "semantic": 0.2}
+DEFAULT_RAMP = [1, 2, 4, 8]
+DEFAULT_STAGE_SECONDS = 10.0
+DEFAULT_REPORT = WEB_DIR / "loadtest_report.json"
+STARTUP_TIMEOUT_S = 120.0
+REQUEST_TIMEOUT_S = 60.0
+
+
+# -------------------------
+# SERVER
+# -------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def server_command(kind: str, port: int, workers: int) -> list:
+    if kind == "asgi":
+        if not _installed("uvicorn"):
+            raise SystemExit("ASGI load test needs uvicorn (pip install uvicorn)")
+        return [sys.executable, "-m", "uvicorn", "web.asgi:application",
+                "--host", "127.0.0.1", "--port", str(port),
+                "--workers", str(workers), "--log-level", "warning"]
+
+    if _installed("gunicorn"):
+        return [sys.executable, "-m", "gunicorn", "web.wsgi:application",
+                "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+                "--log-level", "warning"]
+    return [sys.executable, str(Path(__file__).resolve()), "--serve-wsgi", str(port)]
+
+
+def serve_wsgi(port: int):
+    """
+    Fallback WSGI server: stdlib, one thread per request.
+    """
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "web.settings")
+    from web.wsgi import application
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    with make_server("127.0.0.1", port, application, ThreadingWSGIServer, QuietHandler) as httpd:
+        httpd.serve_forever()
+
+
+def start_server(kind: str, port: int, workers: int, log_path: Path) -> subprocess.Popen:
+    # Server output goes to a file: an unread pipe would fill up and
+    # block the server on its own error logging
+    with open(log_path, "wb") as log:
+        return subprocess.Popen(
+            server_command(kind, port, workers),
+            cwd=WEB_DIR,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+
+def wait_ready(port: int, proc: subprocess.Popen = None, timeout: float = STARTUP_TIMEOUT_S):
+    """
+    Block until the app answers (any status: the first request also
+    pays Django's URL / asset loading).
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+            conn.request("GET", "/metrics/")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise TimeoutError(f"server not ready after {timeout:.0f}s")
+
+
+# -------------------------
+# WORKER RSS (/proc)
+# -------------------------
+def _children(pid: int) -> list:
+    kids = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                kids += [int(c) for c in f.read().split()]
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return kids
+
+
+def process_tree_rss_mb(pid: int) -> dict:
+    """
+    pid -> RSS (MB) for pid and all its descendants.
+    """
+    rss, stack = {}, [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss[p] = int(line.split()[1]) / 1024
+                        break
+        except FileNotFoundError:
+            continue
+        stack += _children(p)
+    return rss
+
+
+# -------------------------
+# PAYLOADS
+# -------------------------
+def build_payloads(n: int = 500, seed: int = 0) -> list:
+    """
+    Request bodies (view field names) from catalog-derived profiles.
+    """
+    from ai_engine.evaluation.evaluate import make_profiles
+    from ai_engine.evaluation.synthetic_catalog import load_source_catalog
+
+    payloads = []
+    for p in make_profiles(load_source_catalog(), n, seed=seed):
+        ui = p["input"]
+        payloads.append({
+            "brand": ui["brand"],
+            "price": ui["price"],
+            "camera": ui["cam_resolution"],
+            "battery": ui["battery"],
+            "ram": ui["ram"],
+            "display_size": ui["display_size"],
+            "weight": ui["weight"],
+            "release_year": ui["release_year"],
+            "performance": ui["performance_profile"],
+            "nl_query": p["nl_query"],
+        })
+    return payloads
+
+
+def parse_mix(items) -> dict:
+    mix = {}
+    for item in items:
+        mode, _, weight = item.partition("=")
+        mix[mode] = float(weight or 1)
+    total = sum(mix.values())
+    return {m: w / total for m, w in mix.items()}
+
+
+# -------------------------
+# LOAD
+# -------------------------
+class Recorder:
+    """
+    Thread-safe request log: (t_done, stage, mode, latency_s, outcome).
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, *record):
+        with self._lock:
+            self.records.append(record)
+
+
+def csrf_headers(port: int) -> dict:
+    """
+    Cookie + X-CSRFToken headers that pass CsrfViewMiddleware, from the
+    csrftoken cookie the index page sets. Empty when it sets none.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=REQUEST_TIMEOUT_S)
+    try:
+        conn.request("GET", "/")
+        resp = conn.getresponse()
+        resp.read()
+        cookies = SimpleCookie()
+        for header in resp.headers.get_all("Set-Cookie") or []:
+            cookies.load(header)
+    finally:
+        conn.close()
+
+    if "csrftoken" not in cookies:
+        return {}
+    token = cookies["csrftoken"].value
+    return {"Cookie": f"csrftoken={token}", "X-CSRFToken": token}
+
+
+def send(conn_factory, body: bytes, headers: dict = None):
+    """
+    One POST /recommend/. Returns "ok" | "app_error" | "http_<status>" | "exception".
+    """
+    conn = conn_factory()
+    try:
+        conn.request("POST", "/recommend/", body=body,
+                     headers={"Content-Type": "application/json", **(headers or {})})
+        resp = conn.getresponse()
+        data = resp.read()
+        if resp.status != 200:
+            return f"http_{resp.status}"
+        return "app_error" if "error" in json.loads(data or b"{}") else "ok"
+    except (OSError, http.client.HTTPException, ValueError):
+        return "exception"
+    finally:
+        conn.close()
+
+
+def run_stage(port: int, concurrency: int, seconds: float, payloads: list, mix: dict,
+              recorder: Recorder, stage: int, t0: float, seed: int = 0):
+    headers = csrf_headers(port)
+    stop = time.monotonic() + seconds
+    modes, weights = list(mix), list(mix.values())
+
+    def client(i):
+        rng = random.Random(seed * 1000 + stage * 100 + i)
+        factory = lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=REQUEST_TIMEOUT_S)
+        while time.monotonic() < stop:
+            mode = rng.choices(modes, weights)[0]
+            body = json.dumps({**rng.choice(payloads), "mode": mode}).encode()
+            start = time.perf_counter()
+            outcome = send(factory, body, headers)
+            done = time.perf_counter()
+            recorder.add(done - t0, stage, mode, done - start, outcome)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def sample_rss(pid: int, t0: float, stop: threading.Event, samples: list, interval: float = 1.0):
+    while not stop.is_set():
+        rss = process_tree_rss_mb(pid)
+        samples.append({"t": round(time.perf_counter() - t0, 2), "total_mb": round(sum(rss.values()), 1),
+                        "processes": len(rss)})
+        stop.wait(interval)
+
+
+# -------------------------
+# REPORT
+# -------------------------
+def _latency_stats(latencies) -> dict:
+    if not len(latencies):
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ms = np.asarray(latencies) * 1000
+    return {f"p{q}_ms": round(float(np.percentile(ms, q)), 2) for q in (50, 95, 99)}
+
+
+def summarize(records: list, ramp: list, stage_seconds: float) -> list:
+    stages = []
+    for stage, concurrency in enumerate(ramp):
+        rows = [r for r in records if r[1] == stage]
+        outcomes = defaultdict(int)
+        for r in rows:
+            outcomes[r[4]] += 1
+        n = len(rows)
+        http_errors = sum(c for o, c in outcomes.items() if o not in ("ok", "app_error"))
+        stages.append({
+            "concurrency": concurrency,
+            "requests": n,
+            "rps": round(n / stage_seconds, 2),
+            **_latency_stats([r[3] for r in rows]),
+            "error_rate": round(http_errors / n, 4) if n else 0.0,
+            "app_error_rate": round(outcomes["app_error"] / n, 4) if n else 0.0,
+            "outcomes": dict(outcomes),
+            "by_mode": {
+                mode: {"requests": len(lat), **_latency_stats(lat)}
+                for mode, lat in _group([(r[2], r[3]) for r in rows]).items()
+            },
+        })
+    return stages
+
+
+def _group(pairs) -> dict:
+    out = defaultdict(list)
+    for key, value in pairs:
+        out[key].append(value)
+    return out
+
+
+def timeline(records: list, rss_samples: list) -> list:
+    per_second = defaultdict(lambda: {"requests": 0, "errors": 0, "latencies": []})
+    for t, _, _, latency, outcome in records:
+        bucket = per_second[int(t)]
+        bucket["requests"] += 1
+        bucket["errors"] += outcome != "ok"
+        bucket["latencies"].append(latency)
+
+    rss_by_second = {int(s["t"]): s["total_mb"] for s in rss_samples}
+    return [
+        {"t": sec, "rps": b["requests"], "errors": b["errors"],
+         "p95_ms": _latency_stats(b["latencies"])["p95_ms"], "rss_mb": rss_by_second.get(sec)}
+        for sec, b in sorted(per_second.items())
+    ]
+
+
+def compare_reports(current: dict, previous: dict) -> list:
+    """
+    Per concurrency level present in both: RPS and p95 ratios.
+    """
+    before = {s["concurrency"]: s for s in previous.get("stages", [])}
+    rows = []
+    for s in current["stages"]:
+        b = before.get(s["concurrency"])
+        if not b:
+            continue
+        rows.append({
+            "concurrency": s["concurrency"],
+            "rps_ratio": s["rps"] / b["rps"] if b["rps"] else None,
+            "p95_ratio": s["p95_ms"] / b["p95_ms"] if b["p95_ms"] else None,
+            "error_rate_delta": s["error_rate"] - b["error_rate"],
+        })
+    return rows
+
+
+def print_stages(stages: list) -> None:
+    print(f"{'conc':>5}{'reqs':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err %':>8}{'app err %':>11}")
+    for s in stages:
+        print(
+            f"{s['concurrency']:>5}{s['requests']:>8}{s['rps']:>9.1f}{s['p50_ms']:>10.1f}"
+            f"{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['error_rate'] * 100:>8.2f}{s['app_error_rate'] * 100:>11.2f}"
+        )
+
+
+# -------------------------
+# MAIN
+# -------------------------
+def run(args) -> dict:
+    payloads = build_payloads(args.payloads, seed=args.seed)
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+
+    port = args.port or free_port()
+    log_path = args.output.with_suffix(".server.log")
+    proc = None
+    if not args.url_port:
+        proc = start_server(args.server, port, args.workers, log_path)
+    else:
+        port = args.url_port
+
+    try:
+        print(f"🚀 Waiting for the {args.server.upper()} server on :{port}...")
+        try:
+            wait_ready(port, proc)
+        except (RuntimeError, TimeoutError) as e:
+            raise SystemExit(f"{e} (server log: {log_path})")
+
+        recorder, rss_samples, stop = Recorder(), [], threading.Event()
+        t0 = time.perf_counter()
+        sampler = None
+        if proc is not None:
+            sampler = threading.Thread(target=sample_rss, args=(proc.pid, t0, stop, rss_samples), daemon=True)
+            sampler.start()
+
+        for stage, concurrency in enumerate(args.ramp):
+            print(f"   • stage {stage + 1}/{len(args.ramp)}: {concurrency} clients for {args.stage_seconds:.0f}s")
+            run_stage(port, concurrency, args.stage_seconds, payloads, mix, recorder, stage, t0, args.seed)
+
+        stop.set()
+        if sampler:
+            sampler.join()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "server": args.server, "workers": args.workers, "ramp": args.ramp,
+            "stage_seconds": args.stage_seconds, "mix": mix, "payloads": len(payloads),
+        },
+        "host": {"cpus": os.cpu_count(), "python": sys.version.split()[0]},
+        "stages": summarize(recorder.records, args.ramp, args.stage_seconds),
+        "rss": {
+            "peak_mb": max((s["total_mb"] for s in rss_samples), default=None),
+            "samples": rss_samples,
+        },
+        "timeline": timeline(recorder.records, rss_samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test /recommend/ locally")
+    parser.add_argument("--server", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn / uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--url-port", type=int, default=None, help="test an already running server on this port")
+    parser.add_argument("--ramp", type=int, nargs="+", default=DEFAULT_RAMP, help="client concurrency per stage")
+    parser.add_argument("--stage-seconds", type=float, default=DEFAULT_STAGE_SECONDS)
+    parser.add_argument("--mix", nargs="+", default=None, help="mode=weight, e.g. hybrid=0.6 semantic=0.4")
+    parser.add_argument("--payloads", type=int, default=500, help="distinct catalog-derived payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument("--compare", type=Path, default=None, help="earlier report to compare against")
+    parser.add_argument("--serve-wsgi", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi)
+        return 0
+
+    previous = json.loads(args.compare.read_text()) if args.compare else None
+    report = run(args)
+    print_stages(report["stages"])
+    if report["rss"]["peak_mb"] is not None:
+        print(f"   • peak server RSS: {report['rss']['peak_mb']:.0f} MB")
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"✅ Report written to {args.output}")
+
+    if previous:
+        for row in compare_reports(report, previous):
+            rps = f"x{row['rps_ratio']:.2f}" if row["rps_ratio"] else "n/a"
+            p95 = f"x{row['p95_ratio']:.2f}" if row["p95_ratio"] else "n/a"
+            print(f"   • {row['concurrency']} clients: rps {rps}, p95 {p95}, "
+                  f"error rate {row['error_rate_delta']:+.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
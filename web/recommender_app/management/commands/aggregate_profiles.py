@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_engine.telemetry.profiler import ProfileRing, aggregate, write_collapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge saved /recommend/ profiles into collapsed stacks "
+        "(flamegraph.pl / speedscope input)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir", type=Path, default=None,
+            help="profile ring directory (default: RECOMMEND_PROFILE_DIR)",
+        )
+        parser.add_argument("--mode", default=None, help="only one engine mode")
+        parser.add_argument("--min-latency-ms", type=float, default=None)
+        parser.add_argument("--output", type=Path, default=None, help="default: stdout")
+
+    def handle(self, *args, **options):
+        root = options["dir"] or getattr(settings, "RECOMMEND_PROFILE_DIR", settings.BASE_DIR / "profiles")
+        profiles = ProfileRing(root).load()
+        stacks = aggregate(profiles, mode=options["mode"], min_latency_ms=options["min_latency_ms"])
+
+        if options["output"]:
+            with open(options["output"], "w") as out:
+                lines = write_collapsed(stacks, out)
+        else:
+            lines = write_collapsed(stacks, self.stdout)
+
+        # Summary on stderr so stdout stays pipeable into flamegraph.pl
+        sys.stderr.write(
+            f"{len(profiles)} profiles, {sum(stacks.values())} samples, "
+            f"{lines} distinct stacks\n"
+        )
@@ -0,0 +1,74 @@
+"""
+Cursor pagination for /recommend/.
+
+A ranked ResultBatch is kept for a short while under a random token;
+the cursor "<token>:<offset>" serves the next page by slicing it, so
+paging never rescores the catalog.
+
+The cache is per process: with several workers a cursor only resolves
+on the worker that ranked it (others answer "expired").
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Bounded, short-lived token -> value store (LRU, thread-safe).
+    Entries expire `ttl_s` after they were stored.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 300.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries = OrderedDict()  # token -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def put(self, value) -> str:
+        token = secrets.token_urlsafe(12)
+        with self._lock:
+            self._entries[token] = (self._clock() + self.ttl_s, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def encode_cursor(token: str, offset: int) -> str:
+    return f"{token}:{offset}"
+
+
+def decode_cursor(cursor: str):
+    """
+    (token, offset), or None for a malformed cursor.
+    """
+    token, sep, offset = str(cursor).rpartition(":")
+    if not sep or not token or not offset.isdigit():
+        return None
+    return token, int(offset)
+
+
+def page_bounds(offset: int, page_size: int, total: int):
+    """
+    (start, stop, next offset or None) of one page.
+    """
+    start = min(offset, total)
+    stop = min(start + page_size, total)
+    return start, stop, (stop if stop < total else None)
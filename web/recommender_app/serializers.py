@@ -0,0 +1,91 @@
+"""
+Fast JSON for /recommend/ results.
+
+The catalog half of a result item (brand, model, specs, 3D model URL
+and transform) is the same for every request, so it is encoded once
+per catalog row at startup. Per request only the score and the
+explanation lists are encoded, and the fragments are joined straight
+into the response body (no per-item dicts, no JsonResponse re-encode).
+"""
+
+import json
+
+from ai_engine.vision3d.phone_template import phone_transform
+
+
+def catalog_fragments(row: dict, model_url: str):
+    """
+    (head, tail) JSON fragments of one catalog row's result item:
+    head = '{"brand": .., "model": ..', tail = '"specs": .., ..}'.
+    """
+    head = json.dumps({
+        "brand": row.get("brand"),
+        "model": row.get("model"),
+    })[:-1]
+    tail = json.dumps({
+        "specs": {
+            "price": row.get("price"),
+            "camera": row.get("cam_resolution"),
+            "battery": row.get("battery"),
+            "ram": row.get("ram"),
+            "display": (
+                f'{row.get("display_size", "?")}" '
+                f'{row.get("display_type", "")}'
+            ),
+            "five_g": bool(row.get("has_5g", False)),
+            "year": int(row.get("release_year", 0)),
+        },
+        # Always return the symbolic 3D model,
+        # sized per phone by the client (shared template GLB)
+        "3d_model_url": model_url,
+        "3d_transform": phone_transform({
+            "display_size": row.get("display_size"),
+        }),
+    })[1:]
+    return head, tail
+
+
+class ResultSerializer:
+    """
+    Renders a ResultBatch (catalog row positions) as the /recommend/
+    JSON body, from fragments prepared once per catalog row.
+    """
+
+    def __init__(self, raw_df, model_url: str):
+        fragments = [catalog_fragments(row, model_url) for row in raw_df.to_dict("records")]
+        self._heads = [head for head, _ in fragments]
+        self._tails = [tail for _, tail in fragments]
+
+    def items(self, batch, explanations) -> list:
+        dumps = json.dumps
+        return [
+            f'{self._heads[row]}, "score": {dumps(round(score, 3))}, '
+            f'"why": {dumps(explanation["top_features"])}, '
+            f'"pros": {dumps(explanation["pros"])}, '
+            f'"cons": {dumps(explanation["cons"])}, '
+            f'{self._tails[row]}'
+            for row, score, explanation in zip(batch.rows.tolist(), batch.scores.tolist(), explanations)
+        ]
+
+    def iter_items(self, batch, chunk: int = 50):
+        """
+        Item JSON strings, explained `chunk` items at a time (streaming).
+        """
+        for start in range(0, len(batch), chunk):
+            part = batch[start:start + chunk]
+            yield from self.items(part, part.explanations())
+
+    def ndjson(self, meta: dict, batch, chunk: int = 50):
+        """
+        NDJSON lines: `meta` first, then one result item per line.
+        """
+        yield json.dumps(meta) + "\n"
+        for item in self.iter_items(batch, chunk):
+            yield item + "\n"
+
+    def render(self, meta: dict, items: list) -> str:
+        """
+        `meta` keys first, then "results": [items].
+        """
+        head = json.dumps(meta)[:-1] + (", " if meta else "")
+        return f'{head}"results": [{", ".join(items)}]}}'
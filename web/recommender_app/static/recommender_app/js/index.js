@@ -15,7 +15,6 @@ const thinkingSteps = Array.from(aiThinking.querySelectorAll(".thinking-step"));
 // CONSTANTS — FAKE 3D PRINTER
 // ==============================
 const BASE_GLB   = "/static/recommender_app/models/base_phone.glb";
-const DEVICE_GLB = "/static/recommender_app/models/device_phone.glb";
 const DEFAULT_MESSAGE = "No results yet";
 
 // ==============================
@@ -99,15 +98,21 @@ function animatePrinterOverlay(duration = 1500) {
 // ==============================
 // FAKE 3D PRINT TRIGGER
 // ==============================
-async function triggerFakePrint() {
+async function triggerFakePrint(item = null) {
     modelViewer.pause();
     modelViewer.removeAttribute("src");
 
+    // One shared template GLB (3d_model_url); per-phone size comes from
+    // the API transform, in the template's axes
+    const transform = item && item["3d_transform"];
+    const src = (item && item["3d_model_url"]) || BASE_GLB;
+    modelViewer.scale = transform ? transform.scale.join(" ") : "1 1 1";
+
     // Animate printing overlay
     await animatePrinterOverlay(1200);
 
     requestAnimationFrame(() => {
-        modelViewer.src = DEVICE_GLB;
+        modelViewer.src = src;
         modelViewer.play();
         printerOverlay.style.width = "0%";
     });
@@ -149,7 +154,7 @@ function createPhoneCard(item, index) {
     `;
 
     // Clicking a card re-triggers the 3D printer
-    card.addEventListener("click", triggerFakePrint);
+    card.addEventListener("click", () => triggerFakePrint(item));
 
     return card;
 }
@@ -192,7 +197,7 @@ form.addEventListener("submit", async (e) => {
         });
 
         // Trigger 3D printing after results appear
-        await triggerFakePrint();
+        await triggerFakePrint(items[0]);
 
         resultsSummary.textContent = `Top ${items.length} matches • Mode: ${payload.mode}`;
     } catch (err) {
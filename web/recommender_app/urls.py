@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     path("", views.index, name="index"),
     path("recommend/", views.recommend, name="recommend"),  # NO /api/
+    path("metrics/", views.metrics, name="metrics"),
     path("3d-status/<str:model_slug>/", views.check_3d_status, name="check_3d_status"),  # NO /api/
 ]
@@ -1,32 +1,74 @@
 import os
+import tempfile
 from pathlib import Path
-import trimesh
 
-CACHE_DIR = Path(__file__).parent.parent / "static/recommender_app/models/3d_cache"
+from ai_engine.vision3d.glb_cache import GLBCache, cache_key, model_safe_name
+from ai_engine.vision3d.phone_template import (
+    TEMPLATE_VERSION,
+    export_template,
+    instance_mesh,
+    phone_dimensions,
+    phone_transform,
+)
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+CACHE_DIR = STATIC_DIR / "recommender_app/models/3d_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-def phone_model_path(model_name: str) -> Path:
-    safe_name = model_name.replace(" ", "_").lower()
-    return CACHE_DIR / f"{safe_name}.glb"
+# Shared template GLB: a fixed static file (never evicted), renamed
+# with the template version so clients never keep a stale one
+TEMPLATE_STATIC_PATH = f"recommender_app/models/{TEMPLATE_VERSION}.glb"
+
+_CACHE = GLBCache(CACHE_DIR)
+
+
+def phone_model_path(model_name: str):
+    """
+    Current placeholder GLB for a model (via the manifest), or None.
+    """
+    return _CACHE.resolve(model_safe_name(model_name))
 
-def generate_placeholder(model_name: str, specs: dict) -> str:
-    path = phone_model_path(model_name)
-    if path.exists():
-        return str(path)
 
-    width = specs.get("width_mm", 70)
-    height = specs.get("height_mm", 150)
-    thickness = specs.get("thickness_mm", 8)
+def shared_template_path() -> str:
+    """
+    The ONE GLB every placeholder can share (apply phone_transform
+    client-side), exported on first use. Served as static
+    TEMPLATE_STATIC_PATH.
+    """
+    path = STATIC_DIR / TEMPLATE_STATIC_PATH
+    if not path.exists():
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".glb", dir=path.parent)
+        os.close(fd)
+        try:
+            export_template(tmp_name)
+            os.chmod(tmp_name, 0o644)  # mkstemp is owner-only; static files are public
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+    return str(path)
+
+
+def placeholder_params(specs: dict) -> dict:
+    """
+    Shared template + per-phone transform; no mesh work per model.
+    """
+    return {"glb_path": shared_template_path(), **phone_transform(specs)}
 
-    # Simple phone body
-    box = trimesh.creation.box(extents=[width, thickness, height])
 
-    # Simple camera bump
-    cam_size = [15, 2, 15]
-    cam_pos = [0, thickness/2 + cam_size[1]/2, height/2 - cam_size[2]/2]
-    camera_bump = trimesh.creation.box(extents=cam_size)
-    camera_bump.apply_translation(cam_pos)
+def generate_placeholder(model_name: str, specs: dict) -> str:
+    """
+    Standalone per-phone GLB (only when a client cannot apply transforms).
+    """
+    dims = phone_dimensions(specs)
+    key = cache_key("placeholder", dims, version=TEMPLATE_VERSION)
+
+    # Same dimensions -> same file, whatever the model is called
+    path = _CACHE.get(key)
+    if path is None:
+        with _CACHE.writer(key) as tmp_path:
+            instance_mesh(specs).export(tmp_path)
+        path = _CACHE.path_for(key)
 
-    phone_mesh = trimesh.util.concatenate([box, camera_bump])
-    phone_mesh.export(path)
+    _CACHE.record(model_safe_name(model_name), key)
     return str(path)
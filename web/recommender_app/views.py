@@ -1,18 +1,29 @@
 import json
 import logging
+import threading
 import traceback
 import re
 
+from django.conf import settings
 from django.views.decorators.http import require_GET, require_POST
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.templatetags.static import static
+import numpy as np
 
-from ai_engine.recommender.recommender_engine import recommend as hybrid_recommend
-from ai_engine.recommender.embedding_engine import EmbeddingSmartphoneRecommender
+from ai_engine.recommender.recommender_engine import SmartphoneRecommender
+from ai_engine.recommender.embedding_engine import EmbeddingSmartphoneRecommender, load_model_embeddings
+from ai_engine.recommender.fusion_engine import FusionRecommender
 from ai_engine.recommender.satisfaction_engine import SatisfactionRecommender
 from ai_engine.recommender.data_loader import load_assets
-from ai_engine.recommender.explainability import explain_recommendation
+from ai_engine.recommender.materialized import PRESETS, load_materialized, lookup
+from ai_engine.recommender.results import ResultBatch
+from ai_engine.semantic.query_parser import parse_query, apply_constraints
+from ai_engine.telemetry.profiler import RequestProfiler
+from ai_engine.telemetry.spans import collect_spans, render_prometheus, server_timing, span
+from .pagination import ResultCache, decode_cursor, encode_cursor, page_bounds
+from .serializers import ResultSerializer
+from .utils.phone_3d import TEMPLATE_STATIC_PATH, shared_template_path
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +32,104 @@ logger = logging.getLogger(__name__)
 # -------------------------------------------------
 assets = load_assets()
 raw_df = assets.get("raw_df")
+catalog_brands = [] if raw_df is None else raw_df["brand"].dropna().unique().tolist()
+
+# Cold-start / preset top-N lists (rebuilt if raw_df changed since the build)
+materialized = None if raw_df is None else load_materialized(raw_df)
+
+# Result rendering: per-row JSON fragments encoded once. Every item
+# points at the shared template GLB (exported here if missing); the
+# client sizes it with the item's 3d_transform
+serializer = None
+if raw_df is not None:
+    shared_template_path()
+    serializer = ResultSerializer(raw_df, static(TEMPLATE_STATIC_PATH))
+
+# Engine modes with their own latency series; any other client-sent
+# mode is timed as "engine.unknown" (bounded span names)
+ENGINE_MODES = ("hybrid", "semantic", "satisfaction", "fusion")
+
+# Ranked results kept briefly for cursor paging (per process)
+DEFAULT_TOP_N = 5
+result_cache = ResultCache(
+    max_entries=getattr(settings, "RECOMMEND_CURSOR_CACHE_SIZE", 1024),
+    ttl_s=getattr(settings, "RECOMMEND_CURSOR_TTL_S", 300),
+)
+
+# Shared engines (built lazily, reused across requests)
+_hybrid_engine = None
+_satisfaction_engine = None
+_fusion_engine = None
+_hybrid_lock = threading.Lock()
+_satisfaction_lock = threading.Lock()
+_fusion_lock = threading.Lock()
+
+# Opt-in sampling profiler (off unless a sample rate / threshold is set)
+profiler = RequestProfiler(
+    getattr(settings, "RECOMMEND_PROFILE_DIR", settings.BASE_DIR / "profiles"),
+    sample_rate=getattr(settings, "RECOMMEND_PROFILE_SAMPLE_RATE", 0.0),
+    latency_threshold_ms=getattr(settings, "RECOMMEND_PROFILE_SLOW_MS", None),
+    max_profiles=getattr(settings, "RECOMMEND_PROFILE_MAX", 200),
+)
+
+
+def get_hybrid_engine() -> SmartphoneRecommender:
+    # Scores raw_df itself, so result rows are catalog positions
+    global _hybrid_engine
+    if _hybrid_engine is None:
+        with _hybrid_lock:
+            if _hybrid_engine is None:
+                _hybrid_engine = SmartphoneRecommender(df=raw_df)
+    return _hybrid_engine
+
+
+def get_satisfaction_engine() -> SatisfactionRecommender:
+    global _satisfaction_engine
+    # Double-checked: one engine (and one background rescoring thread)
+    if _satisfaction_engine is None:
+        with _satisfaction_lock:
+            if _satisfaction_engine is None:
+                _satisfaction_engine = SatisfactionRecommender(
+                    raw_df,
+                    latency_budget_ms=getattr(settings, "SATISFACTION_LATENCY_BUDGET_MS", None),
+                )
+    return _satisfaction_engine
+
+
+def get_fusion_semantic_engine():
+    """
+    Semantic signal over the build-time model embeddings
+    (model_embeddings.npz), or None when they do not cover the catalog:
+    the catalog is never encoded in a request thread.
+    """
+    try:
+        from ai_engine.semantic.semantic_recommender import SemanticSmartphoneRecommender
+
+        known = load_model_embeddings()
+        names = raw_df["model"].astype(str).tolist()
+        missing = sum(name not in known for name in names)
+        if missing:
+            logger.warning(f"Fusion without semantic signal: {missing} models lack precomputed embeddings")
+            return None
+        return SemanticSmartphoneRecommender(raw_df, embeddings=np.stack([known[name] for name in names]))
+    except Exception as e:
+        logger.warning(f"Fusion without semantic signal: {e}")
+        return None
+
+
+def get_fusion_engine() -> FusionRecommender:
+    global _fusion_engine
+    # Double-checked so concurrent first requests build it once
+    if _fusion_engine is None:
+        with _fusion_lock:
+            if _fusion_engine is None:
+                _fusion_engine = FusionRecommender(
+                    raw_df,
+                    semantic_engine=get_fusion_semantic_engine(),
+                    weights=getattr(settings, "RECOMMEND_FUSION_WEIGHTS", None),
+                    method=getattr(settings, "RECOMMEND_FUSION_METHOD", "rrf"),
+                )
+    return _fusion_engine
 
 
 # -------------------------------------------------
@@ -52,6 +161,38 @@ def is_cold_start(user_input: dict) -> bool:
     return all(user_input.get(f, 0) == 0 for f in numeric_fields)
 
 
+# -------------------------------------------------
+def int_option(payload: dict, key: str, default: int) -> int:
+    """
+    Integer request option; ValueError names the option when it is not
+    an integer.
+    """
+    value = payload.get(key)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an integer") from None
+
+
+def paging_options(request, payload: dict) -> dict:
+    """
+    top_n: results ranked (capped by RECOMMEND_MAX_TOP_N),
+    page_size: results per response (default: all of top_n),
+    stream: NDJSON of all top_n ("stream": true or Accept header).
+    """
+    max_top_n = getattr(settings, "RECOMMEND_MAX_TOP_N", 100)
+    top_n = min(max(int_option(payload, "top_n", DEFAULT_TOP_N), 1), max_top_n)
+    page_size = min(max(int_option(payload, "page_size", top_n), 1), top_n)
+    stream = bool(payload.get("stream")) or "application/x-ndjson" in request.headers.get("Accept", "")
+    return {"top_n": top_n, "page_size": page_size, "stream": stream}
+
+
+def invalid_request(message: str):
+    return JsonResponse({"results": [], "error": message}, status=200)
+
+
 # -------------------------------------------------
 def derive_base_model(model_name: str) -> str:
     if not model_name:
@@ -60,12 +201,51 @@ def derive_base_model(model_name: str) -> str:
 
 
 # -------------------------------------------------
+def profile_context(request, spans) -> dict:
+    """
+    What a saved profile needs to replay the request locally.
+    """
+    try:
+        payload = json.loads(request.body or "{}")
+        return {
+            "mode": (payload.get("mode") or "classic").lower(),
+            "input": normalize_user_input(payload),
+            "nl_query": payload.get("nl_query", ""),
+            "spans": [[stage, round(seconds * 1000, 3)] for stage, seconds in spans],
+        }
+    except Exception as e:
+        return {"input_error": str(e)}
+
+
 @require_POST
 def recommend(request):
+    with collect_spans() as spans:
+        with profiler.track(context=lambda: profile_context(request, spans)):
+            with span("view"):
+                response = _recommend(request)
+
+    # Optional per-stage breakdown for browser devtools
+    if getattr(settings, "RECOMMEND_SERVER_TIMING", False):
+        response["Server-Timing"] = server_timing(spans)
+    return response
+
+
+def _recommend(request):
     try:
         payload = json.loads(request.body or "{}")
+
+        try:
+            # Next page of an earlier ranking: no rescoring
+            if payload.get("cursor"):
+                return next_page(payload["cursor"], int_option(payload, "page_size", None))
+            options = paging_options(request, payload)
+        except ValueError as e:
+            return invalid_request(str(e))
+
+        top_n = options["top_n"]
         raw_mode = (payload.get("mode") or "classic").lower()
         mode = "hybrid" if raw_mode in ("classic", "hybrid") else raw_mode
+        engine_stage = f"engine.{mode}" if mode in ENGINE_MODES else "engine.unknown"
 
         user_input = normalize_user_input(payload)
 
@@ -75,28 +255,65 @@ def recommend(request):
                 status=200
             )
 
+        cold_start = is_cold_start(user_input)
+        preset = (payload.get("preset") or "").lower()
+        preset = preset if preset in PRESETS else None
+
+        # -----------------------------------------
+        # PRECOMPUTED LISTS (COLD START / PRESETS)
+        # -----------------------------------------
+        if mode == "hybrid" and (cold_start or preset):
+            with span("materialized"):
+                rows = lookup(
+                    materialized, preset or "cold_start",
+                    brand=user_input["brand"],
+                    price=user_input["price"],
+                    profile=user_input["performance_profile"],
+                    top_n=top_n,
+                )
+            # None / empty: not covered, fall back to the live path
+            if rows:
+                batch = labels_batch(rows, 0.5)
+                return build_response(mode, user_input, cold_start, batch, preset, options)
+
+        # -----------------------------------------
+        # FUSION (ALL SIGNALS, ONE CANDIDATE SET)
+        # -----------------------------------------
+        if mode == "fusion":
+            nl_query = payload.get("nl_query", "")
+            with span(engine_stage):
+                with span("query_parse"):
+                    constraints = parse_query(nl_query, catalog_brands)["constraints"] if nl_query.strip() else {}
+                batch = get_fusion_engine().results(
+                    user_input, nl_query, top_n=top_n, constraints=constraints
+                )
+            # No candidates: the live path reports brand suggestions
+            if len(batch):
+                return build_response(mode, user_input, cold_start, batch, options=options)
+
         # -----------------------------------------
         # FILTER DATASET (SOFT CONSTRAINTS)
         # -----------------------------------------
-        df_pool = raw_df.copy()
-
-        if user_input["brand"]:
-            df_pool = df_pool[
-                df_pool["brand"].str.lower() == user_input["brand"].lower()
-            ]
-
-        if user_input["price"] > 0:
-            lower = user_input["price"] * 0.7
-            upper = user_input["price"] * 1.3
-            df_pool = df_pool[
-                (df_pool["price"] >= lower) &
-                (df_pool["price"] <= upper)
-            ]
-
-        if user_input["release_year"] > 0:
-            df_pool = df_pool[
-                df_pool["release_year"] >= user_input["release_year"] - 2
-            ]
+        with span("filter"):
+            df_pool = raw_df.copy()
+
+            if user_input["brand"]:
+                df_pool = df_pool[
+                    df_pool["brand"].str.lower() == user_input["brand"].lower()
+                ]
+
+            if user_input["price"] > 0:
+                lower = user_input["price"] * 0.7
+                upper = user_input["price"] * 1.3
+                df_pool = df_pool[
+                    (df_pool["price"] >= lower) &
+                    (df_pool["price"] <= upper)
+                ]
+
+            if user_input["release_year"] > 0:
+                df_pool = df_pool[
+                    df_pool["release_year"] >= user_input["release_year"] - 2
+                ]
 
         if df_pool.empty:
             return JsonResponse({
@@ -115,102 +332,50 @@ def recommend(request):
         # -----------------------------------------
         # REMOVE STORAGE VARIANTS
         # -----------------------------------------
-        df_pool = (
-            df_pool
-            .assign(base_model=df_pool["model"].apply(derive_base_model))
-            .drop_duplicates(subset=["base_model"])
-        )
+        with span("dedupe"):
+            df_pool = (
+                df_pool
+                .assign(base_model=df_pool["model"].apply(derive_base_model))
+                .drop_duplicates(subset=["base_model"])
+            )
 
         # -----------------------------------------
         # ENGINE SELECTION
         # -----------------------------------------
-        cold_start = is_cold_start(user_input)
+        with span(engine_stage):
+            if cold_start and mode == "hybrid":
+                df = df_pool.sort_values(
+                    "release_year", ascending=False
+                ).head(top_n)
 
-        if cold_start and mode == "hybrid":
-            df = df_pool.sort_values(
-                "release_year", ascending=False
-            ).head(5)
-
-            result_items = df.assign(
-                match_score=0.5,
-                feature_scores=[{}] * len(df)
-            ).to_dict("records")
-
-        else:
-            if mode == "hybrid":
-                engine_result = hybrid_recommend(user_input, top_n=5)
-                result_items = engine_result.get("items", [])
-
-            elif mode == "semantic":
-                semantic_engine = EmbeddingSmartphoneRecommender(df_pool)
-                df = semantic_engine.recommend(
-                    payload.get("nl_query", ""),
-                    top_n=5
-                )
-                result_items = df.to_dict("records")
-
-            elif mode == "satisfaction":
-                satisfaction_engine = SatisfactionRecommender(df_pool)
-                df = satisfaction_engine.recommend(user_input, top_n=5)
-                result_items = df.to_dict("records")
+                batch = labels_batch(df.index, 0.5)
 
             else:
-                result_items = []
-
-        # -----------------------------------------
-        # BUILD FRONTEND RESPONSE
-        # -----------------------------------------
-        response_items = []
-
-        for item in result_items:
-            model_name = item.get("model")
-            if not model_name:
-                continue
-
-            try:
-                full_row = raw_df.loc[
-                    raw_df["model"] == model_name
-                ].iloc[0]
-            except Exception:
-                continue
-
-            explanation = explain_recommendation(
-                item.get("feature_scores", {})
-            )
-
-            response_items.append({
-                "brand": full_row.get("brand"),
-                "model": model_name,
-                "score": round(
-                    float(item.get("match_score", 0)), 3
-                ),
-                "why": explanation.get("top_features", []),
-                "pros": explanation.get("pros", []),
-                "cons": explanation.get("cons", []),
-                "specs": {
-                    "price": full_row.get("price"),
-                    "camera": full_row.get("cam_resolution"),
-                    "battery": full_row.get("battery"),
-                    "ram": full_row.get("ram"),
-                    "display": (
-                        f'{full_row.get("display_size", "?")}" '
-                        f'{full_row.get("display_type", "")}'
-                    ),
-                    "five_g": bool(full_row.get("has_5g", False)),
-                    "year": int(full_row.get("release_year", 0)),
-                },
-                # Always return the symbolic 3D model
-                "3d_model_url": static(
-                    "recommender_app/models/device_phone.glb"
-                ),
-            })
-
-        return JsonResponse({
-            "engine_mode": mode,
-            "performance_profile": user_input.get("performance_profile"),
-            "cold_start_used": cold_start,
-            "results": response_items
-        }, status=200)
+                if mode == "hybrid":
+                    batch = get_hybrid_engine().results(user_input, top_n=top_n)
+
+                elif mode == "semantic":
+                    nl_query = payload.get("nl_query", "")
+                    # Hard constraints from the query shrink the pool
+                    # before any embedding work
+                    with span("query_parse"):
+                        parsed = parse_query(nl_query, catalog_brands)
+                        candidates = apply_constraints(df_pool, parsed["constraints"])
+                    with span("embedding.setup"):
+                        semantic_engine = EmbeddingSmartphoneRecommender(candidates)
+                    df = semantic_engine.recommend(nl_query, top_n=top_n)
+                    batch = labels_batch(df.index, df["match_score"])
+
+                elif mode == "satisfaction":
+                    top, scores = get_satisfaction_engine().rank(
+                        user_input, top_n=top_n, df_override=df_pool
+                    )
+                    batch = labels_batch(df_pool.index[top], scores)
+
+                else:
+                    batch = ResultBatch.empty()
+
+        return build_response(mode, user_input, cold_start, batch, options=options)
 
     except Exception as e:
         logger.error(
@@ -222,6 +387,91 @@ def recommend(request):
         )
 
 
+# -------------------------------------------------
+def labels_batch(labels, scores) -> ResultBatch:
+    """
+    ResultBatch from raw_df index labels (unknown labels dropped).
+    """
+    rows = raw_df.index.get_indexer(labels)
+    scores = np.broadcast_to(np.asarray(scores, dtype=float), rows.shape)
+    known = rows >= 0
+    return ResultBatch(rows[known], scores[known])
+
+
+def build_response(mode, user_input, cold_start, batch: ResultBatch, preset=None, options=None):
+    meta = {
+        "engine_mode": mode,
+        "performance_profile": user_input.get("performance_profile"),
+        "cold_start_used": cold_start,
+        "preset": preset,
+    }
+    options = options or {}
+
+    if options.get("stream"):
+        return StreamingHttpResponse(
+            stream_lines({**meta, "total": len(batch)}, batch),
+            content_type="application/x-ndjson",
+        )
+    return page_response(meta, batch, 0, options.get("page_size") or len(batch))
+
+
+def stream_lines(meta: dict, batch: ResultBatch):
+    """
+    NDJSON body. It is written after the view has returned, so it is
+    timed by its own span, and a failure ends the stream with an
+    {"error": ...} line instead of a cut-off body.
+    """
+    try:
+        with span("response.stream"):
+            yield from serializer.ndjson(meta, batch)
+    except Exception as e:
+        logger.error(
+            f"Recommendation stream failure: {str(e)}\n{traceback.format_exc()}"
+        )
+        yield json.dumps({"error": "Safe recommendation failure"}) + "\n"
+
+
+def page_response(meta: dict, batch: ResultBatch, offset: int, page_size: int, token=None):
+    """
+    One page of a ranked batch. The batch is cached (once) when more
+    pages follow, and the response carries the cursor to the next one.
+    """
+    with span("response"):
+        start, stop, next_offset = page_bounds(offset, page_size, len(batch))
+        if next_offset is not None and token is None:
+            token = result_cache.put((meta, batch, page_size))
+
+        page = batch[start:stop]
+        body = serializer.render({
+            **meta,
+            "total": len(batch),
+            "offset": start,
+            "next_cursor": None if next_offset is None else encode_cursor(token, next_offset),
+        }, serializer.items(page, page.explanations()))
+    return HttpResponse(body, content_type="application/json")
+
+
+def next_page(cursor: str, page_size=None):
+    decoded = decode_cursor(cursor)
+    entry = result_cache.get(decoded[0]) if decoded else None
+    if entry is None:
+        return invalid_request("Cursor expired or invalid")
+
+    token, offset = decoded
+    meta, batch, default_size = entry
+    page_size = min(max(int(page_size or default_size), 1), len(batch) or 1)
+    return page_response(meta, batch, offset, page_size, token)
+
+
+# -------------------------------------------------
+@require_GET
+def metrics(request):
+    return HttpResponse(
+        render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # -------------------------------------------------
 @require_GET
 def check_3d_status(request, model_slug):
@@ -137,3 +137,51 @@ MEDIA_ROOT = BASE_DIR / "media"
 # DEFAULT PRIMARY KEY
 # =====================================================
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# =====================================================
+# RECOMMENDER OBSERVABILITY
+# =====================================================
+# Per-stage histograms are always collected (GET /metrics/);
+# this adds a Server-Timing header to /recommend/ responses
+RECOMMEND_SERVER_TIMING = DEBUG
+
+# Sampling profiler for /recommend/ (off by default). A request is
+# profiled with probability SAMPLE_RATE, or kept when slower than
+# SLOW_MS; profiles live in a ring of at most MAX files.
+# Aggregate with: python manage.py aggregate_profiles > stacks.txt
+RECOMMEND_PROFILE_SAMPLE_RATE = 0.0
+RECOMMEND_PROFILE_SLOW_MS = None
+RECOMMEND_PROFILE_DIR = BASE_DIR / "profiles"
+RECOMMEND_PROFILE_MAX = 200
+
+# =====================================================
+# RECOMMENDER FUSION MODE
+# =====================================================
+# mode="fusion" ranks one candidate set by all signals at once.
+# "rrf" fuses ranks (robust to score scales), "linear" fuses
+# min-max normalized scores. Missing signals (no query, no
+# satisfaction scores) drop out and the weights are renormalized.
+RECOMMEND_FUSION_METHOD = "rrf"
+RECOMMEND_FUSION_WEIGHTS = {"feature": 0.5, "semantic": 0.3, "satisfaction": 0.2}
+
+# =====================================================
+# RECOMMENDER SATISFACTION MODEL
+# =====================================================
+# None serves the promoted model's precomputed satisfaction scores.
+# A budget (ms, single-row prediction) serves the most accurate model
+# of the active training run that fits it (see model_registry); when
+# that is not the model behind the precomputed scores, the catalog is
+# rescored with it once at startup.
+SATISFACTION_LATENCY_BUDGET_MS = None
+
+# =====================================================
+# RECOMMENDER PAGINATION
+# =====================================================
+# /recommend/ accepts "top_n" (capped here) and "page_size"; when more
+# pages follow, the response has a "next_cursor" that serves them by
+# slicing the cached ranking (no rescoring). Cursors live in a bounded
+# per-process cache for CURSOR_TTL_S seconds. "stream": true (or
+# Accept: application/x-ndjson) returns all top_n results as NDJSON.
+RECOMMEND_MAX_TOP_N = 100
+RECOMMEND_CURSOR_TTL_S = 300
+RECOMMEND_CURSOR_CACHE_SIZE = 1024